@@ -0,0 +1,206 @@
+import itertools
+import math
+import threading
+import time
+
+from local_db import ProcessLocalConnection
+
+# Analyses a worker runs at once and lets wait, unless MAX_IN_FLIGHT and MAX_QUEUED
+# say otherwise; gunicorn.conf.py sizes its thread pool from the same numbers
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_MAX_QUEUED = 16
+
+
+class Overloaded(Exception):
+    """Raised when an analysis is shed instead of queued"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Server overloaded ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def retry_after_header(seconds):
+    """Whole seconds for a Retry-After header, at least 1"""
+    return str(max(1, math.ceil(seconds)))
+
+
+class LocalBucketStore:
+    """In-process token buckets. Swap for a shared store to limit clients across workers.
+
+    A store only needs take(); SQLiteBucketStore is the shared one for
+    several worker processes on one host.
+    """
+
+    def __init__(self, max_clients=100000):
+        self.max_clients = max_clients
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, cost=1):
+        """Take `cost` tokens from key's bucket; 0 if allowed, else seconds until they are there"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            if bucket is None:
+                if len(self._buckets) >= self.max_clients:
+                    self._evict(now, rate, burst)
+                bucket = (burst, now)
+            tokens, updated = bucket
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            # Re-inserted, so the buckets stay ordered from least to most recently seen
+            self._buckets[key] = (tokens, now)
+        return 0.0 if allowed else (cost - tokens) / rate
+
+    def _evict(self, now, rate, burst):
+        # Buckets that have refilled are the same as no bucket at all. If that is
+        # not enough, drop the least recently seen clients down to 90% of the cap,
+        # so the scan runs once per many new clients rather than on every one.
+        for key in [key for key, (tokens, updated) in self._buckets.items()
+                    if tokens + (now - updated) * rate >= burst]:
+            del self._buckets[key]
+        excess = len(self._buckets) - self.max_clients * 9 // 10
+        for key in list(itertools.islice(self._buckets, max(0, excess))):
+            del self._buckets[key]
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file shared by the worker processes on one host"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Autocommit, take() manages its own transaction
+        self._connection = ProcessLocalConnection(
+            db_path, "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL);",
+            isolation_level=None
+        )
+        # Open now so a bad path fails at startup
+        self._db
+
+    @property
+    def _db(self):
+        return self._connection.get()
+
+    def take(self, key, rate, burst, cost=1):
+        # Wall clock, since monotonic clocks are per process
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens, updated = row if row else (burst, now)
+                tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+                allowed = tokens >= cost
+                if allowed:
+                    tokens -= cost
+                self._db.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                                 (key, tokens, now))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return 0.0 if allowed else (cost - tokens) / rate
+
+
+class RateLimiter:
+    """Per-client token buckets: `per_minute` requests a minute, in bursts of up to `burst`"""
+
+    def __init__(self, per_minute, burst, store=None):
+        self.per_minute = per_minute
+        self.burst = burst
+        self.store = store or LocalBucketStore()
+
+    @property
+    def enabled(self):
+        return self.per_minute > 0
+
+    def check(self, client, cost=1):
+        """0 if the client may go ahead, else seconds until it may retry"""
+        if not self.enabled:
+            return 0.0
+        return self.store.take(client, self.per_minute / 60.0, self.burst, cost)
+
+
+class ConcurrencyLimiter:
+    """Cap the analyses running at once in this process, with a short bounded wait
+
+    Up to `limit` analyses run; the next `max_queue` wait for a slot. A
+    request is shed straight away, without waiting, when the queue is full
+    or when the expected wait (the queue ahead of it times the recent
+    average analysis time, spread over the slots) is over `max_wait`, and
+    shed after waiting `max_wait` without getting a slot.
+    """
+
+    def __init__(self, limit, max_queue, max_wait, on_change=None):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = 0
+        # Exponentially weighted average of analysis time, seconds
+        self.average_seconds = None
+        self._on_change = on_change
+        self._condition = threading.Condition()
+
+    def expected_wait(self):
+        if self.active < self.limit or not self.average_seconds:
+            return 0.0
+        return (self.waiting + 1) * self.average_seconds / self.limit
+
+    def _changed(self):
+        if self._on_change:
+            self._on_change(self.active, self.waiting)
+
+    def acquire(self):
+        """Take a slot, waiting for one if need be; returns the seconds waited or raises Overloaded"""
+        if self.limit <= 0:
+            return 0.0
+        start = time.monotonic()
+        with self._condition:
+            if self.active >= self.limit:
+                if self.waiting >= self.max_queue:
+                    raise Overloaded("queue_full", self.expected_wait() or 1)
+                expected = self.expected_wait()
+                if expected > self.max_wait:
+                    raise Overloaded("expected_wait", expected)
+                self.waiting += 1
+                self._changed()
+                try:
+                    deadline = start + self.max_wait
+                    while self.active >= self.limit:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise Overloaded("queue_timeout", self.expected_wait() or self.max_wait)
+                        self._condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+                    self._changed()
+            self.active += 1
+            self._changed()
+        return time.monotonic() - start
+
+    def release(self, seconds):
+        """Give back a slot held for `seconds`"""
+        if self.limit <= 0:
+            return
+        with self._condition:
+            self.active -= 1
+            self.average_seconds = seconds if self.average_seconds is None else \
+                0.8 * self.average_seconds + 0.2 * seconds
+            self._changed()
+            self._condition.notify()
+
+    def info(self):
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "active": self.active,
+                "waiting": self.waiting,
+                "max_queue": self.max_queue,
+                "max_wait_seconds": self.max_wait,
+                "average_seconds": round(self.average_seconds, 4) if self.average_seconds else None
+            }
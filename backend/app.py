@@ -1,186 +1,210 @@
-from flask import Flask, request, jsonify, send_from_directory
+import time
+_startup_started = time.perf_counter()
+
+from flask import Blueprint, Flask, Request, current_app, request, jsonify, send_from_directory
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
+from functools import partial, wraps
+import gzip
+import logging
+import multiprocessing
 import os
-import PyPDF2
-import docx
-import re
-import nltk
-import spacy
-from nltk.tokenize import word_tokenize
-import json
-from textblob import TextBlob
+import tempfile
+import threading
+import zipfile
+from admission import (DEFAULT_MAX_IN_FLIGHT, DEFAULT_MAX_QUEUED, ConcurrencyLimiter, LocalBucketStore, Overloaded,
+                       RateLimiter, SQLiteBucketStore, retry_after_header)
+from entity_extractor import DEGREE_LEVELS, EntityExtractor
 from industry_analyzer import IndustryAnalyzer
+from job_description import JobDescriptionExtractor, compare_resume
+from section_segmenter import default_segmenter
+from section_scorers import (SECTION_SCORERS, SOFT_SKILLS, TECH_SKILLS, analyze_education, analyze_experience,
+                             analyze_projects, analyze_skills, check_action_verbs)
+from batch_analyzer import BatchAnalyzer, BatchTooLarge, read_zip_archive
+from nlp_pipeline import (get_stopwords, load_timings, missing_corpora, models_ready, parse_document,
+                          parse_documents, pipeline_info, preload, set_pipeline_replicas, set_sentiment_backend)
+from result_cache import ResultCache, content_key, create_cache_from_env
+from job_queue import JobQueue, QueueFull
+from near_duplicates import create_near_duplicate_index_from_env
+from ranking import RankingIndex, TermFeaturizer
+from resume_store import create_store_from_env
+from result_fields import ALL_STAGES, compact_result, parse_fields, required_stages, select_fields
+from time_budget import Budget, IsolatedExtractor, StageTimeout, create_stage_executor
+from metrics import (ADMISSION_LIMITS, ADMISSION_REJECTED, ADMISSION_WAIT_SECONDS, IN_FLIGHT, REQUEST_SECONDS, REQUESTS,
+                     SamplingProfiler, collect_timings, registry, stage)
+from text_extractor import ExtractionStats, extract_text, hash_stream
 
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('wordnet')
-nltk.download('punkt_tab')
-
-nlp = spacy.load('en_core_web_sm')
+logger = logging.getLogger(__name__)
 
-app = Flask(__name__, static_folder='../frontend/build', static_url_path='')
-CORS(app, resources={r"/api/*": {"origins": "*"}})
+class UploadRequest(Request):
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Keep uploads in memory up to UPLOAD_SPOOL_SIZE, then spill to an anonymous temp file
+        return tempfile.SpooledTemporaryFile(max_size=current_app.config['UPLOAD_SPOOL_SIZE'], mode='rb+')
 
-UPLOAD_FOLDER = 'uploads'
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
+DEFAULT_STAGE_TIMEOUTS = {"extraction": 8, "sections": 2, "parse": 5, "keywords": 2, "entities": 2, "sentiment": 2, "industry": 2}
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+def load_config():
+    # Defaults, overridable through the environment
+    return {
+        'MAX_CONTENT_LENGTH': 16 * 1024 * 1024,  # 16MB max file size
+        'UPLOAD_SPOOL_SIZE': int(os.environ.get("UPLOAD_SPOOL_SIZE", 2 * 1024 * 1024)),
+        'MAX_BATCH_FILES': int(os.environ.get("MAX_BATCH_FILES", 200)),
+        # Total size of a batch's files, counting zip entries uncompressed
+        'MAX_BATCH_BYTES': int(os.environ.get("MAX_BATCH_BYTES", 64 * 1024 * 1024)),
+        # Extraction budgets: stop reading once we have more than enough text to score
+        'PDF_MAX_PAGES': int(os.environ.get("PDF_MAX_PAGES", 10)),
+        'TEXT_MAX_CHARS': int(os.environ.get("TEXT_MAX_CHARS", 50000)),
+        'SLOW_EXTRACTION_SECONDS': float(os.environ.get("SLOW_EXTRACTION_SECONDS", 2.0)),
+        'JOB_WORKERS': int(os.environ.get("JOB_WORKERS", 2)),
+        'JOB_QUEUE_DEPTH': int(os.environ.get("JOB_QUEUE_DEPTH", 32)),
+        'JOB_RESULT_TTL': int(os.environ.get("JOB_RESULT_TTL", 600)),
+        # How models are loaded: "lazy" on the first request, "background" in a thread
+        # right after startup, or "preload" before the app is served (use it with a
+        # pre-forking server so workers share the loaded models copy-on-write)
+        'MODEL_LOADING': os.environ.get("MODEL_LOADING", "background"),
+        'RANK_MAX_K': int(os.environ.get("RANK_MAX_K", 1000)),
+        'COMPARE_MAX_RESUMES': int(os.environ.get("COMPARE_MAX_RESUMES", 1000)),
+        # Entity extraction results kept per section, by hash of the section text
+        'SECTION_CACHE_SIZE': int(os.environ.get("SECTION_CACHE_SIZE", 4096)),
+        # Uploads at least this similar (MinHash estimate of shingle Jaccard) to a stored
+        # resume are flagged; with reuse on, the stored resume's analysis is returned
+        'NEAR_DUPLICATE_THRESHOLD': float(os.environ.get("NEAR_DUPLICATE_THRESHOLD", 0.9)),
+        'NEAR_DUPLICATE_REUSE': os.environ.get("NEAR_DUPLICATE_REUSE", "false").lower() == "true",
+        # Time budget for /api/analyze: overall SLA and per-stage limits, in seconds (0 = no budget)
+        'ANALYSIS_BUDGET_SECONDS': float(os.environ.get("ANALYSIS_BUDGET_SECONDS", 15)),
+        'STAGE_TIMEOUTS': {
+            name: float(os.environ.get(f"{name.upper()}_TIMEOUT_SECONDS", default))
+            for name, default in DEFAULT_STAGE_TIMEOUTS.items()
+        },
+        'STAGE_WORKERS': int(os.environ.get("STAGE_WORKERS", 8)),
+        # spaCy pipelines per process; each parse borrows one, so this caps concurrent
+        # parses. More than 1 loads extra copies of the model (~50MB each) on demand.
+        'NLP_REPLICAS': int(os.environ.get("NLP_REPLICAS", 1)),
+        # "lexicon" scores TextBlob's pattern lexicon directly (same scores, much faster), "textblob" calls TextBlob
+        'SENTIMENT_BACKEND': os.environ.get("SENTIMENT_BACKEND", "lexicon"),
+        # "process" runs extraction in killable worker processes, "thread" in the stage pool
+        'EXTRACTION_ISOLATION': os.environ.get("EXTRACTION_ISOLATION", "process"),
+        'EXTRACTION_WORKERS': int(os.environ.get("EXTRACTION_WORKERS", 2)),
+        # Per-client token buckets on the analysis endpoints (0 = off). Clients are told apart by
+        # RATE_LIMIT_KEY_HEADER (e.g. X-API-Key) when set and present, else by remote address.
+        # Buckets live in this process unless RATE_LIMIT_DB names a SQLite file shared by the workers.
+        'RATE_LIMIT_PER_MINUTE': float(os.environ.get("RATE_LIMIT_PER_MINUTE", 120)),
+        'RATE_LIMIT_BURST': int(os.environ.get("RATE_LIMIT_BURST", 30)),
+        'RATE_LIMIT_KEY_HEADER': os.environ.get("RATE_LIMIT_KEY_HEADER"),
+        'RATE_LIMIT_DB': os.environ.get("RATE_LIMIT_DB"),
+        # Batch and bulk-index uploads also take one token per file from a second bucket
+        # (0 = off), whose burst defaults to a full batch
+        'BATCH_FILES_PER_MINUTE': float(os.environ.get("BATCH_FILES_PER_MINUTE", 240)),
+        'BATCH_FILES_BURST': int(os.environ.get("BATCH_FILES_BURST", os.environ.get("MAX_BATCH_FILES", 200))),
+        # Reverse proxies in front of the app (1 on Render) whose X-Forwarded-For and
+        # X-Forwarded-Proto are trusted, so remote_addr is the client's, not the proxy's
+        'PROXY_HOPS': int(os.environ.get("PROXY_HOPS", 0)),
+        # Analyses running at once per process (0 = no cap), how many may wait for a slot,
+        # and how long; past that requests are shed with 503 and Retry-After
+        'MAX_IN_FLIGHT': int(os.environ.get("MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)),
+        'MAX_QUEUED': int(os.environ.get("MAX_QUEUED", DEFAULT_MAX_QUEUED)),
+        'MAX_QUEUE_WAIT_SECONDS': float(os.environ.get("MAX_QUEUE_WAIT_SECONDS", 10)),
+        # gzip JSON responses of at least this many bytes for clients that accept it
+        'COMPRESS_MIN_SIZE': int(os.environ.get("COMPRESS_MIN_SIZE", 1024)),
+        'COMPRESS_LEVEL': int(os.environ.get("COMPRESS_LEVEL", 6)),
+        # Profile one in every PROFILE_EVERY analyze requests with cProfile (0 = off)
+        'PROFILE_EVERY': int(os.environ.get("PROFILE_EVERY", 0)),
+        'PROFILE_DIR': os.environ.get("PROFILE_DIR"),
+    }
 
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(file_path):
-    with open(file_path, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
+def extraction_limits(config):
+    return {
+        "max_pages": config['PDF_MAX_PAGES'],
+        "max_chars": config['TEXT_MAX_CHARS'],
+        "slow_seconds": config['SLOW_EXTRACTION_SECONDS']
+    }
+
+def extract_upload(filename, source, max_pages=None, max_chars=None, slow_seconds=None):
+    # Extract text within the given budgets and report pathological documents
+    stats = ExtractionStats()
+    with stage("extraction"):
+        text = extract_text(filename, source, max_pages, max_chars, stats)
+    if slow_seconds is not None and stats.seconds > slow_seconds:
+        logger.warning("Slow extraction for %s: %.2fs over %d pages, slowest pages %s",
+                       filename, stats.seconds, stats.pages_read, stats.slowest_pages())
     return text
 
-def extract_text_from_docx(file_path):
-    doc = docx.Document(file_path)
-    full_text = []
-    for para in doc.paragraphs:
-        full_text.append(para.text)
-    return '\n'.join(full_text)
+def extract_sections(text, segments=None):
+    # Split the resume on heading lines in a single pass, or join already found segments
+    return default_segmenter.extract(text, segments)
 
-def extract_sections(text):
-    # Simple section extraction based on common headings
-    sections = {}
-    
-    # Education section
-    education_pattern = r'(?i)(EDUCATION|ACADEMIC BACKGROUND).*?(?=(EXPERIENCE|SKILLS|PROJECTS|$))'
-    education_match = re.search(education_pattern, text, re.DOTALL)
-    sections['education'] = education_match.group(0) if education_match else ""
-    
-    # Experience section
-    experience_pattern = r'(?i)(EXPERIENCE|WORK EXPERIENCE|EMPLOYMENT).*?(?=(EDUCATION|SKILLS|PROJECTS|$))'
-    experience_match = re.search(experience_pattern, text, re.DOTALL)
-    sections['experience'] = experience_match.group(0) if experience_match else ""
-    
-    # Skills section
-    skills_pattern = r'(?i)(SKILLS|TECHNICAL SKILLS|EXPERTISE).*?(?=(EDUCATION|EXPERIENCE|PROJECTS|$))'
-    skills_match = re.search(skills_pattern, text, re.DOTALL)
-    sections['skills'] = skills_match.group(0) if skills_match else ""
-    
-    # Projects section
-    projects_pattern = r'(?i)(PROJECTS|PERSONAL PROJECTS).*?(?=(EDUCATION|EXPERIENCE|SKILLS|$))'
-    projects_match = re.search(projects_pattern, text, re.DOTALL)
-    sections['projects'] = projects_match.group(0) if projects_match else ""
-    
-    return sections
+def run_stage(budget, name, fn, *args):
+    # Time a stage, and hold it to the request's time budget when there is one
+    with stage(name):
+        return fn(*args) if budget is None else budget.run(name, fn, *args)
 
-def analyze_resume(text,filename=None):
-    # Extract basic information
-    sections = extract_sections(text)
+def score_sections(results, sections):
+    # Score every known section, suggest the missing ones, and set the overall score (out of 100)
+    results["sections"] = {}
+    total_score = 0
+    for scorer in SECTION_SCORERS:
+        section_text = sections[scorer.name]
+        if section_text:
+            with stage(scorer.name):
+                score, feedback = scorer.score(section_text, section_text.lower())
+            results["sections"][scorer.name] = {
+                "exists": True,
+                "score": score,
+                "feedback": feedback
+            }
+            total_score += score * scorer.weight / 100
+        else:
+            results["sections"][scorer.name] = {
+                "exists": False,
+                "score": 0,
+                "feedback": [scorer.missing_feedback]
+            }
+            results["suggestions"].append(scorer.missing_suggestion)
+    results["overall_score"] = round(total_score)
+
+def analyze_resume(text, filename=None, parsed=None, budget=None, stages=None, segments=None):
+    # Parse once and share the result with every analyzer; `stages` limits the optional stages that run.
+    # `segments` are the resume's sections from the segmenter, None when segmentation ran out of time.
+    if parsed is None and (stages is None or "parse" in stages):
+        parsed = run_stage(budget, "parse", parse_document, text)
     
     # Analyze the content
     results = {
-        "overall_score": 0,
-        "sections": {},
+        "overall_score": None,
+        "sections": None,
         "suggestions": [],
         "strengths": [],
-        "word_count": len(word_tokenize(text))
-    }
-    
-    # Check if essential sections exist and analyze them
-    section_weights = {
-        "education": 20,
-        "experience": 35,
-        "skills": 25,
-        "projects": 20
+        # Whitespace words if parsing ran out of time
+        "word_count": parsed.word_count if parsed is not None else len(text.split())
     }
     
-    total_score = 0
-    
-    # Analyze education section
-    if sections['education']:
-        edu_score, edu_feedback = analyze_education(sections['education'])
-        results["sections"]["education"] = {
-            "exists": True,
-            "score": edu_score,
-            "feedback": edu_feedback
-        }
-        total_score += edu_score * section_weights["education"] / 100
-    else:
-        results["sections"]["education"] = {
-            "exists": False,
-            "score": 0,
-            "feedback": ["Education section is missing"]
-        }
-        results["suggestions"].append("Add an Education section with your degrees, institutions, and graduation dates")
-    
-    # Analyze experience section
-    if sections['experience']:
-        exp_score, exp_feedback = analyze_experience(sections['experience'])
-        results["sections"]["experience"] = {
-            "exists": True,
-            "score": exp_score,
-            "feedback": exp_feedback
-        }
-        total_score += exp_score * section_weights["experience"] / 100
-    else:
-        results["sections"]["experience"] = {
-            "exists": False,
-            "score": 0,
-            "feedback": ["Experience section is missing"]
-        }
-        results["suggestions"].append("Add a Work Experience section with your job titles, employers, and achievements")
-    
-    # Analyze skills section
-    if sections['skills']:
-        skills_score, skills_feedback = analyze_skills(sections['skills'])
-        results["sections"]["skills"] = {
-            "exists": True,
-            "score": skills_score,
-            "feedback": skills_feedback
-        }
-        total_score += skills_score * section_weights["skills"] / 100
-    else:
-        results["sections"]["skills"] = {
-            "exists": False,
-            "score": 0,
-            "feedback": ["Skills section is missing"]
-        }
-        results["suggestions"].append("Add a Skills section highlighting your technical and soft skills")
-    
-    # Analyze projects section
-    if sections['projects']:
-        proj_score, proj_feedback = analyze_projects(sections['projects'])
-        results["sections"]["projects"] = {
-            "exists": True,
-            "score": proj_score,
-            "feedback": proj_feedback
-        }
-        total_score += proj_score * section_weights["projects"] / 100
-    else:
-        results["sections"]["projects"] = {
-            "exists": False,
-            "score": 0,
-            "feedback": ["Projects section is missing or not clearly defined"]
-        }
-        results["suggestions"].append("Consider adding a Projects section to showcase your practical skills")
-    
-    # Calculate overall score (out of 100)
-    results["overall_score"] = round(total_score)
+    # Check if essential sections exist and analyze them. Without segments
+    # (segmentation ran out of time) they are unknown, not missing, so stay null.
+    if segments is not None:
+        score_sections(results, extract_sections(text, segments))
     
     # Check for action verbs
-    action_verbs = check_action_verbs(text)
+    with stage("action_verbs"):
+        action_verbs = check_action_verbs(text, parsed.text_lower if parsed is not None else None)
     if action_verbs["score"] < 70:
         results["suggestions"].append("Use more strong action verbs to describe your achievements")
     else:
         results["strengths"].append("Good use of action verbs")
     
     # Check for keywords
-    keywords = extract_keywords(text)
-    if len(keywords) < 10:
-        results["suggestions"].append("Include more industry-specific keywords to pass ATS screening")
-    else:
-        results["strengths"].append("Good use of industry keywords")
+    keywords = None
+    if parsed is not None and (stages is None or "keywords" in stages):
+        keywords = run_stage(budget, "keywords", extract_keywords, text, parsed)
+    if keywords is not None:
+        if len(keywords) < 10:
+            results["suggestions"].append("Include more industry-specific keywords to pass ATS screening")
+        else:
+            results["strengths"].append("Good use of industry keywords")
     
     # Check resume length
     if results["word_count"] < 300:
@@ -192,242 +216,450 @@ def analyze_resume(text,filename=None):
         
     return results
 
-def analyze_education(text):
-    score = 100  # Base score
-    feedback = []
-    
-    # Check for degree mentions
-    degree_keywords = [
-    "bachelor", "master", "phd", "doctorate", "diploma", "certificate", "degree",
-    "btech", "b.tech", "b.e", "be", "beng", "b.eng",
-    "mtech", "m.tech", "m.e", "me", "meng", "m.eng",
-    "bca", "mca",
-    "bsc", "b.sc", "msc", "m.sc",
-    "bcom", "b.com", "mcom", "m.com",
-    "bba", "mba", "pgdm", "pgdbm",
-    "ba", "b.a", "ma", "m.a",
-    "llb", "ll.m", "llm",
-    "mbbs", "bds", "b.pharm", "m.pharm", "bpt", "bams", "bhms",
-    "b.ed", "bed", "m.ed", "med",
-    "associate", "undergraduate", "postgraduate",
-    "high school", "hsc", "ssc", "10th", "12th"
-    ]
-    has_degree = any(keyword in text.lower() for keyword in degree_keywords)
-    
-    if not has_degree:
-        score -= 20
-        feedback.append("No clear mention of degree type")
-    
-    # Check for dates
-    date_pattern = r'(19|20)\d{2}'
-    dates = re.findall(date_pattern, text)
-    
-    if not dates:
-        score -= 15
-        feedback.append("No graduation dates mentioned")
-    
-    # Check for institutions
-    institution_keywords = ["university", "college", "institute", "school"]
-    has_institution = any(keyword in text.lower() for keyword in institution_keywords)
-    
-    if not has_institution:
-        score -= 15
-        feedback.append("No clear mention of educational institutions")
-    
-    # Check for GPA or honors
-    gpa_pattern = r'(gpa|grade point average|cum laude|honors|distinction)'
-    has_gpa = re.search(gpa_pattern, text.lower())
-    
-    if not has_gpa:
-        feedback.append("Consider adding GPA or academic honors if they're strong")
-    
-    # Return the results (cap score between 0-100)
-    score = max(0, min(100, score))
-    
-    if score >= 80:
-        feedback.append("Education section is well-structured")
-    
-    return score, feedback
-
-def analyze_experience(text):
-    score = 100 # Base score
-    feedback = []
-    
-    # Check for company names
-    company_pattern = r'(inc|llc|ltd|corporation|corp|company)'
-    has_companies = re.search(company_pattern, text.lower())
-    
-    if not has_companies:
-        score -= 10
-        feedback.append("Company names may not be clearly mentioned")
-    
-    # Check for job titles
-    job_keywords = ["manager", "developer", "engineer", "analyst", "assistant", "director", "coordinator", "specialist"]
-    has_job_titles = any(keyword in text.lower() for keyword in job_keywords)
-    
-    if not has_job_titles:
-        score -= 15
-        feedback.append("Job titles are not clearly stated")
-    
-    # Check for dates
-    date_pattern = r'(19|20)\d{2}|present|current|now'
-    dates = re.findall(date_pattern, text.lower())
-    
-    if len(dates) < 2:
-        score -= 15
-        feedback.append("Employment dates may be missing or incomplete")
-    
-    # Check for bullet points
-    bullet_pattern = r'•|\*|\-'
-    bullets = re.findall(bullet_pattern, text)
-    
-    if len(bullets) < 3:
-        score -= 10
-        feedback.append("Consider using bullet points to highlight achievements")
-    
-    # Check for metrics and achievements
-    metrics_pattern = r'(\d+%|\d+ percent|increased|decreased|improved|reduced|led|managed|created)'
-    metrics = re.findall(metrics_pattern, text.lower())
-    
-    if len(metrics) < 3:
-        score -= 15
-        feedback.append("Add more quantifiable achievements with metrics")
-    else:
-        score += 10
-        feedback.append("Good use of quantifiable metrics")
-    
-    # Return the results (cap score between 0-100)
-    score = max(0, min(100, score))
+def extract_keywords(text, parsed=None):
+    # Extract potential keywords using NLP
+    if parsed is None:
+        parsed = parse_document(text)
     
-    if score >= 80:
-        feedback.append("Experience section effectively highlights your work history")
+    # Keep only unique keywords, in document order
+    keywords = keyword_phrases(parsed)
     
-    return score, feedback
+    return list(dict.fromkeys(keywords))[:20]
 
-def analyze_skills(text):
-    score = 100 # Base score
-    feedback = []
-    
-    # Count number of skills
-    text = text.lower()
-    
-    # Technical skills
-    tech_skills = ["python", "java", "javascript", "html", "css", "react", "angular", 
-                   "node", "sql", "database", "aws", "azure", "cloud", "docker", 
-                   "kubernetes", "git", "agile", "scrum", "machine learning", "ai","c++","c"]
-    
-    tech_count = sum(1 for skill in tech_skills if skill in text)
-    
-    # Soft skills
-    soft_skills = ["communication", "leadership", "teamwork", "problem solving", 
-                   "critical thinking", "time management", "project management", 
-                   "collaboration", "adaptability", "creativity"]
-    
-    soft_count = sum(1 for skill in soft_skills if skill in text)
-    
-    if tech_count < 5:
-        score -= 15
-        feedback.append("Add more technical skills relevant to your field")
-    
-    if soft_count < 3:
-        score -= 10
-        feedback.append("Include some soft skills to show your workplace effectiveness")
-    
-    # Check organization of skills section
-    organization_patterns = [r',', r'•', r'\|', r'\\']
-    has_organization = any(re.search(pattern, text) for pattern in organization_patterns)
-    
-    if not has_organization:
-        score -= 10
-        feedback.append("Organize your skills better (e.g., using categories or separators)")
-    
-    # Return the results (cap score between 0-100)
-    score = max(0, min(100, score))
-    
-    if tech_count >= 8 and soft_count >= 5:
-        score += 10
-        feedback.append("Excellent variety of skills listed")
-    
-    return score, feedback
+def keyword_phrases(parsed):
+    # Noun phrases as potential keywords, without common words
+    stopwords = get_stopwords()
+    return [phrase for phrase in parsed.noun_chunks if phrase not in stopwords and len(phrase) > 3]
 
-def analyze_projects(text):
-    score = 100  # Base score
-    feedback = []
-    
-    # Check for project titles
-    project_count = len(re.findall(r'(?:^|\n)([A-Z][^\n]+)(?:\n|$)', text))
-    
-    if project_count < 2:
-        score -= 15
-        feedback.append("Include more projects to showcase your abilities")
-    
-    # Check for technologies used
-    tech_pattern = r'(tech stack|tools used|using|with|built on|developed in|utilizing) ([^.]*)'
-    has_tech = re.search(tech_pattern, text.lower())
-    
-    if not has_tech:
-        score -= 15
-        feedback.append("Mention technologies used in each project")
-    
-    # Check for project descriptions
-    if len(text.split('\n')) < 5:
-        score -= 10
-        feedback.append("Add more detailed descriptions of your projects")
-    
-    # Check for results or impact
-    impact_pattern = r'(resulted in|improved|increased|decreased|reduced|enhanced)'
-    has_impact = re.search(impact_pattern, text.lower())
-    
-    if not has_impact:
-        score -= 10
-        feedback.append("Describe the impact or results of your projects")
-    
-    # Return the results (cap score between 0-100)
-    score = max(0, min(100, score))
-    
-    if score >= 80:
-        feedback.append("Project section effectively demonstrates your practical skills")
-    
-    return score, feedback
 
-def check_action_verbs(text):
-    action_verbs = [
-        "achieved", "improved", "trained", "maintained", "managed", "created",
-        "resolved", "volunteered", "influenced", "increased", "decreased",
-        "researched", "authored", "developed", "launched", "designed",
-        "implemented", "established", "coordinated", "generated", "delivered",
-        "produced", "performed", "directed", "organized", "supervised"
-    ]
+
+def analyze_document(text, filename=None, parsed=None, budget=None, stages=None, segments=None):
+    # Role-independent analysis, safe to cache by file content
+    if parsed is None and (stages is None or "parse" in stages):
+        parsed = run_stage(budget, "parse", parse_document, text)
+    
+    # Split into sections once, for the section scores and entity extraction
+    if segments is None:
+        segments = run_stage(budget, "sections", default_segmenter.segment, text)
+    
+    # Analyze the resume text
+    analysis_results = analyze_resume(text, filename, parsed, budget, stages, segments)
+    
+    # Jobs, schooling and skills with offsets, from cached per-section NLP runs
+    if stages is None or "entities" in stages:
+        analysis_results["entities"] = None if segments is None else \
+            run_stage(budget, "entities", vocabularies().entity_extractor.extract, text, segments)
+    
+    if stages is not None and "sentiment" not in stages:
+        return analysis_results
+    
+    # Add advanced NLP analysis
+    sentiment = run_stage(budget, "sentiment", parsed.sentiment) if parsed is not None else None
+    if sentiment is None:
+        analysis_results["sentiment"] = None
+    else:
+        polarity, subjectivity = sentiment
+        analysis_results["sentiment"] = {
+            "polarity": round(polarity, 2),
+            "subjectivity": round(subjectivity, 2)
+        }
     
-    # Count occurrences of action verbs
-    text_lower = text.lower()
-    verb_count = sum(1 for verb in action_verbs if verb in text_lower)
+    return analysis_results
+
+def run_analysis(text, industry=None, filename=None, parsed=None, stages=None):
+    analysis_results = analyze_document(text, filename, parsed, stages=stages)
     
-    # Calculate score based on number of unique action verbs found
-    score = min(100, verb_count * 5)
+    # Add industry-specific analysis if requested
+    if industry and (stages is None or "industry" in stages):
+        with stage("industry"):
+            analysis_results["industry_analysis"] = industry_analyzer.analyze_for_industry(text, industry)
     
+    return analysis_results
+
+industry_analyzer = IndustryAnalyzer()
+
+# Terms resumes are ranked on, besides their own noun phrases
+RANKING_CATEGORIES = ["required_skills", "action_verbs", "achievements_keywords"]
+
+class Vocabularies:
+    """The matchers built from the industry profiles' terms, for one set of profile versions"""
+    
+    def __init__(self, industries, versions, previous=None):
+        self.versions = versions
+        self.ranking_featurizer = TermFeaturizer(
+            [term for data in industries.values() for category in RANKING_CATEGORIES for term in data[category]]
+            + TECH_SKILLS + SOFT_SKILLS
+        )
+        # Skills looked for in job descriptions and resumes
+        self.skills = [term for data in industries.values() for term in data["required_skills"]] + TECH_SKILLS + SOFT_SKILLS
+        self.jd_extractor = JobDescriptionExtractor(self.skills)
+        # The section cache carries over; its keys include the vocabulary version
+        self.entity_extractor = EntityExtractor(self.skills, cache=previous.entity_extractor.cache if previous else None)
+        self.version = self.entity_extractor.version
+
+_vocabularies = None
+
+def vocabularies():
+    # Rebuilt when an industry profile changes, so its new terms are matched without a restart
+    global _vocabularies
+    industry_analyzer.maybe_reload()
+    versions = tuple(sorted((industry, profile.version) for industry, profile in industry_analyzer.profiles.items()))
+    current = _vocabularies
+    if current is None or current.versions != versions:
+        # Threads racing here build the same thing, whichever lands last is kept
+        current = _vocabularies = Vocabularies(industry_analyzer.industries, versions, current)
+    return current
+
+def ranking_features(text, industry=None, filename=None, parsed=None):
+    # Term counts of a resume or job description; same signature as run_analysis for the batch workers
+    if parsed is None:
+        parsed = parse_document(text)
+    return vocabularies().ranking_featurizer.features(text, keyword_phrases(parsed))
+
+def job_description_too_long(text):
+    # Job descriptions are parsed whole, so they get the same cap as extracted resume text
+    max_chars = current_app.config['TEXT_MAX_CHARS']
+    if len(text) > max_chars:
+        return jsonify({"error": f"job_description is longer than {max_chars} characters"}), 413
+    return None
+
+def job_description_key(jd_id, vocabulary):
+    # Cached features are only valid for the skills they were matched against
+    return f"{vocabulary.version}:{jd_id}"
+
+def job_description_features(text):
+    # Skills and noun phrases of a job description, parsed once per distinct text
+    result_cache = current_app.extensions['result_cache']
+    vocabulary = vocabularies()
+    jd_id = content_key(text.strip().encode('utf-8'))
+    features = result_cache.get("job_descriptions", job_description_key(jd_id, vocabulary))
+    if features is not None:
+        return jd_id, features, "HIT"
+    
+    with stage("job_description"):
+        parsed = parse_document(text)
+        features = vocabulary.jd_extractor.extract(text, parsed.noun_chunks, get_stopwords())
+    result_cache.set("job_descriptions", job_description_key(jd_id, vocabulary), features)
+    return jd_id, features, "MISS"
+
+def index_document(text, industry=None, filename=None, parsed=None, stages=None, segments=None, entities=None):
+    # Everything the resume index keeps; runs in the batch workers for bulk indexing,
+    # which always need every stage. Sections and entities already found for the analysis are reused.
+    sections = segments if segments is not None else default_segmenter.segment(text)
     return {
-        "score": score,
-        "count": verb_count,
-        "suggested_verbs": action_verbs[:10]  # Return some suggested verbs
+        "text": text,
+        "sections": [section.to_dict() for section in sections],
+        "features": ranking_features(text, parsed=parsed),
+        "entities": entities if entities is not None else vocabularies().entity_extractor.extract(text, sections)
     }
 
-def extract_keywords(text):
-    # Extract potential keywords using NLP
-    doc = nlp(text)
-    
-    # Extract noun phrases as potential keywords
-    keywords = [chunk.text.lower() for chunk in doc.noun_chunks]
-    
-    # Filter out common words and keep only unique keywords
-    stopwords = nltk.corpus.stopwords.words('english')
-    keywords = [word for word in keywords if word not in stopwords and len(word) > 3]
-    
-    return list(set(keywords))[:20]  
+api = Blueprint('api', __name__)
+
+def warm_models():
+    try:
+        preload()
+        logger.info("Models loaded: %s", load_timings)
+    except Exception:
+        logger.exception("Loading models failed")
+
+def create_app(config=None):
+    app = Flask(__name__, static_folder='../frontend/build', static_url_path='')
+    app.request_class = UploadRequest
+    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    
+    app.config.update(load_config())
+    app.config.update(config or {})
+    if app.config['PROXY_HOPS']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_HOPS'], x_proto=app.config['PROXY_HOPS'])
+    
+    app.extensions['result_cache'] = create_cache_from_env()
+    vocabularies().entity_extractor.cache = ResultCache(max_entries=app.config['SECTION_CACHE_SIZE'], ttl=None)
+    app.extensions['job_queue'] = JobQueue(
+        workers=app.config['JOB_WORKERS'],
+        max_depth=app.config['JOB_QUEUE_DEPTH'],
+        result_ttl=app.config['JOB_RESULT_TTL']
+    )
+    # Batch workers run outside the app context, so bind the extraction budgets now
+    # One worker pool for both batch endpoints; each batch names the work to run on its uploads
+    app.extensions['batch_analyzer'] = BatchAnalyzer(
+        partial(extract_upload, **extraction_limits(app.config)), parse_documents
+    )
+    # The resume store is the source of truth; the ranking matrix is rebuilt from it
+    app.extensions['resume_store'] = create_store_from_env()
+    app.extensions['ranking_index'] = RankingIndex()
+    app.extensions['ranking_synced_seq'] = 0
+    app.extensions['near_duplicates'] = create_near_duplicate_index_from_env()
+    app.extensions['stage_executor'] = create_stage_executor(app.config['STAGE_WORKERS'])
+    if app.config['EXTRACTION_ISOLATION'] == "process" and 'fork' in multiprocessing.get_all_start_methods():
+        app.extensions['isolated_extractor'] = IsolatedExtractor(extract_upload, app.config['EXTRACTION_WORKERS'])
+    app.extensions['profiler'] = SamplingProfiler(app.config['PROFILE_EVERY'], app.config['PROFILE_DIR'])
+    bucket_store = SQLiteBucketStore(app.config['RATE_LIMIT_DB']) if app.config['RATE_LIMIT_DB'] else LocalBucketStore()
+    app.extensions['rate_limiter'] = RateLimiter(app.config['RATE_LIMIT_PER_MINUTE'], app.config['RATE_LIMIT_BURST'],
+                                                 bucket_store)
+    app.extensions['batch_rate_limiter'] = RateLimiter(app.config['BATCH_FILES_PER_MINUTE'],
+                                                       app.config['BATCH_FILES_BURST'], bucket_store)
+    app.extensions['concurrency_limiter'] = ConcurrencyLimiter(
+        app.config['MAX_IN_FLIGHT'], app.config['MAX_QUEUED'], app.config['MAX_QUEUE_WAIT_SECONDS'],
+        on_change=lambda active, waiting: (IN_FLIGHT.set("running", value=active),
+                                           IN_FLIGHT.set("waiting", value=waiting))
+    )
+    for limit, value in (("rate_per_minute", app.config['RATE_LIMIT_PER_MINUTE']),
+                         ("rate_burst", app.config['RATE_LIMIT_BURST']),
+                         ("batch_files_per_minute", app.config['BATCH_FILES_PER_MINUTE']),
+                         ("in_flight", app.config['MAX_IN_FLIGHT']),
+                         ("queued", app.config['MAX_QUEUED']),
+                         ("queue_wait_seconds", app.config['MAX_QUEUE_WAIT_SECONDS'])):
+        ADMISSION_LIMITS.set(limit, value=value)
+    
+    app.register_blueprint(api)
+    app.after_request(compress_response)
+    app.register_error_handler(404, not_found)
+    
+    set_pipeline_replicas(app.config['NLP_REPLICAS'])
+    set_sentiment_backend(app.config['SENTIMENT_BACKEND'])
+    if app.config['MODEL_LOADING'] == "preload":
+        preload()
+    elif app.config['MODEL_LOADING'] == "background":
+        threading.Thread(target=warm_models, name='model-preload', daemon=True).start()
+    
+    startup_seconds = round(time.perf_counter() - _startup_started, 3)
+    app.extensions['startup_seconds'] = startup_seconds
+    logger.info("App created %.3fs after import started (model loading: %s)",
+                startup_seconds, app.config['MODEL_LOADING'])
+    
+    return app
+
+def client_key():
+    header = current_app.config['RATE_LIMIT_KEY_HEADER']
+    return (header and request.headers.get(header)) or request.remote_addr or "unknown"
+
+def rate_limited_response(endpoint, retry_after):
+    ADMISSION_REJECTED.inc(endpoint, "rate_limited")
+    response = jsonify({"error": "Too many requests, slow down"})
+    response.headers['Retry-After'] = retry_after_header(retry_after)
+    return response, 429
+
+def batch_rate_limited(endpoint, uploads):
+    # One token per file on top of the request's own, from the client's file bucket.
+    # A batch never costs more than a full bucket, so it can always get through eventually.
+    limiter = current_app.extensions['batch_rate_limiter']
+    retry_after = limiter.check(f"files:{client_key()}", cost=min(len(uploads), limiter.burst))
+    return rate_limited_response(endpoint, retry_after) if retry_after else None
+
+def admission_controlled(endpoint, limit_concurrency=True):
+    # Rate limit the client, then hold one of this process's analysis slots while the view runs
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            retry_after = current_app.extensions['rate_limiter'].check(client_key())
+            if retry_after:
+                return rate_limited_response(endpoint, retry_after)
+            if not limit_concurrency:
+                return view(*args, **kwargs)
+            
+            limiter = current_app.extensions['concurrency_limiter']
+            try:
+                waited = limiter.acquire()
+            except Overloaded as e:
+                ADMISSION_REJECTED.inc(endpoint, e.reason)
+                response = jsonify({"error": "Server is busy, try again later"})
+                response.headers['Retry-After'] = retry_after_header(e.retry_after)
+                return response, 503
+            ADMISSION_WAIT_SECONDS.observe(endpoint, value=waited)
+            start = time.perf_counter()
+            try:
+                return view(*args, **kwargs)
+            finally:
+                limiter.release(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+def timings_requested():
+    # ?debug=timings adds per-stage timings to the response
+    return 'timings' in request.args.get('debug', '').split(',')
+
+def requested_fields():
+    # fields= (or include=) selects which parts of the result are computed and returned
+    return parse_fields(request.values.get('fields') or request.values.get('include'))
+
+def requested_stages(fields):
+    # Stages the selected fields need, without sentiment when the request turns it off (sentiment=0)
+    stages = required_stages(fields)
+    if request.values.get('sentiment', '').lower() in ('0', 'false', 'no', 'off'):
+        stages = (ALL_STAGES if stages is None else stages) - {"sentiment"}
+    return stages
+
+def compact_requested():
+    return request.values.get('compact', '').lower() in ('1', 'true', 'yes')
 
+def shape_result(analysis_results, fields):
+    if fields is not None:
+        analysis_results = select_fields(analysis_results, fields)
+    if compact_requested():
+        analysis_results = compact_result(analysis_results)
+    return analysis_results
 
+def compress_response(response):
+    # gzip JSON bodies for clients that accept it; small bodies are not worth it
+    if (response.status_code != 200 or response.direct_passthrough or not response.is_json
+            or 'Content-Encoding' in response.headers
+            or not request.accept_encodings.quality('gzip')):
+        return response
+    data = response.get_data()
+    if len(data) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+    response.set_data(gzip.compress(data, compresslevel=current_app.config['COMPRESS_LEVEL']))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
 
-@app.route('/api/analyze', methods=['POST'])
+def store_resume(key, filename, document):
+    current_app.extensions['resume_store'].add(
+        key, filename, document["text"], document["sections"], document["features"], document.get("entities")
+    )
+
+def sync_ranking_index():
+    # Fold resumes stored since the last sync, by this or another worker, into the ranking matrix
+    ranking_index = current_app.extensions['ranking_index']
+    seq, rows = current_app.extensions['resume_store'].features_since(current_app.extensions['ranking_synced_seq'])
+    for resume_id, filename, features in rows:
+        ranking_index.add(resume_id, features, {"filename": filename})
+    current_app.extensions['ranking_synced_seq'] = seq
+    return ranking_index
+
+def reuse_duplicates_requested():
+    value = request.values.get('reuse_duplicates')
+    if value is None:
+        return current_app.config['NEAR_DUPLICATE_REUSE']
+    return value.lower() in ('1', 'true', 'yes')
+
+def find_near_duplicate(key, text):
+    # (signature, (resume_id, similarity) of the closest stored resume); both None for a text without words
+    near_duplicates = current_app.extensions['near_duplicates']
+    with stage("near_duplicates"):
+        signature = near_duplicates.hasher.signature(text)
+        if signature is None:
+            return None, None
+        match = near_duplicates.nearest(signature, current_app.config['NEAR_DUPLICATE_THRESHOLD'], exclude=key)
+    return signature, match
+
+def cache_allowed():
+    # Tenants can keep their uploads out of the cache with Cache-Control: no-store
+    return 'no-store' not in request.headers.get('Cache-Control', '').lower()
+
+def request_budget(inline=False):
+    # inline runs the stages in the request thread, for requests being profiled
+    seconds = current_app.config['ANALYSIS_BUDGET_SECONDS']
+    if seconds <= 0:
+        return None
+    executor = None if inline else current_app.extensions['stage_executor']
+    return Budget(seconds, current_app.config['STAGE_TIMEOUTS'], executor)
+
+def extract_within_budget(filename, source, budget):
+    # Extraction cannot be skipped, so running out of time raises StageTimeout
+    limits = extraction_limits(current_app.config)
+    isolated_extractor = current_app.extensions.get('isolated_extractor')
+    with stage("extraction"):
+        # Inline budgets (profiled requests) extract in this thread too
+        if isolated_extractor is None or budget.executor is None:
+            text = budget.run("extraction", partial(extract_upload, **limits), filename, source)
+            if text is None:
+                raise StageTimeout("extraction")
+            return text
+        
+        if not isinstance(source, (bytes, bytearray)):
+            source.seek(0)
+            source = source.read()
+        try:
+            return isolated_extractor.extract(filename, source, budget.limit("extraction"), **limits)
+        except StageTimeout:
+            budget.skip("extraction", "timeout")
+            raise
+
+def analyze_upload(filename, source, key, industry=None, use_cache=True, budget=None, stages=None,
+                   reuse_duplicates=False):
+    # stages=None runs everything; a set runs only those optional stages (see result_fields)
+    result_cache = current_app.extensions['result_cache']
+    
+    # Reuse the extraction and NLP work from an earlier upload of the same bytes
+    document = result_cache.get("documents", key) if use_cache else None
+    cache_status = "HIT" if document else "MISS"
+    duplicate = None
+    
+    if document is None:
+        # Extract text straight from the upload, nothing is written to disk
+        if budget is None:
+            text = extract_upload(filename, source, **extraction_limits(current_app.config))
+        else:
+            text = extract_within_budget(filename, source, budget)
+        
+        # Uploads that opt out of caching are neither matched nor remembered
+        signature = None
+        if use_cache:
+            signature, duplicate = find_near_duplicate(key, text)
+        
+        # A near-duplicate's analysis is served as is, but not cached or indexed under this file
+        reused = result_cache.get("documents", duplicate[0]) if duplicate and reuse_duplicates else None
+        if reused is not None:
+            document = {"text": text, "analysis": reused["analysis"]}
+            if stages is not None and "entities" not in stages:
+                document["analysis"] = {name: value for name, value in reused["analysis"].items()
+                                        if name != "entities"}
+            elif reused["analysis"].get("entities") is not None:
+                # Entities point into the text they came from; unchanged sections hit the section cache
+                entities = run_stage(budget, "entities", vocabularies().entity_extractor.extract, text)
+                document["analysis"] = dict(reused["analysis"], entities=entities)
+            cache_status = "NEAR"
+        else:
+            # Analyze the resume text
+            parsed = None
+            if stages is None or "parse" in stages:
+                parsed = run_stage(budget, "parse", parse_document, text)
+            segments = run_stage(budget, "sections", default_segmenter.segment, text)
+            document = {"text": text, "analysis": analyze_document(text, filename, parsed, budget, stages, segments)}
+            
+            # Partial results are never cached or indexed, the next upload gets a full run
+            if use_cache and stages is None and not (budget and budget.partial):
+                result_cache.set("documents", key, document)
+                # Keep the resume for ranking, bulk re-scoring and duplicate detection
+                with stage("indexing"):
+                    store_resume(key, filename, index_document(text, parsed=parsed, segments=segments,
+                                                               entities=document["analysis"].get("entities")))
+                    if signature is not None:
+                        current_app.extensions['near_duplicates'].add(key, signature)
+    
+    analysis_results = dict(document["analysis"])
+    if stages is not None and "sentiment" not in stages:
+        # A cached analysis has it, but this request turned it off
+        analysis_results.pop("sentiment", None)
+    if duplicate:
+        analysis_results["duplicate_of"] = {
+            "resume_id": duplicate[0],
+            "similarity": round(duplicate[1], 3),
+            "reused_analysis": cache_status == "NEAR"
+        }
+    
+    # Add industry-specific analysis if requested
+    if industry and (stages is None or "industry" in stages):
+        # Keyed by profile version so edited profiles are not served stale results
+        industry_key = f"{key}:{industry}:{industry_analyzer.version(industry)}"
+        industry_analysis = result_cache.get("industry", industry_key) if use_cache else None
+        if industry_analysis is None:
+            industry_analysis = run_stage(budget, "industry", industry_analyzer.analyze_for_industry,
+                                          document["text"], industry)
+            if use_cache and industry_analysis is not None:
+                result_cache.set("industry", industry_key, industry_analysis)
+        analysis_results["industry_analysis"] = industry_analysis
+    
+    if budget is not None:
+        # Fields of skipped stages are null (or approximate, for word_count)
+        analysis_results["partial"] = budget.partial
+        analysis_results["skipped_stages"] = dict(budget.skipped)
+    
+    return analysis_results, cache_status if use_cache else "BYPASS"
+
+@api.route('/api/analyze', methods=['POST'])
+@admission_controlled("analyze")
 def analyze():
     if 'file' not in request.files:
         return jsonify({"error": "No file part"}), 400
@@ -439,50 +671,443 @@ def analyze():
         return jsonify({"error": "No selected file"}), 400
     
     if file and allowed_file(file.filename):
-        filename = os.path.join(app.config['UPLOAD_FOLDER'], file.filename)
-        file.save(filename)
-        
-        # Extract text based on file type
-        if filename.endswith('.pdf'):
-            text = extract_text_from_pdf(filename)
-        elif filename.endswith('.docx'):
-            text = extract_text_from_docx(filename)
-        else:
-            return jsonify({"error": "Unsupported file format"}), 400
-        
+        try:
+            fields = requested_fields()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         
-        # Analyze the resume text
-        analysis_results = analyze_resume(text,filename)
+        start = time.perf_counter()
+        try:
+            with current_app.extensions['profiler'].profile(request.path) as profiling, \
+                    collect_timings() as timings:
+                # A profiled request runs every stage, extraction included, in this thread
+                budget = request_budget(inline=profiling)
+                key = hash_stream(file.stream)
+                analysis_results, cache_status = analyze_upload(file.filename, file.stream, key, industry,
+                                                                cache_allowed(), budget, requested_stages(fields),
+                                                                reuse_duplicates_requested())
+        except StageTimeout as e:
+            REQUESTS.inc("analyze", "timeout")
+            return jsonify({
+                "error": "Could not extract text from the file in time",
+                "partial": True,
+                "skipped_stages": {e.stage: "timeout"}
+            }), 422
+        seconds = time.perf_counter() - start
+        REQUEST_SECONDS.observe("analyze", value=seconds)
+        REQUESTS.inc("analyze", cache_status.lower())
         
-        # Add industry-specific analysis if requested
-        if industry:
-            industry_analyzer = IndustryAnalyzer()
-            industry_analysis = industry_analyzer.analyze_for_industry(text, industry)
-            analysis_results["industry_analysis"] = industry_analysis
+        if timings_requested():
+            analysis_results["timings_ms"] = {name: round(value * 1000, 3) for name, value in timings.items()}
+            analysis_results["timings_ms"]["total"] = round(seconds * 1000, 3)
         
-        # Add advanced NLP analysis
-        blob = TextBlob(text)
-        analysis_results["sentiment"] = {
-            "polarity": round(blob.sentiment.polarity, 2),
-            "subjectivity": round(blob.sentiment.subjectivity, 2)
-        }
-
-        # Clean up the uploaded file
-        os.remove(filename)
-        
-        return jsonify(analysis_results)
+        response = jsonify(shape_result(analysis_results, fields))
+        response.headers['X-Cache'] = cache_status
+        return response
     
     return jsonify({"error": "File type not allowed"}), 400
 
-@app.route('/')
+@api.route('/api/jobs', methods=['POST'])
+@admission_controlled("job", limit_concurrency=False)
+def submit_job():
+    if 'file' not in request.files:
+        return jsonify({"error": "No file part"}), 400
+    
+    industry = request.form.get('job_role')
+    file = request.files['file']
+    
+    if file.filename == '':
+        return jsonify({"error": "No selected file"}), 400
+    
+    if not allowed_file(file.filename):
+        return jsonify({"error": "File type not allowed"}), 400
+    
+    try:
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    compact = compact_requested()
+    stages = requested_stages(fields)
+    
+    # The upload stream is closed once the request ends, so the job keeps its own copy
+    data = file.read()
+    use_cache = cache_allowed()
+    reuse_duplicates = reuse_duplicates_requested()
+    app = current_app._get_current_object()
+    job_queue = app.extensions['job_queue']
+    
+    def run_job():
+        with app.app_context():
+            start = time.perf_counter()
+            analysis_results, cache_status = analyze_upload(file.filename, data, content_key(data), industry,
+                                                            use_cache, stages=stages,
+                                                            reuse_duplicates=reuse_duplicates)
+            REQUEST_SECONDS.observe("job", value=time.perf_counter() - start)
+            REQUESTS.inc("job", cache_status.lower())
+            if fields is not None:
+                analysis_results = select_fields(analysis_results, fields)
+            return compact_result(analysis_results) if compact else analysis_results
+    
+    try:
+        job_id = job_queue.submit(run_job)
+    except QueueFull:
+        response = jsonify({"error": "Too many analyses queued, try again later"})
+        response.headers['Retry-After'] = str(job_queue.retry_after())
+        return response, 429
+    
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/api/jobs/{job_id}"
+    }), 202
+
+@api.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = current_app.extensions['job_queue'].get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found or expired"}), 404
+    
+    if job["result"] is None:
+        del job["result"]
+    if job["error"] is None:
+        del job["error"]
+    return jsonify(job)
+
+@api.route('/api/health/ready', methods=['GET'])
+def health_ready():
+    ready = models_ready()
+    return jsonify({
+        "ready": ready,
+        "missing_corpora": missing_corpora(),
+        "model_loading": current_app.config['MODEL_LOADING'],
+        "startup_seconds": current_app.extensions['startup_seconds'],
+        "load_timings": load_timings,
+        "nlp_pipelines": pipeline_info(),
+        "admission": current_app.extensions['concurrency_limiter'].info()
+    }), 200 if ready else 503
+
+@api.route('/metrics', methods=['GET'])
+def metrics():
+    return registry.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@api.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({**current_app.extensions['result_cache'].info(), "sections": vocabularies().entity_extractor.cache.info()})
+
+def collect_uploads():
+    # Uploads in the order they were sent, unpacking zip archives in place.
+    # Returns (uploads, None) or (None, error response).
+    files = request.files.getlist('files') + request.files.getlist('file')
+    if not files:
+        return None, (jsonify({"error": "No file part"}), 400)
+    
+    max_batch_files = current_app.config['MAX_BATCH_FILES']
+    max_batch_bytes = current_app.config['MAX_BATCH_BYTES']
+    too_many = (jsonify({"error": f"Too many files, the limit is {max_batch_files} per batch"}), 400)
+    too_large = (jsonify({"error": f"Batch too large, the limit is {max_batch_bytes} bytes uncompressed"}), 413)
+    uploads = []
+    total_bytes = 0
+    for file in files:
+        if file.filename == '':
+            continue
+        if file.filename.lower().endswith('.zip'):
+            # Archives are checked against what is left of both budgets before anything is unpacked
+            try:
+                entries = read_zip_archive(file.stream, allowed_file, current_app.config['MAX_CONTENT_LENGTH'],
+                                           max_batch_files - len(uploads), max_batch_bytes - total_bytes)
+            except zipfile.BadZipFile:
+                return None, (jsonify({"error": f"Invalid zip archive: {file.filename}"}), 400)
+            except BatchTooLarge as e:
+                return None, too_many if e.limit == "files" else too_large
+            uploads.extend(entries)
+            total_bytes += sum(len(data) for _, data in entries if data is not None)
+        else:
+            # Unsupported types are reported per file by the workers
+            if len(uploads) >= max_batch_files:
+                return None, too_many
+            uploads.append((file.filename, file.read()))
+            total_bytes += len(uploads[-1][1])
+            if total_bytes > max_batch_bytes:
+                return None, too_large
+    
+    if not uploads:
+        return None, (jsonify({"error": "No supported files found"}), 400)
+    
+    return uploads, None
+
+@api.route('/api/analyze/batch', methods=['POST'])
+@admission_controlled("batch")
+def analyze_batch():
+    uploads, error = collect_uploads()
+    if error:
+        return error
+    error = batch_rate_limited("batch", uploads)
+    if error:
+        return error
+    
+    industry = request.form.get('job_role')
+    try:
+        fields = requested_fields()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    stages = requested_stages(fields)
+    
+    # Load every model before the pool forks so every worker inherits them. This also
+    # waits out a background preload, so no fork lands while it holds an import lock.
+    preload()
+    start = time.perf_counter()
+    results = current_app.extensions['batch_analyzer'].analyze(uploads, run_analysis, industry, stages)
+    REQUEST_SECONDS.observe("batch", value=time.perf_counter() - start)
+    REQUESTS.inc("batch", "ok")
+    for result in results["results"]:
+        if "analysis" in result:
+            result["analysis"] = shape_result(result["analysis"], fields)
+    return jsonify(results)
+
+@api.route('/api/rank/resumes', methods=['POST'])
+@admission_controlled("index")
+def index_resumes():
+    uploads, error = collect_uploads()
+    if error:
+        return error
+    error = batch_rate_limited("index", uploads)
+    if error:
+        return error
+    
+    # Extract and featurize in the batch workers, then store the results here
+    preload()
+    batch = current_app.extensions['batch_analyzer'].analyze(uploads, index_document)
+    
+    failed = []
+    for (filename, data), result in zip(uploads, batch["results"]):
+        if "error" in result:
+            failed.append({"filename": filename, "error": result["error"]})
+        else:
+            store_resume(content_key(data), filename, result["analysis"])
+    
+    return jsonify({
+        "indexed": batch["total"] - len(failed),
+        "failed": failed,
+        "corpus_size": len(current_app.extensions['resume_store']),
+        "elapsed_seconds": batch["elapsed_seconds"]
+    })
+
+@api.route('/api/rank', methods=['POST'])
+@admission_controlled("rank")
+def rank_resumes():
+    data = request.get_json(silent=True) or {}
+    job_description = data.get('job_description', '')
+    if not job_description.strip():
+        return jsonify({"error": "job_description is required"}), 400
+    error = job_description_too_long(job_description)
+    if error:
+        return error
+    
+    try:
+        k = int(data.get('k', 10))
+        min_score = float(data.get('min_score', 0))
+    except (TypeError, ValueError):
+        return jsonify({"error": "k and min_score must be numbers"}), 400
+    if not 1 <= k <= current_app.config['RANK_MAX_K']:
+        return jsonify({"error": f"k must be between 1 and {current_app.config['RANK_MAX_K']}"}), 400
+    
+    candidates, error = ranking_candidates(data)
+    if error:
+        return error
+    
+    with stage("job_description"):
+        features = ranking_features(job_description)
+    with stage("ranking"):
+        ranking = sync_ranking_index().rank(features, k, min_score, candidates)
+    return jsonify(ranking)
+
+def ranking_candidates(data):
+    # Stored resumes passing the entity filters of a ranking request, None when there are none;
+    # returns (candidates, error response). Filters read stored entities, nothing is parsed again.
+    min_experience_months = data.get('min_experience_months')
+    min_degree = data.get('min_degree')
+    skills = data.get('skills') or []
+    if min_experience_months is not None:
+        try:
+            min_experience_months = int(min_experience_months)
+        except (TypeError, ValueError):
+            return None, (jsonify({"error": "min_experience_months must be a number"}), 400)
+    if min_degree is not None and min_degree not in DEGREE_LEVELS:
+        return None, (jsonify({"error": f"min_degree must be one of {', '.join(DEGREE_LEVELS)}"}), 400)
+    if not isinstance(skills, list) or not all(isinstance(skill, str) and skill.strip() for skill in skills):
+        return None, (jsonify({"error": "skills must be a list of strings"}), 400)
+    if min_experience_months is None and min_degree is None and not skills:
+        return None, None
+    
+    resume_store = current_app.extensions['resume_store']
+    with stage("filtering"):
+        candidates = resume_store.matching(min_experience_months, min_degree)
+        if skills:
+            required = {skill.strip().lower() for skill in skills}
+            resume_store.track_terms(required)
+            candidates &= {resume_id for resume_id, terms in resume_store.term_hits(required).items()
+                           if required <= terms}
+    return candidates, None
+
+def requested_job_description(data):
+    # A job description as text, or the jd_id of one sent before; returns (jd_id, features, cache status, error)
+    job_description = data.get('job_description') or ''
+    if job_description.strip():
+        error = job_description_too_long(job_description)
+        if error:
+            return None, None, None, error
+        return job_description_features(job_description) + (None,)
+    
+    jd_id = data.get('jd_id')
+    if not jd_id:
+        return None, None, None, (jsonify({"error": "job_description or jd_id is required"}), 400)
+    features = current_app.extensions['result_cache'].get("job_descriptions", job_description_key(jd_id, vocabularies()))
+    if features is None:
+        return None, None, None, (jsonify({"error": "Unknown or expired jd_id, send the job_description again"}), 404)
+    return jd_id, features, "HIT", None
+
+@api.route('/api/job-descriptions', methods=['POST'])
+@admission_controlled("job_description")
+def add_job_description():
+    data = request.get_json(silent=True) or {}
+    if not (data.get('job_description') or '').strip():
+        return jsonify({"error": "job_description is required"}), 400
+    error = job_description_too_long(data['job_description'])
+    if error:
+        return error
+    
+    jd_id, features, cache_status = job_description_features(data['job_description'])
+    response = jsonify({"jd_id": jd_id, **features})
+    response.headers['X-Cache'] = cache_status
+    return response
+
+@api.route('/api/compare', methods=['POST'])
+@admission_controlled("compare")
+def compare_upload():
+    if 'file' not in request.files:
+        return jsonify({"error": "No file part"}), 400
+    file = request.files['file']
+    if file.filename == '' or not allowed_file(file.filename):
+        return jsonify({"error": "File type not allowed"}), 400
+    
+    jd_id, features, cache_status, error = requested_job_description(request.form)
+    if error:
+        return error
+    
+    # Reuse the text of an earlier analysis of the same file when there is one
+    key = hash_stream(file.stream)
+    document = current_app.extensions['result_cache'].get("documents", key)
+    if document is not None:
+        text = document["text"]
+    else:
+        budget = request_budget()
+        try:
+            if budget is None:
+                text = extract_upload(file.filename, file.stream, **extraction_limits(current_app.config))
+            else:
+                text = extract_within_budget(file.filename, file.stream, budget)
+        except StageTimeout:
+            return jsonify({"error": "Could not extract text from the file in time"}), 422
+    
+    with stage("compare"):
+        comparison = compare_resume(features, text)
+    response = jsonify({"jd_id": jd_id, "filename": file.filename, **comparison})
+    response.headers['X-Cache'] = cache_status
+    return response
+
+@api.route('/api/compare/bulk', methods=['POST'])
+@admission_controlled("compare_bulk")
+def compare_stored():
+    data = request.get_json(silent=True) or {}
+    resume_ids = data.get('resume_ids')
+    if not isinstance(resume_ids, list) or not resume_ids:
+        return jsonify({"error": "resume_ids must be a non-empty list"}), 400
+    if len(resume_ids) > current_app.config['COMPARE_MAX_RESUMES']:
+        return jsonify({"error": f"At most {current_app.config['COMPARE_MAX_RESUMES']} resumes per request"}), 400
+    
+    jd_id, features, cache_status, error = requested_job_description(data)
+    if error:
+        return error
+    
+    start = time.perf_counter()
+    # Stored resumes are compared by their text, nothing is extracted or parsed again
+    stored = current_app.extensions['resume_store'].texts(resume_ids)
+    with stage("compare"):
+        results = [
+            {"resume_id": resume_id, "filename": filename, **compare_resume(features, text)}
+            for resume_id, (filename, text) in stored.items()
+        ]
+    results.sort(key=lambda result: result["score"], reverse=True)
+    
+    response = jsonify({
+        "jd_id": jd_id,
+        "skills": features["skills"],
+        "phrases": features["phrases"],
+        "results": results,
+        "not_found": [resume_id for resume_id in resume_ids if resume_id not in stored],
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)
+    })
+    response.headers['X-Cache'] = cache_status
+    return response
+
+@api.route('/api/index/rescore', methods=['POST'])
+@admission_controlled("rescore")
+def rescore_index():
+    data = request.get_json(silent=True) or {}
+    industry = data.get('industry') or data.get('job_role')
+    industry_analyzer.maybe_reload()
+    if industry not in industry_analyzer.industries:
+        return jsonify({"error": f"Industry '{industry}' not supported"}), 400
+    
+    try:
+        k = int(data.get('k', 50))
+    except (TypeError, ValueError):
+        return jsonify({"error": "k must be a number"}), 400
+    
+    start = time.perf_counter()
+    resume_store = current_app.extensions['resume_store']
+    
+    # Only terms the store has never counted are searched for in the stored text
+    vocabulary = industry_analyzer.vocabulary(industry)
+    with stage("rescore"):
+        new_terms = resume_store.track_terms(vocabulary)
+        hits = resume_store.term_hits(vocabulary)
+        scored = [(resume_id, industry_analyzer.score_terms(industry, terms)) for resume_id, terms in hits.items()]
+    scored.sort(key=lambda item: item[1]["overall_score"], reverse=True)
+    
+    filenames = resume_store.filenames()
+    return jsonify({
+        "industry": industry,
+        "results": [
+            {"resume_id": resume_id, "filename": filenames.get(resume_id), **analysis}
+            for resume_id, analysis in scored[:k]
+        ],
+        "resumes": len(scored),
+        "new_terms_scanned": new_terms,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)
+    })
+
+@api.route('/api/industries', methods=['GET'])
+def list_industries():
+    return jsonify({"industries": industry_analyzer.list_profiles()})
+
+@api.route('/api/index/stats', methods=['GET'])
+def index_stats():
+    return jsonify({
+        **current_app.extensions['resume_store'].info(),
+        "ranking_rows": len(current_app.extensions['ranking_index']),
+        "near_duplicate_signatures": len(current_app.extensions['near_duplicates'])
+    })
+
+@api.route('/')
 def serve():
-    return send_from_directory(app.static_folder, 'index.html')
+    return send_from_directory(current_app.static_folder, 'index.html')
 
-@app.errorhandler(404)
 def not_found(e):
-    return send_from_directory(app.static_folder, 'index.html')
+    return send_from_directory(current_app.static_folder, 'index.html')
 
 if __name__ == '__main__':
+    # Development server only; production runs gunicorn with wsgi.py
     port = int(os.environ.get("PORT", 5000))
     debug_mode = os.environ.get("FLASK_ENV") != "production"
-    app.run(host='0.0.0.0', port=port, debug=debug_mode)
\ No newline at end of file
+    create_app().run(host='0.0.0.0', port=port, debug=debug_mode)
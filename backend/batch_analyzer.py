@@ -0,0 +1,214 @@
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Set in each worker process by _init_worker
+_extract_text = None
+_parse_documents = None
+
+
+def _init_worker(extract_text, parse_documents):
+    """Install the pipeline callables in a freshly started worker process"""
+    global _extract_text, _parse_documents
+    _extract_text = extract_text
+    _parse_documents = parse_documents
+
+
+def _error_message(e):
+    return str(e) or e.__class__.__name__
+
+
+def _analyze_chunk(run_analysis, jobs, stages=None):
+    """Extract and score a chunk of uploads, parsing their text in one nlp.pipe call
+
+    run_analysis is sent with every chunk, so endpoints doing different work
+    on their uploads share one pool. The parse is skipped when `stages` leaves
+    it out.
+    """
+    results = []
+    extracted = []
+    for index, filename, data, industry in jobs:
+        result = {"index": index, "filename": filename}
+        results.append(result)
+        try:
+            extracted.append((result, _extract_text(filename, data), industry))
+        except Exception as e:
+            result["error"] = _error_message(e)
+
+    if stages is not None and "parse" not in stages:
+        parsed_docs = [None] * len(extracted)
+    else:
+        try:
+            parsed_docs = _parse_documents(text for _, text, _ in extracted)
+        except Exception as e:
+            for result, _, _ in extracted:
+                result["error"] = _error_message(e)
+            return results
+
+    for (result, text, industry), parsed in zip(extracted, parsed_docs):
+        try:
+            result["analysis"] = run_analysis(text, industry, result["filename"], parsed, stages)
+        except Exception as e:
+            result["error"] = _error_message(e)
+
+    return results
+
+
+class BatchTooLarge(ValueError):
+    """Raised when a batch holds more files or more bytes than it may; `limit` says which"""
+
+    def __init__(self, limit, value):
+        super().__init__(f"Batch has more than {value} {limit}")
+        self.limit = limit
+
+
+def read_zip_archive(stream, allowed_file, max_entry_size, max_files=None, max_bytes=None):
+    """Return (filename, bytes) pairs for every supported file inside a zip archive
+
+    The entry list is checked first: an archive with more than `max_files`
+    supported files, or more than `max_bytes` of them uncompressed, raises
+    BatchTooLarge before anything is decompressed.
+    """
+    entries = []
+    total = 0
+    with zipfile.ZipFile(stream) as archive:
+        for info in archive.infolist():
+            name = os.path.basename(info.filename)
+            # Skip folders and macOS resource forks
+            if info.is_dir() or not name or info.filename.startswith('__MACOSX/'):
+                continue
+            if not allowed_file(name):
+                continue
+            if max_files is not None and len(entries) >= max_files:
+                raise BatchTooLarge("files", max_files)
+            # Oversized entries are reported per file and never read
+            if info.file_size <= max_entry_size:
+                total += info.file_size
+                if max_bytes is not None and total > max_bytes:
+                    raise BatchTooLarge("bytes", max_bytes)
+            entries.append((name, info))
+        return [(name, archive.read(info) if info.file_size <= max_entry_size else None)
+                for name, info in entries]
+
+
+class BatchAnalyzer:
+    def __init__(self, extract_text, parse_documents, max_workers=None, chunk_size=None):
+        self.extract_text = extract_text
+        self.parse_documents = parse_documents
+        self.max_workers = max_workers or int(os.environ.get("BATCH_WORKERS", os.cpu_count() or 1))
+        self.chunk_size = chunk_size or int(os.environ.get("BATCH_CHUNK_SIZE", 8))
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        """Start the worker pool on first use and keep it for later batches"""
+        with self._lock:
+            return self._start_executor()
+
+    def _start_executor(self):
+        if self._executor is None:
+            # Forked workers inherit the already loaded spaCy model, so each
+            # process pays the model load exactly once
+            context = multiprocessing.get_context('fork')
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.extract_text, self.parse_documents)
+            )
+        return self._executor
+
+    def _discard_executor(self, executor):
+        """Drop a broken pool so the next batch forks a fresh one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _map_chunks(self, run_analysis, chunks, stages):
+        """(results of the chunks the pool finished, chunks it did not)
+
+        A worker that dies, e.g. out of memory or crashing in a PDF library,
+        breaks the whole pool: every unfinished chunk fails and the pool is
+        discarded.
+        """
+        executor = self._get_executor()
+        finished, unfinished = [], []
+        try:
+            # Submitting to a pool whose worker died while idle fails at once
+            futures = [executor.submit(_analyze_chunk, run_analysis, chunk, stages) for chunk in chunks]
+        except BrokenProcessPool:
+            futures, unfinished = [], list(chunks)
+        for chunk, future in zip(chunks, futures):
+            try:
+                finished.append(future.result())
+            except BrokenProcessPool:
+                unfinished.append(chunk)
+        if unfinished:
+            self._discard_executor(executor)
+        return finished, unfinished
+
+    def analyze(self, uploads, run_analysis, industry=None, stages=None):
+        """Run run_analysis(text, industry, filename, parsed, stages) on (filename, bytes) pairs in parallel, in order
+
+        run_analysis is pickled by reference, so it must be a module-level function.
+        stages=None runs everything; a set limits the optional stages, as in
+        analyze_upload.
+        """
+        start = time.perf_counter()
+
+        results = [None] * len(uploads)
+        jobs = []
+        for index, (filename, data) in enumerate(uploads):
+            if data is None:
+                results[index] = {"index": index, "filename": filename, "error": "File too large"}
+            else:
+                jobs.append((index, filename, data, industry))
+
+        if jobs:
+            # Spread the jobs evenly, but never hand a worker more than chunk_size files
+            per_worker = -(-len(jobs) // self.max_workers)
+            size = max(1, min(self.chunk_size, per_worker))
+            chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+
+            if 'fork' in multiprocessing.get_all_start_methods():
+                # Chunks lost to a dead worker get one retry on a fresh pool
+                processed, unfinished = self._map_chunks(run_analysis, chunks, stages)
+                if unfinished:
+                    retried, unfinished = self._map_chunks(run_analysis, unfinished, stages)
+                    processed.extend(retried)
+                processed.extend(
+                    [{"index": index, "filename": filename, "error": "Worker process exited unexpectedly"}
+                     for index, filename, _, _ in chunk]
+                    for chunk in unfinished
+                )
+            else:
+                # No fork on this platform, fall back to running in-process
+                _init_worker(self.extract_text, self.parse_documents)
+                processed = (_analyze_chunk(run_analysis, chunk, stages) for chunk in chunks)
+            for chunk_results in processed:
+                for result in chunk_results:
+                    results[result["index"]] = result
+
+        elapsed = time.perf_counter() - start
+        failed = sum(1 for result in results if "error" in result)
+
+        return {
+            "results": results,
+            "total": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "workers": self.max_workers,
+            "elapsed_seconds": round(elapsed, 3),
+            "resumes_per_second": round(len(results) / elapsed, 2) if elapsed > 0 else None
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,117 @@
+"""Benchmark: streaming DOCX extraction vs the old python-docx paragraphs path.
+
+Builds DOCX files from the synthetic corpus (see corpus.py) in two shapes:
+plain paragraphs, and a "template" layout that moves the contact line into
+the page header, the skills into a two-column table and the summary into a
+text box, like many modern resume templates. For each file it reports the
+time of both extractors and how many of the resume's lines each one found.
+Run from the backend folder:
+
+    python benchmarks/bench_docx.py
+
+On plain documents the two must produce identical text; the script exits
+with status 1 if they do not.
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import docx
+from docx.oxml import parse_xml
+
+from corpus import make_resume_lines, to_docx
+from text_extractor import extract_text_from_docx
+
+TEXT_BOX = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape" '
+    'xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:AlternateContent><mc:Choice Requires="wps"><w:drawing><wps:wsp><wps:txbx><w:txbxContent>'
+    '{paragraphs}'
+    '</w:txbxContent></wps:txbx></wps:wsp></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>'
+    '{paragraphs}'
+    '</w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback></mc:AlternateContent></w:r>'
+)
+
+
+def legacy_extract_text_from_docx(source):
+    """extract_text_from_docx as it was before the streaming extractor"""
+    doc = docx.Document(io.BytesIO(source))
+    full_text = []
+    for para in doc.paragraphs:
+        full_text.append(para.text)
+    return '\n'.join(full_text)
+
+
+def _escape(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def to_template_docx(lines):
+    """First line in the header, first body line in a text box, the rest split into a two-column table"""
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = lines[0]
+    box = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{_escape(line)}</w:t></w:r></w:p>' for line in lines[1:2])
+    document.add_paragraph()._p.append(parse_xml(TEXT_BOX.format(paragraphs=box)))
+
+    rest = lines[2:]
+    half = (len(rest) + 1) // 2
+    table = document.add_table(rows=1, cols=2)
+    for cell, column in zip(table.rows[0].cells, (rest[:half], rest[half:])):
+        cell.paragraphs[0].text = column[0] if column else ""
+        for line in column[1:]:
+            cell.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def coverage(lines, text):
+    found = set(text.splitlines())
+    return sum(line in found for line in lines) / len(lines)
+
+
+def time_call(fn, data, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(data)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'document':<22}{'KB':>8}{'legacy ms':>12}{'stream ms':>12}{'speedup':>9}"
+          f"{'legacy cov':>12}{'stream cov':>12}")
+    mismatches = 0
+    for length, multiplier in (("short", 1), ("medium", 1), ("long", 1), ("long", 20)):
+        lines = make_resume_lines(length, "standard", seed=1) * multiplier
+        for shape, build in (("plain", to_docx), ("template", to_template_docx)):
+            data = build(lines)
+            legacy_text = legacy_extract_text_from_docx(data)
+            stream_text = extract_text_from_docx(data)
+            if shape == "plain" and legacy_text != stream_text:
+                mismatches += 1
+                print(f"MISMATCH on {length} x{multiplier} {shape}")
+            legacy = time_call(legacy_extract_text_from_docx, data, args.repeat)
+            stream = time_call(extract_text_from_docx, data, args.repeat)
+            print(f"{f'{length} x{multiplier} {shape}':<22}{len(data) / 1024:>8.1f}{legacy * 1000:>12.2f}"
+                  f"{stream * 1000:>12.2f}{legacy / stream:>8.1f}x"
+                  f"{coverage(lines, legacy_text):>12.0%}{coverage(lines, stream_text):>12.0%}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
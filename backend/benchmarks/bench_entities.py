@@ -0,0 +1,76 @@
+"""Benchmark: entity extraction per section with the section cache, cold and on re-uploads.
+
+Extracts entities from a corpus of generated resumes three times: cold,
+then re-uploaded with one experience bullet edited, then re-uploaded
+unchanged. Reports the time per resume and how many section spans went to
+spaCy each time, next to a full spaCy parse of the whole resume for scale.
+Run from the backend folder:
+
+    python benchmarks/bench_entities.py --resumes 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import entity_extractor
+from corpus import LAYOUTS, LENGTHS, make_resume_lines
+from entity_extractor import EntityExtractor
+from nlp_pipeline import get_nlp, parse_document
+from section_scorers import SOFT_SKILLS, TECH_SKILLS
+
+
+def edit(lines):
+    """The same resume with its first experience bullet reworded"""
+    lines = list(lines)
+    for i, line in enumerate(lines):
+        if line.startswith("- "):
+            lines[i] = line + " across three regions"
+            break
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=200)
+    args = parser.parse_args()
+
+    shapes = [(length, layout) for length in LENGTHS for layout in LAYOUTS]
+    resumes = [make_resume_lines(*shapes[i % len(shapes)], seed=i) for i in range(args.resumes)]
+    get_nlp()
+
+    # Count the spans handed to spaCy
+    parsed_spans = [0]
+    entity_docs = entity_extractor.entity_docs
+
+    def counting_entity_docs(texts):
+        texts = list(texts)
+        parsed_spans[0] += len(texts)
+        return entity_docs(texts)
+
+    entity_extractor.entity_docs = counting_entity_docs
+    extractor = EntityExtractor(TECH_SKILLS + SOFT_SKILLS)
+
+    start = time.perf_counter()
+    for lines in resumes:
+        parse_document("\n".join(lines))
+    print(f"{'full parse':<22}{(time.perf_counter() - start) / len(resumes) * 1000:>10.3f} ms/resume")
+
+    for name, texts in (("cold", ["\n".join(lines) for lines in resumes]),
+                        ("one section edited", [edit(lines) for lines in resumes]),
+                        ("unchanged", [edit(lines) for lines in resumes])):
+        parsed_spans[0] = 0
+        start = time.perf_counter()
+        for text in texts:
+            extractor.extract(text)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22}{elapsed / len(texts) * 1000:>10.3f} ms/resume"
+              f"{parsed_spans[0] / len(texts):>8.2f} spans parsed/resume")
+    print(f"section cache: {extractor.cache.info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Micro-benchmark: compiled KeywordMatcher vs the old per-keyword substring loops.
+
+Run from the backend folder:
+
+    python benchmarks/bench_keyword_matcher.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from industry_analyzer import IndustryAnalyzer, KEYWORD_CATEGORIES
+from keyword_matcher import KeywordMatcher
+
+FILLER = (
+    "team project customer service report meeting remote office quarterly "
+    "members process results business support weekly across multiple goals "
+    "responsible ownership stakeholders delivery features platform users"
+).split()
+
+
+def make_resume(vocabulary, words=700, density=0.06, seed=0):
+    """Filler text with roughly `density` of its words drawn from the vocabulary"""
+    rng = random.Random(seed)
+    terms = [term for terms in vocabulary.values() for term in terms]
+    tokens = []
+    for _ in range(words):
+        tokens.append(rng.choice(terms) if rng.random() < density else rng.choice(FILLER))
+        if rng.random() < 0.08:
+            tokens[-1] += ".\n"
+    return " ".join(tokens)
+
+
+def legacy_scan(industry_data, text):
+    """The substring loops analyze_for_industry used before the matcher"""
+    text_lower = text.lower()
+    return {
+        category: [term for term in industry_data[category] if term.lower() in text_lower]
+        for category in KEYWORD_CATEGORIES
+    }
+
+
+def matcher_scan(matcher, text):
+    scan = matcher.scan(text.lower())
+    return {category: matcher.split(scan, category)[0] for category in KEYWORD_CATEGORIES}
+
+
+def main(number=2000):
+    analyzer = IndustryAnalyzer()
+
+    # Resumes mention keywords from every field, not just the target one
+    all_keywords = {
+        f"{industry}/{category}": data[category]
+        for industry, data in analyzer.industries.items()
+        for category in KEYWORD_CATEGORIES
+    }
+    text = make_resume(all_keywords)
+
+    # One more profile covering every industry shows how each approach
+    # scales with the size of the vocabulary
+    profiles = dict(analyzer.industries)
+    matchers = dict(analyzer.matchers)
+    profiles["all industries"] = {category: sorted({term for data in analyzer.industries.values() for term in data[category]})
+                                  for category in KEYWORD_CATEGORIES}
+    matchers["all industries"] = KeywordMatcher(profiles["all industries"])
+
+    print(f"{'industry':<20}{'terms':>6}{'legacy us':>12}{'matcher us':>12}{'speedup':>10}{'false hits':>12}")
+    for industry, data in profiles.items():
+        matcher = matchers[industry]
+        terms = sum(len(data[category]) for category in KEYWORD_CATEGORIES)
+
+        legacy = timeit.timeit(lambda: legacy_scan(data, text), number=number) / number * 1e6
+        compiled = timeit.timeit(lambda: matcher_scan(matcher, text), number=number) / number * 1e6
+
+        # Hits the substring loops reported that are not whole-word matches
+        old_hits = legacy_scan(data, text)
+        new_hits = matcher_scan(matcher, text)
+        false_hits = sum(len(set(old_hits[c]) - set(new_hits[c])) for c in KEYWORD_CATEGORIES)
+
+        print(f"{industry:<20}{terms:>6}{legacy:>12.1f}{compiled:>12.1f}{legacy / compiled:>9.2f}x{false_hits:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: MinHash LSH near-duplicate lookups over a large index.
+
+Fills a NearDuplicateIndex with --size signatures (random ones for bulk,
+plus real signatures of generated resumes), then times lookups of lightly
+edited copies of the stored resumes and of unrelated resumes. Reports
+lookup and signature latency, recall on the edited copies and false
+matches on the unrelated ones. Run from the backend folder:
+
+    python benchmarks/bench_near_duplicates.py --size 300000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from corpus import LAYOUTS, LENGTHS, make_resume_lines
+from near_duplicates import NearDuplicateIndex
+
+
+def edit(lines, rng, changes=2):
+    """A copy with a couple of lines reworded, like a candidate resubmitting"""
+    lines = list(lines)
+    for _ in range(changes):
+        i = rng.randrange(len(lines))
+        lines[i] = lines[i] + " (updated)"
+    return "\n".join(lines)
+
+
+def jaccard(hasher, text, other):
+    a, b = set(hasher.shingles(text).tolist()), set(hasher.shingles(other).tolist())
+    return len(a & b) / len(a | b)
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=300000)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--resumes", type=int, default=100, help="Real resumes stored and looked up")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    shapes = [(length, layout) for length in LENGTHS for layout in LAYOUTS]
+    index = NearDuplicateIndex()
+    hasher = index.hasher
+
+    start = time.perf_counter()
+    bulk = np.random.RandomState(0).randint(0, 1 << 31, size=(args.size, hasher.num_perm)).astype(np.uint32)
+    with index._db:
+        index._db.executemany("INSERT INTO signatures (resume_id, signature) VALUES (?, ?)",
+                              ((f"bulk-{i}", row.tobytes()) for i, row in enumerate(bulk)))
+    with index._lock:
+        index._sync()
+        index._sort()
+    print(f"Loaded {len(index)} signatures in {time.perf_counter() - start:.1f}s")
+
+    stored = []
+    for i in range(args.resumes):
+        lines = make_resume_lines(*shapes[i % len(shapes)], seed=i)
+        index.add(f"resume-{i}", hasher.signature("\n".join(lines)))
+        stored.append(lines)
+
+    signature_times, lookup_times = [], []
+    found = expected = 0
+    for i, lines in enumerate(stored):
+        text = edit(lines, rng)
+        start = time.perf_counter()
+        signature = hasher.signature(text)
+        signature_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        match = index.nearest(signature, args.threshold)
+        lookup_times.append(time.perf_counter() - start)
+        # Only copies that really are above the threshold should be found
+        if jaccard(hasher, text, "\n".join(lines)) >= args.threshold:
+            expected += 1
+            found += match is not None and match[0] == f"resume-{i}"
+
+    false_matches = 0
+    for i in range(args.resumes):
+        lines = make_resume_lines(*shapes[i % len(shapes)], seed=10000 + i)
+        signature = hasher.signature("\n".join(lines))
+        start = time.perf_counter()
+        match = index.nearest(signature, args.threshold)
+        lookup_times.append(time.perf_counter() - start)
+        false_matches += match is not None
+
+    print(f"signature   p50 {statistics.median(signature_times) * 1000:.3f} ms"
+          f"   p99 {percentile(signature_times, 0.99) * 1000:.3f} ms")
+    print(f"lookup      p50 {statistics.median(lookup_times) * 1000:.3f} ms"
+          f"   p99 {percentile(lookup_times, 0.99) * 1000:.3f} ms")
+    print(f"edited copies at or above the threshold found: {found}/{expected}"
+          f"   unrelated resumes matched: {false_matches}/{args.resumes}")
+
+
+if __name__ == "__main__":
+    main()
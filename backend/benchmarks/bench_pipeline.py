@@ -0,0 +1,183 @@
+"""Benchmark: per-stage latency of the analysis pipeline over a synthetic corpus.
+
+Times each stage separately for every resume in the corpus (see corpus.py):
+extraction, spaCy parse, section split, per-section scoring, keywords,
+sentiment and industry scoring, plus the whole run_analysis call. Reports
+p50/p95 per stage, throughput and peak RSS. Run from the backend folder:
+
+    python benchmarks/bench_pipeline.py --save benchmarks/baseline.json
+    # ...change something...
+    python benchmarks/bench_pipeline.py --compare benchmarks/baseline.json
+
+A stage whose p50 grows past --threshold relative to the baseline is flagged
+and the script exits with status 1, so it can gate a CI job.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as pipeline
+from corpus import LAYOUTS, LENGTHS, build_corpus
+
+SECTION_SCORERS = {
+    "education": pipeline.analyze_education,
+    "experience": pipeline.analyze_experience,
+    "skills": pipeline.analyze_skills,
+    "projects": pipeline.analyze_projects,
+}
+
+STAGES = ["extract", "parse", "sections", "section_scoring", "keywords", "sentiment", "industry", "total"]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def time_document(filename, data, industry):
+    """Seconds spent in each stage for one resume"""
+    timings = {}
+
+    def timed(stage, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings[stage] = time.perf_counter() - start
+        return result
+
+    text = timed("extract", pipeline.extract_upload, filename, data)
+    parsed = timed("parse", pipeline.parse_document, text)
+    sections = timed("sections", pipeline.extract_sections, text)
+    timed("section_scoring", lambda: [scorer(sections[name]) for name, scorer in SECTION_SCORERS.items()
+                                      if sections[name]] + [pipeline.check_action_verbs(text)])
+    timed("keywords", pipeline.extract_keywords, text, parsed)
+    timed("sentiment", parsed.sentiment)
+    timed("industry", pipeline.industry_analyzer.analyze_for_industry, text, industry)
+
+    # End to end, from the uploaded bytes, as /api/analyze runs it
+    start = time.perf_counter()
+    text = pipeline.extract_upload(filename, data)
+    pipeline.run_analysis(text, industry, filename, pipeline.parse_document(text))
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def run(corpus, rounds):
+    industries = list(pipeline.industry_analyzer.industries)
+    samples = {stage: [] for stage in STAGES}
+
+    # Load models first so the first document does not pay for them
+    pipeline.preload()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for i, (filename, data) in enumerate(corpus):
+            for stage, seconds in time_document(filename, data, industries[i % len(industries)]).items():
+                samples[stage].append(seconds)
+    elapsed = time.perf_counter() - start
+
+    stages = {
+        stage: {
+            "p50_ms": round(percentile(values, 0.5) * 1000, 3),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+            "mean_ms": round(sum(values) / len(values) * 1000, 3),
+        }
+        for stage, values in samples.items()
+    }
+    total_seconds = sum(samples["total"])
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "documents": len(corpus),
+            "rounds": rounds,
+        },
+        "stages": stages,
+        "throughput_per_second": round(len(samples["total"]) / total_seconds, 2),
+        "elapsed_seconds": round(elapsed, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def print_report(report, baseline=None, threshold=1.2):
+    """Print the per-stage table and return the stages that regressed"""
+    regressions = []
+    header = f"{'stage':<18}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}"
+    print(header + (f"{'base p50':>10}{'change':>9}" if baseline else ""))
+    for stage, stats in report["stages"].items():
+        row = f"{stage:<18}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['mean_ms']:>10.2f}"
+        base = baseline["stages"].get(stage) if baseline else None
+        if base:
+            ratio = stats["p50_ms"] / base["p50_ms"] if base["p50_ms"] else 1.0
+            row += f"{base['p50_ms']:>10.2f}{ratio:>8.2f}x"
+            if ratio > threshold:
+                row += "  REGRESSION"
+                regressions.append(stage)
+        print(row)
+
+    print(f"\nthroughput: {report['throughput_per_second']} resumes/s   "
+          f"peak RSS: {report['peak_rss_mb']} MB   documents: {report['meta']['documents']}"
+          f" x {report['meta']['rounds']} rounds")
+    if baseline:
+        print(f"baseline: commit {baseline['meta'].get('commit')}, "
+              f"{baseline['throughput_per_second']} resumes/s, {baseline['peak_rss_mb']} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lengths', nargs='+', choices=list(LENGTHS), default=list(LENGTHS))
+    parser.add_argument('--layouts', nargs='+', choices=list(LAYOUTS), default=list(LAYOUTS))
+    parser.add_argument('--formats', nargs='+', choices=['pdf', 'docx'], default=['pdf', 'docx'])
+    parser.add_argument('--copies', type=int, default=2, help="Resumes per length/layout/format")
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--save', metavar='PATH', help="Write the results as a baseline JSON file")
+    parser.add_argument('--compare', metavar='PATH', help="Compare against a saved baseline")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="p50 ratio over the baseline that counts as a regression")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.lengths, args.layouts, args.formats, args.copies)
+    report = run(corpus, args.rounds)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    regressions = print_report(report, baseline, args.threshold)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+    if regressions:
+        print(f"Regressed stages: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
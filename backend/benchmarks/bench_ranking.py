@@ -0,0 +1,58 @@
+"""Benchmark: ranking a job description against a large resume index.
+
+Fills a RankingIndex with synthetic term vectors drawn from the real ranking
+vocabulary plus per-resume phrases, then times the matrix build and top-k
+queries. Run from the backend folder:
+
+    python benchmarks/bench_ranking.py --resumes 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import vocabularies
+from ranking import RankingIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', type=int, default=100000)
+    parser.add_argument('--terms', type=int, default=60, help="Distinct terms per resume")
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = sorted(vocabularies().ranking_featurizer.matcher.vocabularies["terms"])
+    phrases = [f"phrase {i}" for i in range(20000)]
+
+    def features(size):
+        terms = rng.sample(vocabulary, min(len(vocabulary), size // 2)) + rng.sample(phrases, size // 2)
+        return {term: rng.randint(1, 4) for term in terms}
+
+    index = RankingIndex()
+    start = time.perf_counter()
+    for i in range(args.resumes):
+        index.add(i, features(args.terms))
+    added = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.rank({}, k=1)
+    built = time.perf_counter() - start
+
+    timings = []
+    for _ in range(args.queries):
+        timings.append(index.rank(features(40), k=args.k)["elapsed_ms"])
+    timings.sort()
+
+    print(f"resumes: {args.resumes}   terms: {len(index.terms)}")
+    print(f"add: {added:.2f}s ({args.resumes / added:.0f}/s)   build: {built * 1000:.0f} ms")
+    print(f"rank top-{args.k}: p50 {timings[len(timings) // 2]:.2f} ms   p95 {timings[int(len(timings) * 0.95)]:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
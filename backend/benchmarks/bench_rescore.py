@@ -0,0 +1,65 @@
+"""Benchmark: re-scoring a stored resume index vs re-running the pipeline.
+
+Stores synthetic resumes in a ResumeStore, then times an industry re-score
+from stored term hits (cold: new terms are scanned in the stored text;
+warm: pure SQL) against extracting and parsing every file again as
+/api/analyze would. Run from the backend folder:
+
+    python benchmarks/bench_rescore.py --resumes 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import LAYOUTS, LENGTHS, make_resume, make_resume_lines
+from app import extract_upload, industry_analyzer, parse_document, run_analysis
+from resume_store import ResumeStore
+
+
+def rescore(store, industry):
+    vocabulary = industry_analyzer.vocabulary(industry)
+    store.track_terms(vocabulary)
+    return [industry_analyzer.score_terms(industry, terms) for terms in store.term_hits(vocabulary).values()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resumes', type=int, default=2000)
+    parser.add_argument('--pipeline-sample', type=int, default=30,
+                        help="Files pushed through the full pipeline to estimate its per-resume cost")
+    args = parser.parse_args()
+
+    kinds = [(length, layout) for length in LENGTHS for layout in LAYOUTS]
+    store = ResumeStore()
+    for i in range(args.resumes):
+        length, layout = kinds[i % len(kinds)]
+        text = "\n".join(make_resume_lines(length, layout, seed=i))
+        store.add(f"resume-{i}", f"{i}.txt", text, [], {})
+
+    print(f"{'industry':<22}{'cold ms':>10}{'warm ms':>10}")
+    for industry in industry_analyzer.industries:
+        start = time.perf_counter()
+        rescore(store, industry)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        rescore(store, industry)
+        warm = time.perf_counter() - start
+        print(f"{industry:<22}{cold * 1000:>10.1f}{warm * 1000:>10.1f}")
+
+    samples = [make_resume(*kinds[i % len(kinds)], fmt="pdf", seed=i) for i in range(args.pipeline_sample)]
+    parse_document("warm up")
+    start = time.perf_counter()
+    for filename, data in samples:
+        text = extract_upload(filename, data)
+        run_analysis(text, "software_engineer", filename, parse_document(text))
+    per_resume = (time.perf_counter() - start) / len(samples)
+    print(f"\nfull pipeline: {per_resume * 1000:.1f} ms/resume, "
+          f"~{per_resume * args.resumes:.1f}s to re-score {args.resumes} resumes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""Benchmark: scorer registry vs the scorers as they were before it.
+
+The legacy_* functions are copies of the old scorers: raw pattern strings
+through the re module cache, text.lower() per check and keyword lists
+rebuilt per call. Both versions run over every section of the synthetic
+corpus; outputs must be identical, then per-call time is compared. Run from
+the backend folder:
+
+    python benchmarks/bench_scorers.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import LAYOUTS, LENGTHS, make_resume_lines
+from section_scorers import (ACTION_VERB_MATCHER, ACTION_VERBS, EDUCATION_MATCHER, SKILLS_MATCHER, analyze_education,
+                             analyze_experience, analyze_projects, analyze_skills, check_action_verbs)
+from section_segmenter import default_segmenter
+
+
+def legacy_analyze_education(text):
+    score = 100  # Base score
+    feedback = []
+
+    # Check for degree mentions
+    scan = EDUCATION_MATCHER.scan(text.lower())
+    has_degree = bool(scan.found("degrees"))
+
+    if not has_degree:
+        score -= 20
+        feedback.append("No clear mention of degree type")
+
+    # Check for dates
+    date_pattern = r'(19|20)\d{2}'
+    dates = re.findall(date_pattern, text)
+
+    if not dates:
+        score -= 15
+        feedback.append("No graduation dates mentioned")
+
+    # Check for institutions
+    has_institution = bool(scan.found("institutions"))
+
+    if not has_institution:
+        score -= 15
+        feedback.append("No clear mention of educational institutions")
+
+    # Check for GPA or honors
+    gpa_pattern = r'(gpa|grade point average|cum laude|honors|distinction)'
+    has_gpa = re.search(gpa_pattern, text.lower())
+
+    if not has_gpa:
+        feedback.append("Consider adding GPA or academic honors if they're strong")
+
+    # Return the results (cap score between 0-100)
+    score = max(0, min(100, score))
+
+    if score >= 80:
+        feedback.append("Education section is well-structured")
+
+    return score, feedback
+
+def legacy_analyze_experience(text):
+    score = 100 # Base score
+    feedback = []
+
+    # Check for company names
+    company_pattern = r'(inc|llc|ltd|corporation|corp|company)'
+    has_companies = re.search(company_pattern, text.lower())
+
+    if not has_companies:
+        score -= 10
+        feedback.append("Company names may not be clearly mentioned")
+
+    # Check for job titles
+    job_keywords = ["manager", "developer", "engineer", "analyst", "assistant", "director", "coordinator", "specialist"]
+    has_job_titles = any(keyword in text.lower() for keyword in job_keywords)
+
+    if not has_job_titles:
+        score -= 15
+        feedback.append("Job titles are not clearly stated")
+
+    # Check for dates
+    date_pattern = r'(19|20)\d{2}|present|current|now'
+    dates = re.findall(date_pattern, text.lower())
+
+    if len(dates) < 2:
+        score -= 15
+        feedback.append("Employment dates may be missing or incomplete")
+
+    # Check for bullet points
+    bullet_pattern = r'•|\*|\-'
+    bullets = re.findall(bullet_pattern, text)
+
+    if len(bullets) < 3:
+        score -= 10
+        feedback.append("Consider using bullet points to highlight achievements")
+
+    # Check for metrics and achievements
+    metrics_pattern = r'(\d+%|\d+ percent|increased|decreased|improved|reduced|led|managed|created)'
+    metrics = re.findall(metrics_pattern, text.lower())
+
+    if len(metrics) < 3:
+        score -= 15
+        feedback.append("Add more quantifiable achievements with metrics")
+    else:
+        score += 10
+        feedback.append("Good use of quantifiable metrics")
+
+    # Return the results (cap score between 0-100)
+    score = max(0, min(100, score))
+
+    if score >= 80:
+        feedback.append("Experience section effectively highlights your work history")
+
+    return score, feedback
+
+def legacy_analyze_skills(text):
+    score = 100 # Base score
+    feedback = []
+
+    # Count number of skills
+    text = text.lower()
+    scan = SKILLS_MATCHER.scan(text)
+
+    # Technical skills
+    tech_count = len(scan.found("tech"))
+
+    # Soft skills
+    soft_count = len(scan.found("soft"))
+
+    if tech_count < 5:
+        score -= 15
+        feedback.append("Add more technical skills relevant to your field")
+
+    if soft_count < 3:
+        score -= 10
+        feedback.append("Include some soft skills to show your workplace effectiveness")
+
+    # Check organization of skills section
+    organization_patterns = [r',', r'•', r'\|', r'\\']
+    has_organization = any(re.search(pattern, text) for pattern in organization_patterns)
+
+    if not has_organization:
+        score -= 10
+        feedback.append("Organize your skills better (e.g., using categories or separators)")
+
+    # Return the results (cap score between 0-100)
+    score = max(0, min(100, score))
+
+    if tech_count >= 8 and soft_count >= 5:
+        score += 10
+        feedback.append("Excellent variety of skills listed")
+
+    return score, feedback
+
+def legacy_analyze_projects(text):
+    score = 100  # Base score
+    feedback = []
+
+    # Check for project titles
+    project_count = len(re.findall(r'(?:^|\n)([A-Z][^\n]+)(?:\n|$)', text))
+
+    if project_count < 2:
+        score -= 15
+        feedback.append("Include more projects to showcase your abilities")
+
+    # Check for technologies used
+    tech_pattern = r'(tech stack|tools used|using|with|built on|developed in|utilizing) ([^.]*)'
+    has_tech = re.search(tech_pattern, text.lower())
+
+    if not has_tech:
+        score -= 15
+        feedback.append("Mention technologies used in each project")
+
+    # Check for project descriptions
+    if len(text.split('\n')) < 5:
+        score -= 10
+        feedback.append("Add more detailed descriptions of your projects")
+
+    # Check for results or impact
+    impact_pattern = r'(resulted in|improved|increased|decreased|reduced|enhanced)'
+    has_impact = re.search(impact_pattern, text.lower())
+
+    if not has_impact:
+        score -= 10
+        feedback.append("Describe the impact or results of your projects")
+
+    # Return the results (cap score between 0-100)
+    score = max(0, min(100, score))
+
+    if score >= 80:
+        feedback.append("Project section effectively demonstrates your practical skills")
+
+    return score, feedback
+
+def legacy_check_action_verbs(text):
+    # Count occurrences of action verbs
+    scan = ACTION_VERB_MATCHER.scan(text.lower())
+    verb_count = len(scan.found("verbs"))
+
+    # Calculate score based on number of unique action verbs found
+    score = min(100, verb_count * 5)
+
+    return {
+        "score": score,
+        "count": verb_count,
+        "suggested_verbs": ACTION_VERBS[:10]  # Return some suggested verbs
+    }
+
+
+CASES = [
+    ("education", legacy_analyze_education, analyze_education),
+    ("experience", legacy_analyze_experience, analyze_experience),
+    ("skills", legacy_analyze_skills, analyze_skills),
+    ("projects", legacy_analyze_projects, analyze_projects),
+]
+
+
+def main(number=300):
+    texts = ["\n".join(make_resume_lines(length, layout, seed)) for length in LENGTHS for layout in LAYOUTS
+             for seed in range(3)]
+    sections = [default_segmenter.extract(text) for text in texts]
+
+    print(f"{'scorer':<16}{'sections':>10}{'legacy us':>12}{'registry us':>13}{'speedup':>10}")
+    cases = [(name, legacy, new, [s[name] for s in sections if s[name]]) for name, legacy, new in CASES]
+    cases.append(("action_verbs", legacy_check_action_verbs, check_action_verbs, texts))
+    for name, legacy, new, inputs in cases:
+        for text in inputs:
+            assert legacy(text) == new(text), (name, text)
+        legacy_time = timeit.timeit(lambda: [legacy(text) for text in inputs], number=number)
+        # The registry gets each section lowercased once, as analyze_resume passes it
+        lowered = [(text, text.lower()) for text in inputs]
+        new_time = timeit.timeit(lambda: [new(text, lower) for text, lower in lowered], number=number)
+        calls = number * len(inputs)
+        print(f"{name:<16}{len(inputs):>10}{legacy_time / calls * 1e6:>12.2f}{new_time / calls * 1e6:>13.2f}"
+              f"{legacy_time / new_time:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
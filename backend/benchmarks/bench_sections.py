@@ -0,0 +1,81 @@
+"""Benchmark: single-pass SectionSegmenter vs the old four DOTALL lookahead regexes.
+
+Run from the backend folder:
+
+    python benchmarks/bench_sections.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from section_segmenter import default_segmenter
+
+BLOCKS = {
+    "SUMMARY": ["Backend engineer who enjoys building reliable services."],
+    "EDUCATION": ["B.Tech in Computer Science, State University, 2016 - 2020",
+                  "Coursework: distributed systems, databases, compilers"],
+    "EXPERIENCE": ["Software Engineer, Acme Inc, 2020 - Present",
+                   "- Developed Python services and improved latency by 30%",
+                   "- Led the migration to Kubernetes, reduced costs by 20%"],
+    "SKILLS": ["Python, Java, SQL, Docker, Kubernetes, AWS, Git",
+               "Communication, Leadership, Teamwork"],
+    "PROJECTS": ["Resume Analyzer", "Built a web app using React and Flask that improved hiring speed"],
+}
+
+
+def legacy_extract_sections(text):
+    """extract_sections as it was before the segmenter"""
+    sections = {}
+    education_match = re.search(r'(?i)(EDUCATION|ACADEMIC BACKGROUND).*?(?=(EXPERIENCE|SKILLS|PROJECTS|$))', text, re.DOTALL)
+    sections['education'] = education_match.group(0) if education_match else ""
+    experience_match = re.search(r'(?i)(EXPERIENCE|WORK EXPERIENCE|EMPLOYMENT).*?(?=(EDUCATION|SKILLS|PROJECTS|$))', text, re.DOTALL)
+    sections['experience'] = experience_match.group(0) if experience_match else ""
+    skills_match = re.search(r'(?i)(SKILLS|TECHNICAL SKILLS|EXPERTISE).*?(?=(EDUCATION|EXPERIENCE|PROJECTS|$))', text, re.DOTALL)
+    sections['skills'] = skills_match.group(0) if skills_match else ""
+    projects_match = re.search(r'(?i)(PROJECTS|PERSONAL PROJECTS).*?(?=(EDUCATION|EXPERIENCE|SKILLS|$))', text, re.DOTALL)
+    sections['projects'] = projects_match.group(0) if projects_match else ""
+    return sections
+
+
+def make_resume(repeat):
+    """A resume whose section bodies are padded with `repeat` copies of their lines"""
+    lines = ["Jane Doe"]
+    for heading, body in BLOCKS.items():
+        lines.append(heading)
+        lines.extend(body * repeat)
+    return "\n".join(lines)
+
+
+def make_headless(repeat):
+    """Long text with no headings at all, the worst case for the lookahead scans"""
+    body = [line for block in BLOCKS.values() for line in block]
+    return "\n".join(body * repeat)
+
+
+def make_padded(width):
+    """A resume with runs of blank padding and rules, as some DOCX and PDF exports produce"""
+    lines = make_resume(1).split("\n")
+    lines.insert(1, " " * width)
+    lines.insert(3, "-=" * (width // 2))
+    lines.insert(5, " \t." * (width // 3))
+    return "\n".join(lines)
+
+
+def main():
+    print(f"{'document':<24}{'chars':>10}{'legacy us':>14}{'segmenter us':>14}{'speedup':>10}")
+    cases = [(f"resume x{repeat}", make_resume(repeat)) for repeat in (1, 10, 100, 1000)]
+    cases += [(f"no headings x{repeat}", make_headless(repeat)) for repeat in (10, 100)]
+    # A heading prefix that backtracks over whitespace runs turns these quadratic
+    cases += [(f"padding runs x{width}", make_padded(width)) for width in (5000, 20000)]
+    for label, text in cases:
+        number = max(3, 20000 // len(text))
+        legacy = timeit.timeit(lambda: legacy_extract_sections(text), number=number) / number * 1e6
+        segmenter = timeit.timeit(lambda: default_segmenter.extract(text), number=number) / number * 1e6
+        print(f"{label:<24}{len(text):>10}{legacy:>14.1f}{segmenter:>14.1f}{legacy / segmenter:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark and equivalence check: LexiconSentiment vs TextBlob's pattern analyzer.
+
+Both score the same spaCy tokens: every resume of the synthetic corpus, and
+random word salads drawn from the lexicon, negations, modifiers,
+punctuation and emoticons, which exercise every assessment rule. Scores
+must agree within TOLERANCE (the script exits with status 1 otherwise),
+then per-call time is compared. Run from the backend folder:
+
+    python benchmarks/bench_sentiment.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import LAYOUTS, LENGTHS, make_resume_lines
+from nlp_pipeline import parse_documents
+from sentiment import NEGATIONS, LexiconSentiment
+
+# Same rules in the same order, so only float rounding can differ
+TOLERANCE = 1e-9
+
+
+def word_salads(engine, count, length, seed=0):
+    rng = random.Random(seed)
+    lexicon = sorted(engine.lexicon)
+    modifiers = sorted(word for word, entry in engine.lexicon.items() if entry[3])
+    pool = [lambda: rng.choice(lexicon), lambda: rng.choice(modifiers), lambda: rng.choice(sorted(NEGATIONS)),
+            lambda: rng.choice(sorted(engine.emoticons)), lambda: rng.choice(["!", "(!)", ".", ",", "'", "a", "to"]),
+            lambda: rng.choice(["resume", "python", "team", "really", "quickly", "n't", "''"])]
+    return [[rng.choice(pool)() for _ in range(length)] for _ in range(count)]
+
+
+def main(number=50):
+    from textblob.en import sentiment as textblob_sentiment
+    engine = LexiconSentiment()
+
+    texts = ["\n".join(make_resume_lines(length, layout, seed)) for length in LENGTHS for layout in LAYOUTS
+             for seed in range(3)]
+    resumes = [parsed.words for parsed in parse_documents(texts)]
+    salads = word_salads(engine, 2000, 40)
+
+    worst = 0.0
+    for words in resumes + salads:
+        expected = tuple(textblob_sentiment(words))[:2]
+        actual = engine(words)
+        worst = max(worst, abs(expected[0] - actual[0]), abs(expected[1] - actual[1]))
+    print(f"{len(resumes)} resumes and {len(salads)} word salads, largest difference {worst:.2e}")
+
+    legacy = timeit.timeit(lambda: [textblob_sentiment(words) for words in resumes], number=number)
+    lexicon = timeit.timeit(lambda: [engine(words) for words in resumes], number=number)
+    calls = number * len(resumes)
+    print(f"{'textblob us':>14}{'lexicon us':>14}{'speedup':>10}")
+    print(f"{legacy / calls * 1e6:>14.1f}{lexicon / calls * 1e6:>14.1f}{legacy / lexicon:>9.1f}x")
+    return 1 if worst > TOLERANCE else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Synthetic resume corpus for the benchmarks.
+
+Generates deterministic resumes of different lengths and section layouts and
+renders them as DOCX (python-docx) or PDF (a minimal hand-written PDF with
+Helvetica text, so no extra dependency is needed). Also runnable on its own
+to write the corpus to a folder:
+
+    python benchmarks/corpus.py --out /tmp/resumes
+"""
+import argparse
+import io
+import os
+import random
+
+# Approximate number of body lines per section for each length
+LENGTHS = {"short": 3, "medium": 8, "long": 24}
+
+# Section order and heading style per layout
+LAYOUTS = {
+    "standard": ["summary", "education", "experience", "skills", "projects"],
+    "reordered": ["summary", "skills", "experience", "projects", "education", "certifications"],
+    "sparse": ["summary", "experience", "education"],
+    "inline": ["summary", "education", "experience", "skills", "projects"],
+    "no_headings": ["summary", "education", "experience", "skills", "projects"],
+}
+
+HEADINGS = {
+    "summary": ["SUMMARY", "Professional Summary", "PROFILE"],
+    "education": ["EDUCATION", "Education", "ACADEMIC BACKGROUND"],
+    "experience": ["EXPERIENCE", "Work Experience", "PROFESSIONAL EXPERIENCE"],
+    "skills": ["SKILLS", "Technical Skills", "SKILLS & TOOLS"],
+    "projects": ["PROJECTS", "Personal Projects", "KEY PROJECTS"],
+    "certifications": ["CERTIFICATIONS", "Licenses & Certifications"],
+}
+
+VERBS = ["Developed", "Led", "Managed", "Designed", "Implemented", "Created", "Improved",
+         "Reduced", "Built", "Launched", "Analyzed", "Coordinated", "Optimized", "Delivered"]
+TECH = ["Python", "Java", "JavaScript", "React", "SQL", "AWS", "Docker", "Kubernetes", "Git",
+        "Flask", "Django", "PostgreSQL", "Redis", "TensorFlow", "Pandas", "Linux", "Terraform"]
+SOFT = ["communication", "leadership", "teamwork", "problem solving", "time management",
+        "collaboration", "critical thinking"]
+OBJECTS = ["payment service", "data pipeline", "internal dashboard", "mobile app", "search API",
+           "billing platform", "recommendation engine", "CI/CD workflow", "reporting tool"]
+DEGREES = ["B.Tech in Computer Science", "Bachelor of Science in Mathematics",
+           "Master of Science in Data Science", "MBA in Finance", "B.E. in Electronics"]
+SCHOOLS = ["State University", "Institute of Technology", "City College", "National University"]
+COMPANIES = ["Acme Inc", "Globex", "Initech", "Umbrella Corp", "Hooli", "Stark Industries"]
+
+
+def _body(section, rng, lines):
+    if section == "summary":
+        return [f"{rng.choice(['Software', 'Backend', 'Data', 'Full stack'])} engineer with "
+                f"{rng.randint(2, 12)} years of experience building {rng.choice(OBJECTS)}s "
+                f"and a focus on {rng.choice(SOFT)}."]
+    if section == "education":
+        out = []
+        for _ in range(max(1, lines // 4)):
+            year = rng.randint(2005, 2022)
+            out.append(f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}, {year - 4} - {year}")
+            out.append(f"GPA {rng.randint(30, 40) / 10:.1f}, coursework in {rng.choice(OBJECTS)} design")
+        return out
+    if section == "experience":
+        out = []
+        for i in range(max(1, lines // 4)):
+            start = 2023 - 3 * (i + 1)
+            out.append(f"Software Engineer, {rng.choice(COMPANIES)}, {start} - {start + 3}")
+            for _ in range(3):
+                out.append(f"- {rng.choice(VERBS)} the {rng.choice(OBJECTS)} using {rng.choice(TECH)} "
+                           f"and {rng.choice(TECH)}, improving throughput by {rng.randint(5, 60)}%")
+        return out
+    if section == "skills":
+        return [", ".join(rng.sample(TECH, min(len(TECH), 4 + lines // 2))),
+                ", ".join(rng.sample(SOFT, 3)).capitalize()]
+    if section == "projects":
+        out = []
+        for _ in range(max(1, lines // 3)):
+            out.append(f"{rng.choice(OBJECTS).title()} ({rng.choice(TECH)}, {rng.choice(TECH)})")
+            out.append(f"{rng.choice(VERBS)} a {rng.choice(OBJECTS)} used by {rng.randint(1, 50) * 100} users, "
+                       f"see github.com/example/project")
+        return out
+    return [f"AWS Certified {rng.choice(['Developer', 'Solutions Architect'])}, {rng.randint(2015, 2023)}"]
+
+
+def make_resume_lines(length="medium", layout="standard", seed=0):
+    """Lines of text for one synthetic resume"""
+    rng = random.Random(f"{length}/{layout}/{seed}")
+    lines = ["Jane Doe", "jane.doe@example.com | +1 555 0100 | github.com/janedoe"]
+    for section in LAYOUTS[layout]:
+        body = _body(section, rng, LENGTHS[length])
+        heading = rng.choice(HEADINGS[section])
+        if layout == "no_headings":
+            lines.extend(body)
+        elif layout == "inline":
+            lines.append(f"{heading}: {body[0]}")
+            lines.extend(body[1:])
+        else:
+            lines.append(heading)
+            lines.extend(body)
+    return lines
+
+
+def to_docx(lines):
+    import docx
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def to_pdf(lines, lines_per_page=55):
+    """A minimal PDF with one Helvetica text object per page"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3 + 2 * len(pages)
+    kids = ' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages)))
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', f'<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>']
+    for i, page in enumerate(pages):
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R '
+                       f'/Resources << /Font << /F1 {font_id} 0 R >> >> >>')
+        content = 'BT /F1 10 Tf 13 TL 50 760 Td ' + ' '.join(f"({_pdf_escape(line)}) '" for line in page) + ' ET'
+        objects.append(f'<< /Length {len(content)} >>\nstream\n{content}\nendstream')
+    objects.append('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    out = '%PDF-1.4\n'
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{obj}\nendobj\n'
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'
+    out += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets)
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'
+    return out.encode('latin-1')
+
+
+def make_resume(length="medium", layout="standard", fmt="docx", seed=0):
+    """(filename, bytes) for one synthetic resume"""
+    lines = make_resume_lines(length, layout, seed)
+    data = to_pdf(lines) if fmt == "pdf" else to_docx(lines)
+    return f"{length}-{layout}-{seed}.{fmt}", data
+
+
+def build_corpus(lengths=None, layouts=None, formats=("pdf", "docx"), copies=1):
+    """Every combination of length, layout and format, `copies` seeds each"""
+    return [
+        make_resume(length, layout, fmt, seed)
+        for length in (lengths or LENGTHS)
+        for layout in (layouts or LAYOUTS)
+        for fmt in formats
+        for seed in range(copies)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', required=True)
+    parser.add_argument('--copies', type=int, default=1)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for filename, data in build_corpus(copies=args.copies):
+        with open(os.path.join(args.out, filename), 'wb') as f:
+            f.write(data)
+    print(f"Wrote corpus to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
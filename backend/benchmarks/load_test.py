@@ -0,0 +1,137 @@
+"""Load test: requests/sec of /api/analyze under gunicorn for several worker counts.
+
+Starts gunicorn with gunicorn.conf.py once per worker count, waits for
+/api/health/ready, then keeps `--concurrency` clients posting the same resume
+for `--duration` seconds. Requests send Cache-Control: no-store so every one
+runs the full pipeline. Run from the backend folder:
+
+    python benchmarks/load_test.py --workers 1 2 4 --file my_resume.pdf
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import make_resume
+
+
+def sample_resume():
+    """A generated DOCX resume from the benchmark corpus, used when no --file is given"""
+    return make_resume(length="medium", layout="standard", fmt="docx")
+
+
+def multipart_body(filename, data, fields):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'.encode() + data + b'\r\n'
+    )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def wait_until_ready(base_url, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/api/health/ready", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("Server did not become ready in time")
+
+
+def run_clients(base_url, body, content_type, concurrency, duration):
+    counts = {"ok": 0, "failed": 0}
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.time() + duration
+
+    def client():
+        while time.time() < deadline:
+            req = urllib.request.Request(f"{base_url}/api/analyze", data=body, method='POST', headers={
+                'Content-Type': content_type,
+                'Cache-Control': 'no-store'
+            })
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(req, timeout=60) as response:
+                    response.read()
+                    ok = response.status == 200
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                ok = False
+            with lock:
+                counts["ok" if ok else "failed"] += 1
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] if latencies else 0
+    return counts, counts["ok"] / elapsed, p50
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--port', type=int, default=5077)
+    parser.add_argument('--file', help="Resume to upload (PDF or DOCX)")
+    parser.add_argument('--job-role', default='software_engineer')
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, 'rb') as f:
+            filename, data = os.path.basename(args.file), f.read()
+    else:
+        filename, data = sample_resume()
+    body, content_type = multipart_body(filename, data, {"job_role": args.job_role})
+    base_url = f"http://127.0.0.1:{args.port}"
+    data_dir = tempfile.mkdtemp(prefix='load-test-')
+
+    print(f"{'workers':>8}{'req/s':>10}{'p50 ms':>10}{'ok':>8}{'failed':>8}{'scaling':>10}")
+    baseline = None
+    for workers in args.workers:
+        # Admission control would turn the load into 429s and 503s
+        # and the uploads stay out of the real resume index
+        env = dict(os.environ, PORT=str(args.port), WEB_CONCURRENCY=str(workers),
+                   RATE_LIMIT_PER_MINUTE='0', MAX_IN_FLIGHT='0', INDEX_DATA_DIR=data_dir)
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--access-logfile', '/dev/null', 'wsgi:app'],
+            cwd=BACKEND_DIR, env=env
+        )
+        try:
+            wait_until_ready(base_url)
+            counts, throughput, p50 = run_clients(base_url, body, content_type, args.concurrency, args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+
+        baseline = baseline or throughput
+        scaling = throughput / baseline if baseline else 0
+        print(f"{workers:>8}{throughput:>10.1f}{p50 * 1000:>10.0f}{counts['ok']:>8}{counts['failed']:>8}{scaling:>9.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Stress test: concurrent /api/analyze requests give the same results as serial ones, faster.
+
+Serves the app from a threaded WSGI server in this process, analyzes every
+resume of a mixed corpus (see corpus.py) one at a time to get reference
+results, then has `--concurrency` clients post the corpus over and over in
+random order. Every concurrent response must equal the serial one for the
+same file. Runs once per --replicas value (NLP_REPLICAS, spaCy pipelines
+per process). Requests send Cache-Control: no-store so each one runs the
+whole pipeline. Run from the backend folder:
+
+    python benchmarks/stress_concurrency.py --concurrency 8 --replicas 1 2
+
+Exits with status 1 if any concurrent result differs or fails.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.serving import make_server
+
+# Keep the benchmark's uploads out of the on-disk resume index
+os.environ.setdefault("RESUME_INDEX_DB", ":memory:")
+os.environ.setdefault("NEAR_DUPLICATE_DB", ":memory:")
+
+from app import create_app
+from corpus import LAYOUTS, LENGTHS, make_resume
+from load_test import multipart_body
+
+
+def post(base_url, body, content_type):
+    req = urllib.request.Request(f"{base_url}/api/analyze", data=body, method='POST', headers={
+        'Content-Type': content_type,
+        'Cache-Control': 'no-store'
+    })
+    with urllib.request.urlopen(req, timeout=120) as response:
+        return json.loads(response.read())
+
+
+def run(replicas, uploads, concurrency, rounds):
+    app = create_app({'MODEL_LOADING': 'preload', 'NLP_REPLICAS': replicas,
+                      'RATE_LIMIT_PER_MINUTE': 0, 'MAX_IN_FLIGHT': 0})
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='stress-server', daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        start = time.perf_counter()
+        expected = [post(base_url, body, content_type) for body, content_type in uploads]
+        serial_rate = len(uploads) / (time.perf_counter() - start)
+
+        work = [i for _ in range(rounds) for i in range(len(uploads))]
+        random.Random(replicas).shuffle(work)
+        counts = {"ok": 0, "mismatch": 0, "failed": 0}
+        lock = threading.Lock()
+
+        def client():
+            while True:
+                with lock:
+                    if not work:
+                        return
+                    i = work.pop()
+                try:
+                    outcome = "ok" if post(base_url, *uploads[i]) == expected[i] else "mismatch"
+                except Exception:
+                    outcome = "failed"
+                with lock:
+                    counts[outcome] += 1
+
+        threads = [threading.Thread(target=client) for _ in range(concurrency)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        concurrent_rate = sum(counts.values()) / (time.perf_counter() - start)
+    finally:
+        server.shutdown()
+        app.extensions['stage_executor'].shutdown()
+        if 'isolated_extractor' in app.extensions:
+            app.extensions['isolated_extractor'].shutdown()
+    return serial_rate, concurrent_rate, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=3, help="Times each file is posted concurrently")
+    parser.add_argument('--replicas', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--job-role', default='software_engineer')
+    args = parser.parse_args()
+
+    uploads = []
+    for length in LENGTHS:
+        for layout in LAYOUTS:
+            for fmt in ("pdf", "docx"):
+                filename, data = make_resume(length, layout, fmt)
+                uploads.append(multipart_body(filename, data, {"job_role": args.job_role}))
+
+    print(f"{len(uploads)} files, {args.concurrency} clients, {args.rounds} rounds")
+    print(f"{'replicas':>9}{'serial/s':>10}{'concurrent/s':>14}{'speedup':>9}{'ok':>6}{'mismatch':>10}{'failed':>8}")
+    bad = 0
+    for replicas in args.replicas:
+        serial_rate, concurrent_rate, counts = run(replicas, uploads, args.concurrency, args.rounds)
+        bad += counts["mismatch"] + counts["failed"]
+        print(f"{replicas:>9}{serial_rate:>10.1f}{concurrent_rate:>14.1f}{concurrent_rate / serial_rate:>8.2f}x"
+              f"{counts['ok']:>6}{counts['mismatch']:>10}{counts['failed']:>8}")
+    return 1 if bad else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,393 @@
+import hashlib
+import re
+from datetime import date
+
+from keyword_matcher import KeywordMatcher
+from nlp_pipeline import entity_docs
+from result_cache import ResultCache, content_key
+from section_segmenter import Section, default_segmenter
+
+# Sections read for jobs and for schooling. Text outside any section (a
+# resume with no headings, or what comes before the first one) is read for both.
+EMPLOYMENT_SECTIONS = frozenset(("experience", "research", "volunteering"))
+EDUCATION_SECTIONS = frozenset(("education",))
+
+# Lowest to highest
+DEGREE_LEVELS = ("diploma", "associate", "bachelor", "master", "doctorate")
+
+_MONTHS = {name: number for number, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+_MONTH = (r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?")
+
+
+def _date_regex(name):
+    # "Jan 2019", "January, 2019", "01/2019" or "2019"
+    return (rf"(?:(?P<{name}_month>{_MONTH})[^\S\n]*,?[^\S\n]*|(?P<{name}_number>0?[1-9]|1[0-2])[^\S\n]*[/.][^\S\n]*)?"
+            rf"(?P<{name}_year>(?:19|20)\d{{2}})")
+
+
+_DATE_RANGE = re.compile(
+    rf"\b{_date_regex('from')}[^\S\n]*(?:-|–|—|to|until|till|through)[^\S\n]*"
+    rf"(?:{_date_regex('to')}|(?P<current>present|current|now|today|ongoing|date))\b",
+    re.IGNORECASE
+)
+_DATE = re.compile(rf"\b{_date_regex('on')}\b", re.IGNORECASE)
+
+_TITLE = re.compile(
+    r"\b(?:engineer|developer|programmer|architect|analyst|scientist|manager|director|lead|head|intern"
+    r"|consultant|designer|administrator|specialist|coordinator|associate|assistant|officer|executive"
+    r"|representative|technician|researcher|fellow|teacher|instructor|lecturer|professor|accountant"
+    r"|auditor|nurse|president|founder|co-founder|cto|ceo|cfo|coo|vp|owner|strategist|editor|writer"
+    r"|recruiter|advisor|trainee|supervisor|volunteer)s?\b",
+    re.IGNORECASE
+)
+_ORG_SUFFIX = re.compile(
+    r"\b(?:inc|llc|llp|ltd|limited|corp|corporation|co|company|group|technologies|technology|solutions"
+    r"|systems|labs?|software|bank|pvt|gmbh|plc|consulting|services|studios?|agency|foundation"
+    r"|university|institute|hospital)\b",
+    re.IGNORECASE
+)
+_LOCATION = re.compile(r"^(?:(?i:remote|hybrid|on-?site|usa|uk)|[A-Z]{2})$")
+
+# Header fields are split on " | ", " - ", " at ", "@", commas, tabs and brackets
+_SEPARATOR = re.compile(r"[^\S\n]+(?:[|•·–—-]|at|@)[^\S\n]+|[^\S\n]*[|•·,;()\t][^\S\n]*")
+_BULLET = re.compile(r"^[^\S\n]*(?:[-•*▪●◦‣–>]|o(?=[^\S\n])|\d+[.)])[^\S\n]*")
+_LINE = re.compile(r"[^\n]+")
+# Longer lines are descriptions, not a job or school header
+_MAX_HEADER_WORDS = 12
+
+_DEGREE = re.compile(
+    r"\b(?:(?i:bachelor|master|doctor|associate)(?:['’]?s)?(?:[^\S\n]+(?i:degree))?"
+    r"|(?i:diploma)"
+    r"|(?:[BM]\.?[^\S\n]?(?:Sc|SC|Tech|TECH|Eng|Com)|M\.?[^\S\n]?Phil|MBA|BBA|BCA|MCA|BFA|MFA"
+    r"|Ph\.?[^\S\n]?D|LLB|LLM|JD|[BM]\.[^\S\n]?[SAE]"
+    # Bare "MA" or "MS" are as often a state or Microsoft
+    r"|[BM][SAE](?=[^\S\n]+(?:in|of)\b))\b\.?)"
+    # "of Science in Computer Science", "in Electrical Engineering"
+    r"(?:[^\S\n]+(?:of|in)[^\S\n]+[A-Z][\w&-]*(?:[^\S\n]+(?:and[^\S\n]+|&[^\S\n]+|of[^\S\n]+)?[A-Z][\w&-]*)*)*"
+)
+_INSTITUTION = re.compile(
+    r"(?:[A-Z][\w&'-]*[^\S\n]+){0,4}(?:University|College|Institute|School|Academy|Polytechnic)"
+    r"(?:[^\S\n]+(?:of|for|and|&)(?:[^\S\n]+[A-Z][\w&'-]*)+)*"
+)
+
+
+def degree_level(degree):
+    """DEGREE_LEVELS name for a degree as written, e.g. "B.Sc." is a bachelor"""
+    key = degree.lower().replace('.', '').replace(' ', '')
+    if key.startswith(("phd", "doctor", "jd")):
+        return "doctorate"
+    if key.startswith(("master", "mba", "mca", "mfa", "llm", "m")):
+        return "master"
+    if key.startswith("associate"):
+        return "associate"
+    if key.startswith("diploma"):
+        return "diploma"
+    return "bachelor"
+
+
+def _month_number(match, name, default):
+    month = match.group(f"{name}_month")
+    if month:
+        return _MONTHS[month[:3].lower()]
+    number = match.group(f"{name}_number")
+    return int(number) if number else default
+
+
+def _month(year, month):
+    return f"{int(year):04d}-{month:02d}"
+
+
+def _date_range(match, offset=0):
+    # A bare year starts in January and ends in December
+    start = _month(match.group("from_year"), _month_number(match, "from", 1))
+    end = None if match.group("current") else _month(match.group("to_year"), _month_number(match, "to", 12))
+    return {"text": match.group(0), "start": offset + match.start(), "end": offset + match.end(),
+            "from": start, "to": end, "current": end is None}
+
+
+def _single_date(match, offset=0):
+    # A graduation date; a bare year is taken as its end
+    end = _month(match.group("on_year"), _month_number(match, "on", 12))
+    return {"text": match.group(0), "start": offset + match.start(), "end": offset + match.end(),
+            "from": None, "to": end, "current": False}
+
+
+def _mention(text, start, end):
+    return {"text": text[start:end], "start": start, "end": end}
+
+
+def _months(value):
+    year, month = value.split('-')
+    return int(year) * 12 + int(month) - 1
+
+
+def tenure_months(dates, today=None):
+    """Months covered by a date range, counting its first and last month; None without a start"""
+    if dates is None or dates["from"] is None:
+        return None
+    today = today or date.today()
+    end = _months(dates["to"]) if dates["to"] else today.year * 12 + today.month - 1
+    months = end - _months(dates["from"]) + 1
+    return months if months > 0 else None
+
+
+class _Line:
+    def __init__(self, start, text):
+        self.start = start
+        self.text = text
+        self.range = _DATE_RANGE.search(text)
+        # Words with letters in them, so separators and the dates don't count
+        words = [word for word in (text[:self.range.start()] + text[self.range.end():] if self.range else text).split()
+                 if any(char.isalpha() for char in word)]
+        self.header = not _BULLET.match(text) and 0 < len(words) + bool(self.range) <= _MAX_HEADER_WORDS
+
+
+class EntityExtractor:
+    """Structured entities of a resume: jobs, schooling and skills, with character offsets
+
+    Returns {"positions": [{"title", "employer", "dates"}], "education":
+    [{"degree", "institution", "dates"}], "skills": [{"name", "offsets"}],
+    "experience_months", "highest_degree"}. Titles, employers, degrees and
+    institutions are {"text", "start", "end"} spans of the resume text;
+    dates also carry "from" and "to" months ("2019-01", "to" is null while
+    current) and the tenure in "months".
+
+    A job is a header line with a date range, read together with the short
+    header lines around it; its fields are split on the usual separators and
+    the title is the field with a job title word. The employer is the field
+    spaCy tags as an organization, else one with a company suffix, else the
+    first other field that is not a location. Degrees and institutions come
+    from patterns, plus spaCy organizations in education sections, and are
+    paired by nearby lines.
+
+    spaCy's entity recognizer runs once per employment or education section
+    span, not over the whole resume. Results are kept per section with
+    offsets relative to it, keyed by a hash of the section's heading and
+    text, so a re-uploaded resume only costs NLP work for the sections that
+    changed.
+    """
+
+    def __init__(self, vocabulary, cache=None, segmenter=None):
+        vocabulary = sorted(set(term.lower() for term in vocabulary))
+        self.matcher = KeywordMatcher({"skills": vocabulary})
+        self.cache = cache if cache is not None else ResultCache(max_entries=4096, ttl=None)
+        self.segmenter = segmenter or default_segmenter
+        # Cached sections are only valid for the vocabulary that found their skills
+        self.version = hashlib.sha256('\n'.join(vocabulary).encode('utf-8')).hexdigest()[:16]
+
+    def spans(self, text, sections=None):
+        """The document's sections, plus what comes before the first heading as an unnamed span"""
+        if sections is None:
+            sections = self.segmenter.segment(text)
+        first = sections[0].start if sections else len(text)
+        if text[:first].strip():
+            sections = [Section(None, None, 0, first, text[:first])] + list(sections)
+        return sections
+
+    def section_key(self, section):
+        return content_key(f"{self.version}\0{section.name}\0{section.text}".encode('utf-8'))
+
+    @staticmethod
+    def needs_nlp(name):
+        return name is None or name in EMPLOYMENT_SECTIONS or name in EDUCATION_SECTIONS
+
+    def extract(self, text, sections=None, today=None):
+        spans = self.spans(text, sections)
+        keys = [self.section_key(span) for span in spans]
+        results = [self.cache.get("sections", key) for key in keys]
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        parsed = [i for i in missing if self.needs_nlp(spans[i].name)]
+        docs = dict(zip(parsed, entity_docs(spans[i].text for i in parsed))) if parsed else {}
+        for i in missing:
+            results[i] = self.extract_section(spans[i].name, spans[i].text, docs.get(i))
+            self.cache.set("sections", keys[i], results[i])
+
+        return self.assemble(spans, results, today)
+
+    def extract_section(self, name, text, doc=None):
+        """Entities of one section, with offsets relative to its start"""
+        organizations = [(ent.start_char, ent.end_char) for ent in doc.ents if ent.label_ == "ORG"] if doc else []
+        lines = [_Line(match.start(), match.group()) for match in _LINE.finditer(text)]
+        # A section starts with its heading line
+        body = lines[1:] if name is not None else lines
+
+        scan = self.matcher.scan(text.lower())
+        skills = {}
+        for term, offsets in scan.positions["skills"].items():
+            regex = self.matcher.term_patterns[term]
+            skills[term] = [[start, regex.match(scan.text_lower, start).end()] for start in offsets]
+
+        return {
+            "positions": self._positions(text, body, organizations) if name is None or name in EMPLOYMENT_SECTIONS else [],
+            "education": self._education(text, body, organizations) if name is None or name in EDUCATION_SECTIONS else [],
+            "skills": skills
+        }
+
+    def _fields(self, line, skip=None):
+        # (start, end) of each non-empty field of a header line, leaving out the `skip` span
+        text = line.text
+        if skip is not None:
+            text = text[:skip[0]] + ' ' * (skip[1] - skip[0]) + text[skip[1]:]
+        fields = []
+        position = 0
+        for match in list(_SEPARATOR.finditer(text)) + [None]:
+            end = match.start() if match else len(text)
+            field = text[position:end]
+            stripped = field.strip(" \t-–—:")
+            if stripped and any(char.isalpha() for char in stripped):
+                offset = field.index(stripped)
+                fields.append((line.start + position + offset, line.start + position + offset + len(stripped)))
+            position = match.end() if match else len(text)
+        return fields
+
+    def _positions(self, text, lines, organizations):
+        positions = []
+        used = -1
+        for i, line in enumerate(lines):
+            if line.range is None or not line.header:
+                continue
+
+            # Up to two header lines before the dates, and one after with a title or company in it
+            header = [i]
+            j = i - 1
+            while j > used and len(header) < 3 and lines[j].header and lines[j].range is None:
+                header.insert(0, j)
+                j -= 1
+            following = lines[i + 1] if i + 1 < len(lines) else None
+            if (following is not None and following.header and following.range is None
+                    and (_TITLE.search(following.text) or _ORG_SUFFIX.search(following.text))):
+                header.append(i + 1)
+            used = header[-1]
+
+            fields = []
+            for j in header:
+                skip = (lines[j].range.start(), lines[j].range.end()) if j == i else None
+                fields.extend(self._fields(lines[j], skip))
+
+            title = next((field for field in fields if _TITLE.search(text, *field)), None)
+            others = [field for field in fields if field != title]
+            employer = (
+                next((field for field in others
+                      if any(start < field[1] and field[0] < end for start, end in organizations)), None)
+                or next((field for field in others if _ORG_SUFFIX.search(text, *field)), None)
+                or next((field for field in others if not _LOCATION.match(text[field[0]:field[1]])), None)
+            )
+            positions.append({
+                "title": _mention(text, *title) if title else None,
+                "employer": _mention(text, *employer) if employer else None,
+                "dates": _date_range(line.range, line.start)
+            })
+        return positions
+
+    def _education(self, text, lines, organizations):
+        degrees = []
+        institutions = []
+        for i, line in enumerate(lines):
+            for match in _DEGREE.finditer(line.text):
+                degrees.append((i, line.start + match.start(), line.start + match.end()))
+            for match in _INSTITUTION.finditer(line.text):
+                institutions.append((i, line.start + match.start(), line.start + match.end()))
+        for start, end in organizations:
+            overlaps = any(start < e and s < end for _, s, e in degrees + institutions)
+            if not overlaps and not any(char.isdigit() for char in text[start:end]):
+                i = next((i for i, line in reversed(list(enumerate(lines))) if line.start <= start), None)
+                if i is not None:
+                    institutions.append((i, start, end))
+        institutions.sort()
+
+        entries = []
+        unused = list(institutions)
+        for i, start, end in degrees:
+            # The closest institution within two lines, on the same line first
+            nearby = [institution for institution in unused if abs(institution[0] - i) <= 2]
+            institution = min(nearby, key=lambda institution: (abs(institution[0] - i), institution[0] > i),
+                              default=None)
+            if institution is not None:
+                unused.remove(institution)
+            entries.append((i, institution[0] if institution else i, (start, end), institution))
+        for institution in unused:
+            entries.append((institution[0], institution[0], None, institution))
+
+        education = []
+        for first, second, degree, institution in entries:
+            dates = None
+            for j in sorted({first, second, first + 1, second + 1}):
+                if j >= len(lines):
+                    continue
+                line = lines[j]
+                if line.range is not None:
+                    dates = _date_range(line.range, line.start)
+                    break
+                if dates is None and line.header:
+                    match = _DATE.search(line.text)
+                    if match:
+                        dates = _single_date(match, line.start)
+            education.append({
+                "degree": dict(_mention(text, *degree), level=degree_level(text[degree[0]:degree[1]])) if degree else None,
+                "institution": _mention(text, *institution[1:]) if institution else None,
+                "dates": dates
+            })
+        education.sort(key=lambda entry: min(span["start"] for span in (entry["degree"], entry["institution"]) if span))
+        return education
+
+    def assemble(self, spans, results, today=None):
+        """Entities of the whole document from its sections' results, with offsets into the document"""
+        positions = []
+        education = []
+        skills = {}
+        for span, result in zip(spans, results):
+            offset = span.start
+            for position in result["positions"]:
+                positions.append({field: _shift(value, offset) for field, value in position.items()})
+            for entry in result["education"]:
+                education.append({field: _shift(value, offset) for field, value in entry.items()})
+            for term, offsets in result["skills"].items():
+                skills.setdefault(term, []).extend([start + offset, end + offset] for start, end in offsets)
+
+        for entry in positions + education:
+            if entry["dates"] is not None:
+                entry["dates"]["months"] = tenure_months(entry["dates"], today)
+
+        levels = [DEGREE_LEVELS.index(entry["degree"]["level"]) for entry in education if entry["degree"]]
+        return {
+            "positions": positions,
+            "education": education,
+            "skills": [{"name": term, "offsets": offsets}
+                       for term, offsets in sorted(skills.items(), key=lambda item: item[1][0][0])],
+            "experience_months": experience_months([entry["dates"] for entry in positions], today),
+            "highest_degree": DEGREE_LEVELS[max(levels)] if levels else None
+        }
+
+
+def _shift(span, offset):
+    # Copies, so cached section results are never changed
+    if span is None:
+        return None
+    return dict(span, start=span["start"] + offset, end=span["end"] + offset)
+
+
+def experience_months(date_ranges, today=None):
+    """Months covered by any of the date ranges; overlapping jobs count once"""
+    today = today or date.today()
+    now = today.year * 12 + today.month - 1
+    intervals = sorted(
+        (_months(dates["from"]), _months(dates["to"]) if dates["to"] else now)
+        for dates in date_ranges if dates is not None and dates["from"] is not None
+    )
+    total = 0
+    current_start = current_end = None
+    for start, end in intervals:
+        if end < start:
+            continue
+        if current_end is None or start > current_end + 1:
+            if current_end is not None:
+                total += current_end - current_start + 1
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start + 1
+    return total
@@ -0,0 +1,42 @@
+import os
+import threading
+import weakref
+
+# Every live ForkSafeLock, so a forked child can replace them all
+_locks = weakref.WeakSet()
+
+
+class ForkSafeLock:
+    """A threading.Lock that a forked child gets back released
+
+    Batch and extraction workers fork from a threaded web worker and inherit
+    its locks in whatever state the request threads left them, without the
+    threads that would release them. After a fork every ForkSafeLock in the
+    child holds a fresh lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        _locks.add(self)
+
+    def acquire(self, blocking=True, timeout=-1):
+        return self._lock.acquire(blocking, timeout)
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+
+
+def _reset_locks():
+    for lock in list(_locks):
+        lock._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_locks)
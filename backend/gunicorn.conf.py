@@ -0,0 +1,48 @@
+import multiprocessing
+import os
+
+from admission import DEFAULT_MAX_IN_FLIGHT, DEFAULT_MAX_QUEUED
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Analysis is CPU-bound, so run one worker process per core; spaCy parses
+# within a worker are capped by NLP_REPLICAS (see nlp_pipeline.py).
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+
+# Each web worker forks its batch pool on the first batch request; between
+# them the pools get the cores, not a full set of processes each
+os.environ.setdefault("BATCH_WORKERS", str(max(1, multiprocessing.cpu_count() // workers)))
+
+# Admission control (app.py) runs MAX_IN_FLIGHT analyses per worker and lets
+# MAX_QUEUED more wait, shedding the rest with 503. It only sees requests that
+# have a thread, so each worker gets one for every running and waiting
+# analysis, plus a couple for health checks and metrics. Waiting threads just
+# block, they cost no CPU.
+max_in_flight = int(os.environ.get("MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT))
+max_queued = int(os.environ.get("MAX_QUEUED", DEFAULT_MAX_QUEUED))
+threads = int(os.environ.get("GUNICORN_THREADS", max_in_flight + max_queued + 2))
+
+# Load the app, and with it spaCy, once in the master before forking so all
+# workers share the model pages copy-on-write
+preload_app = True
+os.environ.setdefault("MODEL_LOADING", "preload")
+
+# The workers share the resume index and near-duplicate index through their
+# files (under INDEX_DATA_DIR by default); in memory each worker would get
+# its own, diverging copy
+if workers > 1:
+    for name in ("RESUME_INDEX_DB", "NEAR_DUPLICATE_DB"):
+        if os.environ.get(name) == ":memory:":
+            raise RuntimeError(f"{name}=:memory: cannot be shared by {workers} workers; name a file")
+
+# Kill requests that run away, and give in-flight ones time to finish on
+# restart. Recycling workers now and then bounds any slow memory growth.
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+max_requests = 1000
+max_requests_jitter = 100
+
+accesslog = "-"
+
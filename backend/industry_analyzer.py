@@ -1,150 +1,218 @@
+import hashlib
 import json
-import re
+import logging
 import os
+import time
+from fork_safe import ForkSafeLock
+from keyword_matcher import KeywordMatcher
 
-class IndustryAnalyzer:
-    def __init__(self):
-        self.industries = {
-            "software_engineer": {
-                "required_skills": [
-                    "python", "java", "javascript", "c++", "ruby", "go", "rust",
-                    "react", "angular", "vue", "django", "flask", "spring", "node",
-                    "database", "sql", "nosql", "mongodb", "postgresql", "mysql",
-                    "aws", "azure", "gcp", "cloud", "docker", "kubernetes",
-                    "git", "ci/cd", "testing", "algorithms", "data structures"
-                ],
-                "recommended_sections": [
-                    "technical skills", "projects", "experience", "education",
-                    "github", "open source contributions", "certifications"
-                ],
-                "action_verbs": [
-                    "developed", "implemented", "architected", "designed", "built",
-                    "optimized", "debugged", "refactored", "deployed", "maintained",
-                    "tested", "automated", "integrated", "solved", "improved"
-                ],
-                "achievements_keywords": [
-                    "hackathon", "coding","competition", "ideathon", "optimization", "deployment", 
-                    "refactoring", "scalability", "automation", "integration", "debugging",
-                    "performance", "contribution", "latency", "efficiency", "innovation"
-                ]
+logger = logging.getLogger(__name__)
 
-            },
-            "data_scientist": {
-                "required_skills": [
-                    "python", "r", "sql", "pandas", "numpy", "scikit-learn", "tensorflow",
-                    "pytorch", "machine learning", "data analysis", "data visualization",
-                    "statistics", "big data", "hadoop", "spark", "data mining",
-                    "nlp", "computer vision", "deep learning", "tableau", "power bi",
-                    "a/b testing", "experiment design", "feature engineering"
-                ],
-                "recommended_sections": [
-                    "technical skills", "projects", "experience", "education",
-                    "publications", "research", "certifications"
-                ],
-                "action_verbs": [
-                    "analyzed", "modeled", "predicted", "improved", "developed",
-                    "implemented", "researched", "visualized", "extracted", "processed",
-                    "trained", "evaluated", "optimized", "designed", "deployed"
-                ],
-                "achievements_keywords": [
-                    "hackathon", "coding","competition", "ideathon", "optimization", "deployment", 
-                    "refactoring", "scalability", "automation", "integration", "debugging",
-                    "performance", "contribution", "latency", "efficiency", "innovation",
-                    "accuracy", "insights", "prediction", "analysis", "visualization",
-                ]
-            },
-            "marketing": {
-                "required_skills": [
-                    "social media", "content marketing", "seo", "sem", "email marketing",
-                    "google analytics", "copywriting", "market research", "brand management",
-                    "campaign management", "adobe creative suite", "canva", "hubspot", 
-                    "mailchimp", "facebook ads", "google ads", "marketing strategy",
-                    "analytics", "customer acquisition", "a/b testing"
-                ],
-                "recommended_sections": [
-                    "skills", "experience", "education", "campaigns", "portfolio",
-                    "certifications", "achievements"
-                ],
-                "action_verbs": [
-                    "launched", "created", "managed", "designed", "generated",
-                    "implemented", "developed", "increased", "grew", "coordinated",
-                    "executed", "optimized", "analyzed", "strategized", "produced"
-                ],
-                "achievements_keywords": [
-                    "conversion", "traffic", "engagement", "growth", "reach", 
-                    "branding", "roi", "campaign", "strategy", "leads",
-                    "acquisition", "retention", "optimization", "content", "promotion"
-                ]
+KEYWORD_CATEGORIES = ["required_skills", "recommended_sections", "action_verbs", "achievements_keywords"]
 
-            },
-            "finance": {
-                "required_skills": [
-                    "financial analysis", "excel", "financial modeling", "accounting",
-                    "budgeting", "forecasting", "bloomberg", "capital markets", "valuation",
-                    "financial reporting", "risk management", "investment", "portfolio management",
-                    "quickbooks", "sap", "cfa", "financial statements", "taxes", "regulations"
-                ],
-                "recommended_sections": [
-                    "skills", "experience", "education", "certifications", "achievements",
-                    "financial expertise", "licenses"
-                ],
-                "action_verbs": [
-                    "analyzed", "managed", "increased", "reduced", "improved",
-                    "developed", "forecasted", "budgeted", "reconciled", "audited",
-                    "allocated", "assessed", "calculated", "evaluated", "streamlined"
-                ],
-                "achievements_keywords": [
-                    "profit", "costs", "savings", "forecast", "budgeting", 
-                    "modeling", "valuation", "compliance", "accuracy", "investment",
-                    "reporting", "auditing", "efficiency", "risk", "regulation"
-                ]
-
-            }
+DEFAULT_PROFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'industry_profiles')
+PROFILE_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+
+class ProfileError(ValueError):
+    """Raised for an industry profile file that cannot be used"""
+
+
+def validate_profile(data):
+    """Check a parsed profile and return it normalized (lowercased, stripped terms)"""
+    if not isinstance(data, dict):
+        raise ProfileError("profile must be a mapping")
+    profile = {}
+    for category in KEYWORD_CATEGORIES:
+        terms = data.get(category)
+        if not isinstance(terms, list) or not terms:
+            raise ProfileError(f"'{category}' must be a non-empty list")
+        if not all(isinstance(term, str) and term.strip() for term in terms):
+            raise ProfileError(f"'{category}' must only contain non-empty strings")
+        profile[category] = [term.strip().lower() for term in terms]
+    for field in ("label", "description"):
+        if field in data and not isinstance(data[field], str):
+            raise ProfileError(f"'{field}' must be a string")
+        profile[field] = data.get(field)
+    return profile
+
+
+def load_profile_file(path):
+    """Read and validate one profile file. Returns (profile, version)."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        if path.endswith('.json'):
+            data = json.loads(raw)
+        else:
+            try:
+                import yaml
+            except ImportError:
+                raise ProfileError("PyYAML is not installed, YAML profiles cannot be read")
+            data = yaml.safe_load(raw)
+    except ProfileError:
+        raise
+    except Exception as e:
+        raise ProfileError(f"cannot parse: {e}")
+    return validate_profile(data), hashlib.sha256(raw).hexdigest()[:12]
+
+
+class IndustryProfile:
+    """A validated industry profile compiled into a single keyword matcher"""
+
+    def __init__(self, industry, data, version):
+        self.industry = industry
+        self.data = data
+        self.version = version
+        self.label = data.get("label") or industry.replace('_', ' ').title()
+        self.description = data.get("description")
+        self.matcher = KeywordMatcher({category: data[category] for category in KEYWORD_CATEGORIES})
+
+    def to_dict(self):
+        return {
+            "id": self.industry,
+            "label": self.label,
+            "description": self.description,
+            "version": self.version,
+            "keyword_counts": {category: len(self.data[category]) for category in KEYWORD_CATEGORIES}
         }
-    
+
+
+class IndustryAnalyzer:
+    """Score resumes against the industry profiles found in a profiles directory
+
+    Each JSON (or, with PyYAML installed, YAML) file is one industry, named
+    after the file. Profiles are validated and compiled once; the directory
+    is checked for changes at most every reload_interval seconds and only
+    changed files are recompiled. A file that fails validation is logged
+    and its last good version, if any, stays in use.
+    """
+
+    def __init__(self, profiles_dir=None, reload_interval=None):
+        self.profiles_dir = profiles_dir or os.environ.get("INDUSTRY_PROFILES_DIR", DEFAULT_PROFILES_DIR)
+        if reload_interval is None:
+            reload_interval = float(os.environ.get("INDUSTRY_PROFILES_RELOAD_SECONDS", 2))
+        self.reload_interval = reload_interval
+        self.profiles = {}
+        self.industries = {}
+        self.matchers = {}
+        self._fingerprint = None
+        self._next_check = 0
+        # Batch workers fork from a threaded web worker and may reload profiles
+        self._lock = ForkSafeLock()
+        self.reload()
+
+    def _profile_files(self):
+        try:
+            names = sorted(name for name in os.listdir(self.profiles_dir) if name.endswith(PROFILE_EXTENSIONS))
+        except FileNotFoundError:
+            logger.error("Industry profiles directory %s does not exist", self.profiles_dir)
+            return []
+        return [os.path.join(self.profiles_dir, name) for name in names]
+
+    def _stat_fingerprint(self, paths):
+        fingerprint = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            fingerprint.append((path, stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
+    def reload(self):
+        """Re-read the profiles directory, recompiling only profiles whose content changed"""
+        with self._lock:
+            paths = self._profile_files()
+            self._fingerprint = self._stat_fingerprint(paths)
+            self._next_check = time.monotonic() + self.reload_interval
+
+            profiles = {}
+            for path in paths:
+                industry = os.path.splitext(os.path.basename(path))[0]
+                try:
+                    data, version = load_profile_file(path)
+                except (OSError, ProfileError) as e:
+                    logger.error("Skipping industry profile %s: %s", path, e)
+                    if industry in self.profiles:
+                        profiles[industry] = self.profiles[industry]
+                    continue
+                current = self.profiles.get(industry)
+                profiles[industry] = current if current and current.version == version else IndustryProfile(industry, data, version)
+
+            # Readers take self.profiles once per call, so swapping it is enough
+            self.profiles = profiles
+            self.industries = {industry: profile.data for industry, profile in profiles.items()}
+            self.matchers = {industry: profile.matcher for industry, profile in profiles.items()}
+            return sorted(profiles)
+
+    def maybe_reload(self):
+        """Reload if the profiles directory changed; cheap enough to call on every request"""
+        if self.reload_interval <= 0 or time.monotonic() < self._next_check:
+            return False
+        self._next_check = time.monotonic() + self.reload_interval
+        if self._stat_fingerprint(self._profile_files()) == self._fingerprint:
+            return False
+        logger.info("Industry profiles changed, reloading %s", self.profiles_dir)
+        self.reload()
+        return True
+
+    def list_profiles(self):
+        self.maybe_reload()
+        return sorted((profile.to_dict() for profile in self.profiles.values()), key=lambda p: p["label"])
+
+    def version(self, industry):
+        """Content version of an industry's profile, or None if it does not exist"""
+        profile = self.profiles.get(industry)
+        return profile.version if profile else None
+
     def analyze_for_industry(self, text, industry):
         """Analyze a resume for a specific industry"""
-        if industry not in self.industries:
+        self.maybe_reload()
+        profile = self.profiles.get(industry)
+        if profile is None:
             return {"error": f"Industry '{industry}' not supported"}
         
-        industry_data = self.industries[industry]
-        text_lower = text.lower()
+        # Find every keyword of every category in a single pass
+        scan = profile.matcher.scan(text.lower())
+        
+        return self._score(profile, set().union(*scan.hits.values()))
+    
+    def vocabulary(self, industry):
+        """Every keyword of an industry, across all categories"""
+        return {term for terms in self.profiles[industry].matcher.vocabularies.values() for term in terms}
+    
+    def score_terms(self, industry, found_terms):
+        """Score an industry from the set of its keywords found in a resume"""
+        return self._score(self.profiles[industry], found_terms)
+    
+    def _score(self, profile, found_terms):
+        industry = profile.industry
+        industry_data = profile.data
+        vocabularies = profile.matcher.vocabularies
+        
+        def split(category):
+            found = [term for term in vocabularies[category] if term in found_terms]
+            missing = [term for term in vocabularies[category] if term not in found_terms]
+            return found, missing
         
         # Skills analysis
-        found_skills = []
-        missing_skills = []
-        for skill in industry_data["required_skills"]:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-            else:
-                missing_skills.append(skill)
+        found_skills, missing_skills = split("required_skills")
         
         skills_score = min(100, int((len(found_skills) / len(industry_data["required_skills"])) * 100))
         
         # Section analysis
-        found_sections = []
-        missing_sections = []
-        for section in industry_data["recommended_sections"]:
-            if section.lower() in text_lower:
-                found_sections.append(section)
-            else:
-                missing_sections.append(section)
+        found_sections, missing_sections = split("recommended_sections")
         
         sections_score = min(100, int((len(found_sections) / len(industry_data["recommended_sections"])) * 100))
         
         # Action verbs analysis
-        found_verbs = []
-        for verb in industry_data["action_verbs"]:
-            if verb.lower() in text_lower:
-                found_verbs.append(verb)
+        found_verbs, _ = split("action_verbs")
         
         verbs_score = min(100, int((len(found_verbs) / 10) * 100))  # We just need around 10 good verbs
         
         # Achievements analysis
-        found_achievements = []
-        for achievement in industry_data["achievements_keywords"]:
-            if achievement.lower() in text_lower:
-                found_achievements.append(achievement)
+        found_achievements, _ = split("achievements_keywords")
         
         achievements_score = min(100, int((len(found_achievements) / 5) * 100))  # Need around 5 achievement phrases
         
@@ -193,4 +261,5 @@ class IndustryAnalyzer:
                 "achievement_phrases_found": found_achievements
             },
             "suggestions": suggestions
-        }
\ No newline at end of file
+        }
+
@@ -0,0 +1,84 @@
+from collections import Counter
+from functools import lru_cache
+
+from keyword_matcher import KeywordMatcher, tokenize
+
+# Share of the overlap score that comes from skills; noun phrases make up the rest
+SKILL_WEIGHT = 0.7
+
+
+class JobDescriptionExtractor:
+    """Pull the skills and key noun phrases out of a job description
+
+    Skills are whole-word hits of a fixed vocabulary. Phrases are spaCy noun
+    chunks, normalized to their word tokens without leading stopwords ("our
+    distributed systems" becomes "distributed systems"), most frequent first.
+    """
+
+    def __init__(self, vocabulary, max_phrase_words=3, max_phrases=40):
+        self.matcher = KeywordMatcher({"skills": sorted(set(term.lower() for term in vocabulary))})
+        self.max_phrase_words = max_phrase_words
+        self.max_phrases = max_phrases
+
+    def normalize_phrase(self, phrase, stopwords):
+        tokens = tokenize(phrase.lower())
+        while tokens and tokens[0] in stopwords:
+            tokens.pop(0)
+        if not tokens or len(tokens) > self.max_phrase_words or all(token in stopwords for token in tokens):
+            return None
+        normalized = ' '.join(tokens)
+        return normalized if len(normalized) > 3 else None
+
+    def extract(self, text, phrases, stopwords=frozenset()):
+        """{"skills": [...], "phrases": [...]} for a job description and its noun chunks"""
+        found, _ = self.matcher.split(self.matcher.scan(text.lower()), "skills")
+        skills = set(found)
+        counts = Counter()
+        for phrase in phrases:
+            normalized = self.normalize_phrase(phrase, stopwords)
+            if normalized and normalized not in skills:
+                counts[normalized] += 1
+        # Counter keeps first-seen order among equal counts
+        return {"skills": found, "phrases": [phrase for phrase, _ in counts.most_common(self.max_phrases)]}
+
+
+@lru_cache(maxsize=64)
+def _requirements_matcher(skills, phrases):
+    return KeywordMatcher({"skills": list(skills), "phrases": list(phrases)})
+
+
+def _ratio(found, total):
+    return len(found) / len(total) if total else None
+
+
+def compare_resume(features, resume_text):
+    """Matched and missing job description skills and phrases in a resume's text
+
+    Only the resume text is scanned; the job description's features come
+    from extract() and are not parsed again. The score is out of 100.
+    """
+    matcher = _requirements_matcher(tuple(features["skills"]), tuple(features["phrases"]))
+    scan = matcher.scan(resume_text.lower())
+    matched_skills, missing_skills = matcher.split(scan, "skills")
+    matched_phrases, missing_phrases = matcher.split(scan, "phrases")
+
+    skill_overlap = _ratio(matched_skills, features["skills"])
+    phrase_overlap = _ratio(matched_phrases, features["phrases"])
+    if skill_overlap is None and phrase_overlap is None:
+        score = 0
+    elif skill_overlap is None:
+        score = phrase_overlap
+    elif phrase_overlap is None:
+        score = skill_overlap
+    else:
+        score = SKILL_WEIGHT * skill_overlap + (1 - SKILL_WEIGHT) * phrase_overlap
+
+    return {
+        "score": round(score * 100),
+        "skill_overlap": round(skill_overlap, 3) if skill_overlap is not None else None,
+        "phrase_overlap": round(phrase_overlap, 3) if phrase_overlap is not None else None,
+        "matched_skills": matched_skills,
+        "missing_skills": missing_skills,
+        "matched_phrases": matched_phrases,
+        "missing_phrases": missing_phrases
+    }
@@ -0,0 +1,101 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFull(Exception):
+    """Raised when the job queue is at its maximum depth"""
+
+
+class LocalJobStore:
+    """In-process job state. Swap for a shared store to run jobs across machines."""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job):
+        with self._lock:
+            self._jobs[job["job_id"]] = job
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def delete_finished_before(self, cutoff):
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job["finished_at"] is not None and job["finished_at"] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+
+class JobQueue:
+    """Run analyses in the background on a bounded pool of worker threads"""
+
+    def __init__(self, workers=2, max_depth=32, result_ttl=600, store=None):
+        self.workers = workers
+        self.max_depth = max_depth
+        self.result_ttl = result_ttl
+        self.store = store or LocalJobStore()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analysis-job')
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        """Queue fn(*args) and return the new job id, or raise QueueFull"""
+        self.purge_expired()
+
+        with self._lock:
+            # Queued and running jobs both count toward the depth
+            if self._pending >= self.max_depth:
+                raise QueueFull()
+            self._pending += 1
+
+        job_id = uuid.uuid4().hex
+        self.store.create({
+            "job_id": job_id,
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None
+        })
+        self._executor.submit(self._run, job_id, fn, args)
+        return job_id
+
+    def _run(self, job_id, fn, args):
+        self.store.update(job_id, status="running", started_at=time.time())
+        try:
+            result = fn(*args)
+            self.store.update(job_id, status="done", result=result, finished_at=time.time())
+        except Exception as e:
+            self.store.update(job_id, status="failed", error=str(e) or e.__class__.__name__,
+                              finished_at=time.time())
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def get(self, job_id):
+        self.purge_expired()
+        return self.store.get(job_id)
+
+    def purge_expired(self):
+        return self.store.delete_finished_before(time.time() - self.result_ttl)
+
+    def depth(self):
+        with self._lock:
+            return self._pending
+
+    def retry_after(self):
+        """Rough number of seconds before a slot frees up"""
+        return max(1, self.depth() // self.workers)
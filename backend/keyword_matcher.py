@@ -0,0 +1,148 @@
+import re
+import string
+
+# Characters that make up a word. '+' and '#' are included so that "c" does
+# not match inside "c++" or "c#".
+WORD_CHARS = 'a-z0-9+#'
+_WORD_CHAR = re.compile(f'[{WORD_CHARS}]')
+
+# Byte table mapping every non-word byte (including all non-ASCII bytes, so
+# bullets and dashes) to a space. bytes.translate stays on its fast path
+# whatever the text contains, unlike str.translate or re.split.
+_KEEP = set((string.ascii_lowercase + string.digits + '+#').encode())
+_TOKEN_TABLE = bytes(byte if byte in _KEEP else 0x20 for byte in range(256))
+
+
+def tokenize(text_lower):
+    """Split lowercased text into word tokens"""
+    return [token.decode() for token in text_lower.encode('utf-8').translate(_TOKEN_TABLE).split()]
+
+
+def token_set(text_lower):
+    """The distinct word tokens of lowercased text, as bytes"""
+    return set(text_lower.encode('utf-8').translate(_TOKEN_TABLE).split())
+
+
+def _plural(token):
+    """Simple plural form, only for longer words ending in a letter"""
+    if len(token) >= 3 and token[-1].isalpha() and not token.endswith('s'):
+        return token + 's'
+    return None
+
+
+def _term_regex(tokens):
+    """Regex for a term that tolerates any separator between its words
+
+    The pattern starts with a literal so the regex engine can jump straight
+    to candidates; the word boundary before it is checked by _find_term.
+    """
+    words = [re.escape(token) for token in tokens]
+    if _plural(tokens[-1]):
+        words[-1] += 's?'
+    return re.compile(f'[^{WORD_CHARS}]+'.join(words) + f'(?![{WORD_CHARS}])')
+
+
+def _find_term(regex, text_lower):
+    """Yield start offsets of whole-word matches of a term regex"""
+    for match in regex.finditer(text_lower):
+        start = match.start()
+        if start == 0 or not _WORD_CHAR.match(text_lower, start - 1):
+            yield start
+
+
+class KeywordScan:
+    """Hits found by a single KeywordMatcher pass"""
+
+    def __init__(self, matcher, text_lower, hits):
+        self.matcher = matcher
+        self.text_lower = text_lower
+        # {category: set of terms}
+        self.hits = hits
+        self._positions = None
+
+    def found(self, category):
+        return self.hits[category]
+
+    @property
+    def positions(self):
+        """{category: {term: [start offsets]}}, located on first access"""
+        if self._positions is None:
+            offsets = {}
+            self._positions = {}
+            for category, terms in self.hits.items():
+                self._positions[category] = {}
+                for term in terms:
+                    if term not in offsets:
+                        regex = self.matcher.term_patterns[term]
+                        offsets[term] = list(_find_term(regex, self.text_lower))
+                    self._positions[category][term] = offsets[term]
+        return self._positions
+
+    def counts(self, category):
+        return {term: len(offsets) for term, offsets in self.positions[category].items()}
+
+
+class KeywordMatcher:
+    """Find every vocabulary term of several categories in one pass over the text
+
+    The text is tokenized once and single-word terms are found with a set
+    intersection. Multi-word terms are only confirmed with their compiled
+    regex when all of their words occur in the text. Terms match whole words
+    only, so short terms like "r", "go" or "be" no longer hit inside longer
+    words, and a simple plural ("databases") counts as a hit for its term.
+    """
+
+    def __init__(self, vocabularies):
+        self.vocabularies = {category: [term.lower() for term in terms]
+                             for category, terms in vocabularies.items()}
+
+        self.term_patterns = {}
+        # Single-word forms (as bytes) -> set of (category, term)
+        self._words = {}
+        # Multi-word terms as (first word, last word forms, regex, targets)
+        phrases = {}
+        for category, terms in self.vocabularies.items():
+            for term in terms:
+                tokens = tokenize(term)
+                if term not in self.term_patterns:
+                    self.term_patterns[term] = _term_regex(tokens)
+                if len(tokens) == 1:
+                    for form in (tokens[0], _plural(tokens[0])):
+                        if form:
+                            self._words.setdefault(form.encode(), set()).add((category, term))
+                else:
+                    last_forms = {form.encode() for form in (tokens[-1], _plural(tokens[-1])) if form}
+                    phrase = phrases.setdefault(term, (tokens[0].encode(), last_forms, self.term_patterns[term], set()))
+                    phrase[3].add((category, term))
+        self._phrases = list(phrases.values())
+        self._word_forms = frozenset(self._words)
+
+    def scan(self, text_lower, tokens=None):
+        """Scan already lowercased text and return a KeywordScan
+
+        tokens can be passed in when the caller already has the token_set of
+        the same text, so several matchers can share one tokenization.
+        """
+        hits = {category: set() for category in self.vocabularies}
+        if tokens is None:
+            tokens = token_set(text_lower)
+
+        for form in tokens & self._word_forms:
+            for category, term in self._words[form]:
+                hits[category].add(term)
+
+        for first, last_forms, regex, targets in self._phrases:
+            if first not in tokens or last_forms.isdisjoint(tokens):
+                continue
+            if next(_find_term(regex, text_lower), None) is not None:
+                for category, term in targets:
+                    hits[category].add(term)
+
+        return KeywordScan(self, text_lower, hits)
+
+    def split(self, scan, category):
+        """Split a category's vocabulary into (found, missing), keeping its order"""
+        hits = scan.hits[category]
+        found = [term for term in self.vocabularies[category] if term in hits]
+        missing = [term for term in self.vocabularies[category] if term not in hits]
+        return found, missing
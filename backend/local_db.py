@@ -0,0 +1,51 @@
+import os
+import sqlite3
+
+# SQLite files kept between restarts live here unless INDEX_DATA_DIR says otherwise
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def data_path(filename):
+    """Path of a database file in the data directory, creating the directory if needed"""
+    data_dir = os.environ.get("INDEX_DATA_DIR", DEFAULT_DATA_DIR)
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, filename)
+
+
+class ProcessLocalConnection:
+    """A SQLite connection opened separately in every process that uses it
+
+    gunicorn preloads the app and forks, and a SQLite connection must not be
+    used on both sides of a fork, so get() opens a new one the first time it
+    is called in a process. The inherited one is left open, closing it could
+    disturb the parent's locks. `setup_sql` creates the schema on each open and
+    `migrate(db)`, when given, runs after it.
+    """
+
+    def __init__(self, path, setup_sql, isolation_level="", migrate=None):
+        self.path = path
+        self.setup_sql = setup_sql
+        self.isolation_level = isolation_level
+        self.migrate = migrate
+        self._connection = None
+        self._pid = None
+        self._inherited = None
+
+    def get(self):
+        if self._pid != os.getpid():
+            self._inherited = self._connection
+            self._connection = self._connect()
+            self._pid = os.getpid()
+        return self._connection
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=self.isolation_level)
+        if self.path != ":memory:":
+            # Several gunicorn workers share the file
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA busy_timeout=5000")
+        db.executescript(self.setup_sql)
+        if self.migrate is not None:
+            self.migrate(db)
+        db.commit()
+        return db
@@ -0,0 +1,238 @@
+import contextvars
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+from fork_safe import ForkSafeLock
+
+logger = logging.getLogger(__name__)
+
+# Seconds; resume stages range from sub-millisecond regexes to multi-second PDFs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = ForkSafeLock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = ForkSafeLock()
+
+    def set(self, *label_values, value):
+        with self._lock:
+            self._values[label_values] = value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts, sum, count]
+        self._series = {}
+        self._lock = ForkSafeLock()
+
+    def observe(self, *label_values, value):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labels, label_values, ("le", repr(float(bound))))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labels, label_values, ("le", "+Inf"))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labels, label_values)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrics for this process, rendered in the Prometheus text format
+
+    Each gunicorn worker keeps its own registry, so a scrape sees the worker
+    that answered it; scrape workers individually or aggregate by instance.
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, documentation, labels=()):
+        metric = Counter(name, documentation, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name, documentation, labels=()):
+        metric = Gauge(name, documentation, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, documentation, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+STAGE_SECONDS = registry.histogram(
+    "resume_stage_seconds", "Time spent in each analysis stage", ("stage",))
+REQUEST_SECONDS = registry.histogram(
+    "resume_request_seconds", "Time spent handling analysis requests", ("endpoint",))
+REQUESTS = registry.counter(
+    "resume_requests_total", "Analysis requests by endpoint and outcome", ("endpoint", "status"))
+STAGE_TIMEOUTS = registry.counter(
+    "resume_stage_timeouts_total", "Stages skipped or cut short by the time budget", ("stage", "reason"))
+ADMISSION_REJECTED = registry.counter(
+    "resume_admission_rejected_total", "Requests turned away by rate limiting or load shedding", ("endpoint", "reason"))
+ADMISSION_WAIT_SECONDS = registry.histogram(
+    "resume_admission_wait_seconds", "Time analyses waited for a free slot", ("endpoint",))
+ADMISSION_LIMITS = registry.gauge(
+    "resume_admission_limit", "Configured admission limits of this process", ("limit",))
+IN_FLIGHT = registry.gauge(
+    "resume_analyses_in_flight", "Analyses running or waiting for a slot in this process", ("state",))
+
+# Stage timings of the current request, when it asked for them
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+@contextmanager
+def stage(name):
+    """Time a pipeline stage into STAGE_SECONDS and the current request's timings"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        STAGE_SECONDS.observe(name, value=seconds)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def collect_timings():
+    """Collect the stage timings of everything run inside the block into a dict"""
+    timings = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+class SamplingProfiler:
+    """Run cProfile on one in every `every` requests; 0 turns it off
+
+    The top functions by cumulative time are logged, and the raw stats are
+    written to `out_dir` when set, for snakeviz or pstats. cProfile only
+    sees the thread it runs in, so profile() yields whether this request is
+    being profiled, and the caller should then do all its work inline.
+    """
+
+    def __init__(self, every=0, out_dir=None, top=25):
+        self.every = every
+        self.out_dir = out_dir
+        self.top = top
+        self._seen = 0
+        self._lock = threading.Lock()
+
+    def _sampled(self):
+        if self.every <= 0:
+            return False
+        with self._lock:
+            self._seen += 1
+            return self._seen % self.every == 0
+
+    @contextmanager
+    def profile(self, label):
+        if not self._sampled():
+            yield False
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Only one profiler can run at a time; another thread has it
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            profiler.disable()
+            self._report(profiler, label)
+
+    def _report(self, profiler, label):
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(self.top)
+        logger.info("Profile of %s:\n%s", label, output.getvalue())
+        if self.out_dir:
+            os.makedirs(self.out_dir, exist_ok=True)
+            path = os.path.join(self.out_dir, f"{label.strip('/').replace('/', '_')}-{time.time_ns()}.prof")
+            profiler.dump_stats(path)
@@ -0,0 +1,212 @@
+import os
+import threading
+import zlib
+
+import numpy as np
+
+from keyword_matcher import tokenize
+from local_db import ProcessLocalConnection, data_path
+
+# Mersenne prime for the MinHash permutations; shingle hashes are reduced below it
+_PRIME = (1 << 31) - 1
+
+
+class MinHasher:
+    """MinHash signatures over word shingles of a resume's text
+
+    The fraction of equal positions in two signatures estimates the Jaccard
+    similarity of the two texts' sets of `shingle_size`-word shingles.
+    Shingles are hashed with CRC-32, so signatures are stable across
+    processes and can be persisted.
+    """
+
+    def __init__(self, num_perm=64, shingle_size=5, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)
+
+    def shingles(self, text):
+        tokens = tokenize(text.lower())
+        k = self.shingle_size
+        if len(tokens) <= k:
+            grams = {' '.join(tokens)} if tokens else set()
+        else:
+            grams = {' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+        return np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text):
+        """The text's signature, or None when it has no words to compare on"""
+        hashes = self.shingles(text) % _PRIME
+        if not len(hashes):
+            # Every empty text would get the same signature and match every other
+            return None
+        # a * x + b stays below 2**63 because a, b and x are all below 2**31
+        return ((np.outer(hashes, self._a) + self._b) % _PRIME).min(axis=0).astype(np.uint32)
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of the texts behind two signatures"""
+    return float(np.count_nonzero(signature == other)) / len(signature)
+
+
+class NearDuplicateIndex:
+    """MinHash LSH index of resume texts, kept in memory and persisted in SQLite
+
+    Signatures are split into `bands` bands; texts that agree on a whole
+    band are candidates, and candidates are checked against the full
+    signature. With 64 permutations in 16 bands of 4, a pair at 0.9
+    similarity is a candidate more than 99.99% of the time.
+
+    Band keys sit in one sorted array per band, so a lookup is a binary
+    search per band. Signatures added since the last sort are compared
+    directly until there are `pending_limit` of them, then everything is
+    re-sorted. Other processes sharing the database file see new
+    signatures on their next lookup; removals are only seen by the process
+    that made them until it restarts.
+    """
+
+    def __init__(self, db_path=":memory:", hasher=None, bands=16, pending_limit=4096):
+        self.db_path = db_path
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.pending_limit = pending_limit
+        # Odd multipliers that fold each band's rows into one 64-bit key
+        rows = self.hasher.num_perm // bands
+        self._mixer = np.random.RandomState(7).randint(1, 1 << 62, size=rows).astype(np.uint64) | np.uint64(1)
+
+        self.ids = []
+        self._positions = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._signatures = np.zeros((0, self.hasher.num_perm), dtype=np.uint32)
+        self._keys = np.zeros((0, bands), dtype=np.uint64)
+        self._count = 0
+        # Per band: (sorted keys, positions) over the first _sorted_count signatures
+        self._sorted = []
+        self._sorted_count = 0
+        self._synced_seq = 0
+        self._lock = threading.Lock()
+
+        self._connection = ProcessLocalConnection(
+            db_path,
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, resume_id TEXT UNIQUE, signature BLOB);"
+        )
+        with self._lock:
+            self._sync()
+
+    @property
+    def _db(self):
+        return self._connection.get()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._positions
+
+    def band_keys(self, signatures):
+        rows = signatures.reshape(len(signatures), self.bands, -1).astype(np.uint64)
+        return (rows * self._mixer).sum(axis=2)
+
+    def _grow(self, needed):
+        capacity = len(self._signatures)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2, 1024)
+        for name in ('_signatures', '_keys', '_alive'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+    def _append(self, resume_ids, signatures):
+        start = self._count
+        self._grow(start + len(resume_ids))
+        end = start + len(resume_ids)
+        self._signatures[start:end] = signatures
+        self._keys[start:end] = self.band_keys(signatures)
+        self._alive[start:end] = True
+        for position, resume_id in enumerate(resume_ids, start):
+            previous = self._positions.get(resume_id)
+            if previous is not None:
+                self._alive[previous] = False
+            self._positions[resume_id] = position
+        self.ids.extend(resume_ids)
+        self._count = end
+        if self._count - self._sorted_count > self.pending_limit:
+            self._sort()
+
+    def _sort(self):
+        keys = self._keys[:self._count]
+        self._sorted = []
+        for band in range(self.bands):
+            order = np.argsort(keys[:, band], kind='stable')
+            self._sorted.append((keys[order, band], order))
+        self._sorted_count = self._count
+
+    def _sync(self):
+        rows = self._db.execute(
+            "SELECT seq, resume_id, signature FROM signatures WHERE seq > ? ORDER BY seq", (self._synced_seq,)
+        ).fetchall()
+        if not rows:
+            return
+        self._synced_seq = rows[-1][0]
+        signatures = np.frombuffer(b''.join(row[2] for row in rows), dtype=np.uint32)
+        self._append([row[1] for row in rows], signatures.reshape(len(rows), self.hasher.num_perm))
+
+    def add(self, resume_id, signature):
+        """Store a resume's signature, replacing any earlier one"""
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM signatures WHERE resume_id = ?", (resume_id,))
+                self._db.execute("INSERT INTO signatures (resume_id, signature) VALUES (?, ?)",
+                                 (resume_id, np.asarray(signature, dtype=np.uint32).tobytes()))
+            self._sync()
+
+    def remove(self, resume_id):
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM signatures WHERE resume_id = ?", (resume_id,))
+            position = self._positions.pop(resume_id, None)
+            if position is None:
+                return False
+            self._alive[position] = False
+            return True
+
+    def query(self, signature, threshold=0.9, exclude=None, limit=5):
+        """[(resume_id, similarity)] of stored texts at least `threshold` similar, closest first"""
+        keys = self.band_keys(signature[np.newaxis])[0]
+        with self._lock:
+            self._sync()
+            candidates = []
+            for band, (sorted_keys, order) in enumerate(self._sorted):
+                lo, hi = np.searchsorted(sorted_keys, keys[band], 'left'), np.searchsorted(sorted_keys, keys[band], 'right')
+                if hi > lo:
+                    candidates.append(order[lo:hi])
+            pending = self._keys[self._sorted_count:self._count]
+            if len(pending):
+                candidates.append(self._sorted_count + np.flatnonzero((pending == keys).any(axis=1)))
+            if not candidates:
+                return []
+            positions = np.unique(np.concatenate(candidates))
+            positions = positions[self._alive[positions]]
+            scores = (self._signatures[positions] == signature).mean(axis=1)
+            keep = scores >= threshold
+            matches = [(self.ids[position], float(score)) for position, score in zip(positions[keep], scores[keep])]
+        matches = [match for match in matches if match[0] != exclude]
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:limit]
+
+    def nearest(self, signature, threshold=0.9, exclude=None):
+        """(resume_id, similarity) of the closest stored text above threshold, or None"""
+        matches = self.query(signature, threshold, exclude, limit=1)
+        return matches[0] if matches else None
+
+
+def create_near_duplicate_index_from_env():
+    # NEAR_DUPLICATE_DB=:memory: keeps the signatures in this process only, for tests and benchmarks
+    return NearDuplicateIndex(os.environ.get("NEAR_DUPLICATE_DB") or data_path("near_duplicates.db"))
@@ -0,0 +1,283 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from fork_safe import ForkSafeLock
+
+MODEL_NAME = 'en_core_web_sm'
+
+# Noun chunks need the tagger, attribute ruler and parser (which also sets
+# sentence boundaries). Lemmas are never read; the entity recognizer stays
+# loaded but out of the main pipeline, entity_docs() runs it on its own.
+DISABLED_COMPONENTS = ['ner', 'lemmatizer']
+
+# NLTK data the analyzers read, by download id and nltk.data path
+REQUIRED_CORPORA = {'stopwords': 'corpora/stopwords'}
+
+# spaCy, NLTK and TextBlob are imported on first use: importing them alone
+# takes a couple of seconds, which we don't want to pay on every cold start
+_nlp = None
+_stopwords = None
+_sentiment = None
+_sentiment_backend = "lexicon"
+_load_lock = ForkSafeLock()
+load_timings = {}
+
+
+def get_nlp():
+    """The shared spaCy pipeline, loaded on first use"""
+    global _nlp
+    if _nlp is None:
+        with _load_lock:
+            if _nlp is None:
+                start = time.perf_counter()
+                import spacy
+                nlp = spacy.load(MODEL_NAME, disable=DISABLED_COMPONENTS)
+                load_timings["spacy_seconds"] = round(time.perf_counter() - start, 3)
+                _nlp = nlp
+    return _nlp
+
+
+def get_stopwords():
+    """NLTK's English stopwords, read from disk once
+
+    Falls back to spaCy's built-in list when the NLTK corpus is not
+    installed, rather than downloading it.
+    """
+    global _stopwords
+    if _stopwords is None:
+        with _load_lock:
+            if _stopwords is None:
+                start = time.perf_counter()
+                try:
+                    from nltk.corpus import stopwords
+                    words = frozenset(stopwords.words('english'))
+                    load_timings["stopwords_source"] = "nltk"
+                except LookupError:
+                    from spacy.lang.en.stop_words import STOP_WORDS
+                    words = frozenset(STOP_WORDS)
+                    load_timings["stopwords_source"] = "spacy"
+                load_timings["stopwords_seconds"] = round(time.perf_counter() - start, 3)
+                _stopwords = words
+    return _stopwords
+
+
+SENTIMENT_BACKENDS = ("lexicon", "textblob")
+
+
+def set_sentiment_backend(name):
+    """Pick how sentiment is scored: "lexicon" (sentiment.LexiconSentiment) or "textblob" """
+    global _sentiment, _sentiment_backend
+    if name not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Unknown sentiment backend {name!r}, expected one of {', '.join(SENTIMENT_BACKENDS)}")
+    with _load_lock:
+        if name != _sentiment_backend:
+            _sentiment_backend = name
+            _sentiment = None
+
+
+def get_sentiment():
+    """The sentiment scorer: a callable from a list of lowercased tokens to (polarity, subjectivity)
+
+    Both backends give the same scores. TextBlob's lexicon is a lazy dict
+    filled on first lookup, so two threads making the first call at once
+    could both load it, or score against a half-filled one; loading it here,
+    under the lock, leaves it read-only afterwards.
+    """
+    global _sentiment
+    if _sentiment is None:
+        with _load_lock:
+            if _sentiment is None:
+                start = time.perf_counter()
+                if _sentiment_backend == "textblob":
+                    from textblob.en import sentiment as textblob_sentiment
+                    len(textblob_sentiment)
+                    scorer = lambda words: tuple(textblob_sentiment(words))[:2]
+                else:
+                    from sentiment import LexiconSentiment
+                    scorer = LexiconSentiment()
+                load_timings["sentiment_backend"] = _sentiment_backend
+                load_timings["sentiment_seconds"] = round(time.perf_counter() - start, 3)
+                _sentiment = scorer
+    return _sentiment
+
+
+class PipelinePool:
+    """spaCy pipelines lent out to one thread at a time
+
+    spaCy does not promise that a pipeline can run in several threads at
+    once, so every parse borrows one for its duration. The first pipeline is
+    the shared one from get_nlp() (loaded before forking, so its pages stay
+    shared); up to size - 1 more are loaded on demand for threads that would
+    otherwise wait. With size 1 parses in a process run one at a time, while
+    uploads and extraction in other threads carry on.
+    """
+
+    def __init__(self, size=1):
+        self.size = max(1, size)
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._created == 0:
+            return get_nlp()
+        import spacy
+        return spacy.load(MODEL_NAME, disable=DISABLED_COMPONENTS)
+
+    @contextmanager
+    def borrow(self):
+        try:
+            nlp = self._idle.get_nowait()
+        except queue.Empty:
+            nlp = None
+            with self._lock:
+                if self._created < self.size:
+                    nlp = self._load()
+                    self._created += 1
+            if nlp is None:
+                nlp = self._idle.get()
+        try:
+            yield nlp
+        finally:
+            self._idle.put(nlp)
+
+    def info(self):
+        return {"size": self.size, "loaded": self._created, "idle": self._idle.qsize()}
+
+
+pipelines = PipelinePool()
+
+
+def set_pipeline_replicas(size):
+    """Allow up to `size` spaCy pipelines in this process; call before serving"""
+    global pipelines
+    if size != pipelines.size:
+        pipelines = PipelinePool(size)
+
+
+def pipeline_info():
+    return pipelines.info()
+
+
+def _reset_pipelines():
+    # A forked child gets a copy of the pool's queue and locks in whatever
+    # state the parent's threads left them, and none of those threads
+    global pipelines
+    pipelines = PipelinePool(pipelines.size)
+
+
+os.register_at_fork(after_in_child=_reset_pipelines)
+
+
+def missing_corpora():
+    """NLTK corpora that are not installed locally. Never touches the network."""
+    import nltk
+    missing = []
+    for name, path in REQUIRED_CORPORA.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(name)
+    return missing
+
+
+def download_corpora():
+    """Fetch missing NLTK corpora. Meant for build steps, not app startup."""
+    import nltk
+    for name in missing_corpora():
+        nltk.download(name, quiet=True)
+
+
+def preload():
+    """Load every model now, e.g. in a pre-fork master so workers share the memory"""
+    get_nlp()
+    get_stopwords()
+    get_sentiment()
+
+
+def models_ready():
+    return _nlp is not None and _stopwords is not None and _sentiment is not None
+
+
+class ParsedDocument:
+    """A resume parsed once by spaCy and shared by every analyzer"""
+
+    def __init__(self, text, doc):
+        self.text = text
+        self.doc = doc
+        self.text_lower = text.lower()
+        self._words = None
+
+    @property
+    def words(self):
+        """Lowercased tokens, ignoring whitespace"""
+        if self._words is None:
+            self._words = [token.lower_ for token in self.doc if not token.is_space]
+        return self._words
+
+    @property
+    def word_count(self):
+        return len(self.words)
+
+    @property
+    def noun_chunks(self):
+        return [chunk.text.lower() for chunk in self.doc.noun_chunks]
+
+    @property
+    def sentences(self):
+        return [sent.text for sent in self.doc.sents]
+
+    def sentiment(self):
+        """Return (polarity, subjectivity) from the pattern lexicon, reusing our tokens"""
+        polarity, subjectivity = get_sentiment()(self.words)
+        return polarity, subjectivity
+
+
+def parse_document(text):
+    """Parse a single resume
+
+    Each /api/analyze request parses its own resume; requests are not
+    batched together. spaCy holds the GIL for the whole parse, so other
+    request threads rarely get to queue up behind it: a request-level
+    batcher measured an average batch of 1.06 with 16 concurrent requests.
+    """
+    with pipelines.borrow() as nlp:
+        doc = nlp(text)
+    return ParsedDocument(text, doc)
+
+
+def parse_documents(texts, batch_size=16):
+    """Parse many resumes at once with nlp.pipe
+
+    Used for the uploads of one batch request, a chunk at a time in each
+    batch worker (see batch_analyzer.py).
+    """
+    texts = list(texts)
+    with pipelines.borrow() as nlp:
+        docs = list(nlp.pipe(texts, batch_size=batch_size))
+    return [ParsedDocument(text, doc) for text, doc in zip(texts, docs)]
+
+
+def entity_docs(texts, batch_size=16):
+    """Docs with named entities for short spans of text, such as resume sections
+
+    Only the tokenizer and the entity recognizer run: in the trained
+    pipelines the recognizer has its own embedding layer and needs no tags
+    or parse. Without a recognizer the docs have no entities.
+    """
+    texts = list(texts)
+    with pipelines.borrow() as nlp:
+        docs = [nlp.make_doc(text) for text in texts]
+        if "ner" in nlp.component_names:
+            docs = list(nlp.get_pipe("ner").pipe(docs, batch_size=batch_size))
+    return docs
+
+
+if __name__ == '__main__':
+    # Build step: python nlp_pipeline.py
+    download_corpora()
+    preload()
+    print(f"Models ready: {load_timings}")
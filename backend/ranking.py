@@ -0,0 +1,213 @@
+import math
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+from keyword_matcher import KeywordMatcher
+
+
+class TermFeaturizer:
+    """Turn a resume or job description into {term: count}
+
+    Counts whole-word hits of a fixed vocabulary (skills, action verbs,
+    achievement keywords) and adds the noun phrases found by spaCy, so terms
+    outside the vocabulary still count when both sides mention them.
+    """
+
+    def __init__(self, vocabulary, max_phrase_words=3):
+        self.matcher = KeywordMatcher({"terms": sorted(set(term.lower() for term in vocabulary))})
+        self.max_phrase_words = max_phrase_words
+
+    def features(self, text, phrases=()):
+        counts = self.matcher.scan(text.lower()).counts("terms")
+        for phrase in phrases:
+            if len(phrase.split()) <= self.max_phrase_words:
+                counts[phrase] = counts.get(phrase, 0) + 1
+        return counts
+
+
+class RankingIndex:
+    """Rank every stored resume against a job description in one sparse product
+
+    Each resume is a row of log-scaled term counts, 1 + ln(count), in a
+    SciPy CSC matrix. A query is scored with TF-IDF cosine similarity using
+    only the matrix columns of its own terms, so ranking touches the
+    postings of a few dozen terms instead of every resume.
+
+    New resumes are buffered and folded into the matrix on the next query.
+    Re-adding a resume replaces its row; replaced and removed rows are
+    masked out and dropped when the matrix is rebuilt.
+    """
+
+    def __init__(self):
+        self.terms = {}
+        self.ids = []
+        self.metadata = []
+        self._rows = {}
+        self._alive = []
+        self._pending = []
+        self._dead = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        # Built state, replaced as a whole so queries can read it without the lock
+        self._built = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._rows
+
+    def _row(self, features):
+        columns = []
+        weights = []
+        for term, count in features.items():
+            if count <= 0:
+                continue
+            column = self.terms.get(term)
+            if column is None:
+                column = self.terms[term] = len(self.terms)
+            columns.append(column)
+            weights.append(1 + math.log(count))
+        order = np.argsort(columns)
+        return np.asarray(columns, dtype=np.int32)[order], np.asarray(weights, dtype=np.float32)[order]
+
+    def add(self, resume_id, features, metadata=None):
+        """Add or replace a resume's term counts"""
+        with self._lock:
+            row = self._row(features)
+            if resume_id in self._rows:
+                self._remove(resume_id)
+            self._rows[resume_id] = len(self.ids)
+            self.ids.append(resume_id)
+            self.metadata.append(metadata or {})
+            self._alive.append(True)
+            self._pending.append(row)
+            self._dirty = True
+
+    def remove(self, resume_id):
+        with self._lock:
+            return self._remove(resume_id)
+
+    def _remove(self, resume_id):
+        position = self._rows.pop(resume_id, None)
+        if position is None:
+            return False
+        self._alive[position] = False
+        self._dead += 1
+        self._dirty = True
+        return True
+
+    def _build(self):
+        """Fold pending rows into the matrix and recompute IDF and row norms"""
+        with self._lock:
+            built = self._built
+            if built is not None and not self._dirty:
+                return built
+
+            columns = [row[0] for row in self._pending]
+            weights = [row[1] for row in self._pending]
+            if built is not None:
+                csr = built["matrix"].tocsr()
+                indptr = [csr.indptr]
+                columns.insert(0, csr.indices)
+                weights.insert(0, csr.data)
+                offset = csr.indptr[-1]
+            else:
+                indptr = [np.zeros(1, dtype=np.int64)]
+                offset = 0
+            lengths = np.fromiter((len(row[0]) for row in self._pending), dtype=np.int64, count=len(self._pending))
+            indptr.append(offset + np.cumsum(lengths))
+            self._pending = []
+            self._dirty = False
+
+            shape = (len(self.ids), len(self.terms))
+            csr = sparse.csr_matrix(
+                (np.concatenate(weights) if weights else np.zeros(0, dtype=np.float32),
+                 np.concatenate(columns) if columns else np.zeros(0, dtype=np.int32),
+                 np.concatenate(indptr)),
+                shape=shape
+            )
+            alive = np.asarray(self._alive, dtype=bool)
+
+            # Drop masked rows once they are a large share of the matrix
+            if self._dead and self._dead * 2 >= len(self.ids):
+                csr = csr[alive]
+                self.ids = [resume_id for resume_id, keep in zip(self.ids, alive) if keep]
+                self.metadata = [meta for meta, keep in zip(self.metadata, alive) if keep]
+                self._rows = {resume_id: position for position, resume_id in enumerate(self.ids)}
+                self._alive = [True] * len(self.ids)
+                self._dead = 0
+                alive = np.ones(len(self.ids), dtype=bool)
+
+            live_count = int(alive.sum())
+            document_frequency = np.bincount(csr[alive].indices, minlength=shape[1]) if live_count else np.zeros(shape[1])
+            idf = (np.log((1 + live_count) / (1 + document_frequency)) + 1).astype(np.float32)
+            norms = np.sqrt(np.asarray(csr.multiply(idf).power(2).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+
+            self._built = {
+                "matrix": csr.tocsc(),
+                "idf": idf,
+                "norms": norms,
+                "alive": alive,
+                "rows": len(self.ids),
+                "ids": list(self.ids),
+                "positions": dict(self._rows),
+                "metadata": list(self.metadata),
+                "terms": dict(self.terms),
+                "names": list(self.terms),
+            }
+            return self._built
+
+    def rank(self, features, k=10, min_score=0.0, candidates=None):
+        """Top k resumes for a job description's term counts, best first
+
+        candidates, a set of resume ids, limits the ranking to those resumes.
+        """
+        start = time.perf_counter()
+        built = self._build()
+
+        known = [(built["terms"][term], 1 + math.log(count))
+                 for term, count in features.items() if count > 0 and term in built["terms"]]
+        results = []
+        if known and built["rows"]:
+            columns = np.asarray([column for column, _ in known], dtype=np.int32)
+            idf = built["idf"][columns]
+            query = np.asarray([weight for _, weight in known], dtype=np.float32) * idf
+            query_norm = float(np.linalg.norm(query)) or 1.0
+
+            # Only the query's columns matter: sum their postings weighted by idf
+            postings = built["matrix"][:, columns]
+            scores = postings @ (query * idf) / (built["norms"] * query_norm)
+            scores[~built["alive"]] = -1
+            if candidates is not None:
+                positions = built["positions"]
+                allowed = np.zeros(len(scores), dtype=bool)
+                allowed[np.fromiter((positions[i] for i in candidates if i in positions), dtype=np.int64)] = True
+                scores[~allowed] = -1
+
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            matched_rows = postings.tocsr()[top]
+            names = built["names"]
+            for position, row in zip(top, matched_rows):
+                score = float(scores[position])
+                if score <= min_score:
+                    break
+                results.append({
+                    "resume_id": built["ids"][position],
+                    "score": round(score, 4),
+                    "matched_terms": [names[columns[i]] for i in row.indices],
+                    **built["metadata"][position]
+                })
+
+        return {
+            "results": results,
+            "corpus_size": int(built["alive"].sum()),
+            "query_terms": len(known),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        }
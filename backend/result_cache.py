@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+
+from fork_safe import ForkSafeLock
+from local_db import ProcessLocalConnection
+
+
+def content_key(data):
+    """Cache key for an uploaded file: the SHA-256 of its bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache with a TTL and an optional SQLite tier
+
+    Entries live in namespaces so that role-independent work (extracted text
+    and NLP features) is stored apart from per-role industry results.
+    Every `purge_every` sets, expired entries are dropped and the SQLite
+    tier is trimmed to its newest `max_disk_entries` rows.
+    """
+
+    def __init__(self, max_entries=256, ttl=3600, db_path=None, max_disk_entries=100000, purge_every=256):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.purge_every = purge_every
+        self._sets = 0
+        self._entries = OrderedDict()
+        self._lock = ForkSafeLock()
+        self.stats = {"hits": 0, "misses": 0, "disk_hits": 0, "evictions": 0}
+
+        self.db_path = db_path
+        self._connection = ProcessLocalConnection(
+            db_path,
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "namespace TEXT, key TEXT, value TEXT, created_at REAL, "
+            "PRIMARY KEY (namespace, key));"
+            "CREATE INDEX IF NOT EXISTS cache_created_at ON cache (created_at);"
+        ) if db_path else None
+        # Open now so a bad path fails at startup
+        self._db
+
+    @property
+    def _db(self):
+        return self._connection.get() if self._connection is not None else None
+
+    def _expired(self, created_at):
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def get(self, namespace, key):
+        """Return the cached value or None"""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is not None:
+                created_at, value = entry
+                if not self._expired(created_at):
+                    self._entries.move_to_end((namespace, key))
+                    self.stats["hits"] += 1
+                    return value
+                del self._entries[(namespace, key)]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?",
+                    (namespace, key)
+                ).fetchone()
+                if row is not None:
+                    if not self._expired(row[1]):
+                        value = json.loads(row[0])
+                        self._store((namespace, key), row[1], value)
+                        self.stats["hits"] += 1
+                        self.stats["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+                    self._db.commit()
+
+            self.stats["misses"] += 1
+            return None
+
+    def set(self, namespace, key, value):
+        created_at = time.time()
+        with self._lock:
+            self._store((namespace, key), created_at, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, json.dumps(value), created_at)
+                )
+                self._db.commit()
+            # Expired entries are otherwise only dropped when looked up again
+            self._sets += 1
+            if self._sets % self.purge_every == 0:
+                self._purge()
+
+    def _store(self, cache_key, created_at, value):
+        self._entries[cache_key] = (created_at, value)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def purge_expired(self):
+        """Drop expired entries from both tiers, and the oldest rows past max_disk_entries"""
+        with self._lock:
+            self._purge()
+
+    def _purge(self):
+        for cache_key in [k for k, (created_at, _) in self._entries.items() if self._expired(created_at)]:
+            del self._entries[cache_key]
+        if self._db is None:
+            return
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM cache WHERE created_at < ?", (time.time() - self.ttl,))
+        excess = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache ORDER BY created_at LIMIT ?)", (excess,))
+            self.stats["evictions"] += excess
+        self._db.commit()
+
+    def info(self):
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / total, 3) if total else None,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_disk_entries": self.max_disk_entries if self._db is not None else None,
+                "ttl": self.ttl,
+                "disk": self._db is not None
+            }
+
+
+def create_cache_from_env():
+    return ResultCache(
+        max_entries=int(os.environ.get("RESULT_CACHE_SIZE", 256)),
+        ttl=float(os.environ.get("RESULT_CACHE_TTL", 3600)),
+        db_path=os.environ.get("RESULT_CACHE_DB"),
+        max_disk_entries=int(os.environ.get("RESULT_CACHE_DISK_SIZE", 100000))
+    )
+
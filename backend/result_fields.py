@@ -0,0 +1,92 @@
+# Top-level fields of an analysis and the optional pipeline stages each one needs.
+# Section scores only need the regex scorers, which always run.
+FIELD_STAGES = {
+    "overall_score": set(),
+    "sections": set(),
+    "suggestions": {"parse", "keywords"},
+    "strengths": {"parse", "keywords"},
+    "word_count": {"parse"},
+    "entities": {"entities"},
+    "sentiment": {"parse", "sentiment"},
+    "industry_analysis": {"industry"},
+}
+
+# Every optional stage
+ALL_STAGES = frozenset().union(*FIELD_STAGES.values())
+
+# Request metadata, always returned when present
+META_FIELDS = ("partial", "skipped_stages", "duplicate_of", "timings_ms")
+
+
+def parse_fields(value):
+    """Dotted field paths from a "fields" parameter, or None for everything
+
+    Raises ValueError for unknown top-level fields.
+    """
+    if not value:
+        return None
+    paths = [path.strip() for path in value.split(',') if path.strip()]
+    unknown = sorted({path.split('.', 1)[0] for path in paths} - set(FIELD_STAGES))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Known fields: {', '.join(FIELD_STAGES)}")
+    return paths or None
+
+
+def required_stages(fields):
+    """Optional stages needed for the selected fields, or None when everything runs"""
+    if fields is None:
+        return None
+    stages = set()
+    for path in fields:
+        stages |= FIELD_STAGES[path.split('.', 1)[0]]
+    return stages
+
+
+def _select(value, parts):
+    if not parts:
+        return value
+    if not isinstance(value, dict) or parts[0] not in value:
+        return None
+    return {parts[0]: _select(value[parts[0]], parts[1:])}
+
+
+def _merge(target, selected):
+    for key, value in selected.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def select_fields(result, fields):
+    """Keep only the selected dotted paths of a result, plus request metadata"""
+    selected = {}
+    for path in fields:
+        value = _select(result, path.split('.'))
+        if value is not None:
+            _merge(selected, value)
+    for field in META_FIELDS:
+        if field in result:
+            selected[field] = result[field]
+    return selected
+
+
+def compact_result(result):
+    """Scores only, without feedback and keyword lists, for bulk clients"""
+    compact = {}
+    if "overall_score" in result:
+        compact["overall_score"] = result["overall_score"]
+    if result.get("sections") is not None:
+        compact["sections"] = {name: section["score"] if section.get("exists") else None
+                               for name, section in result["sections"].items()}
+    if "word_count" in result:
+        compact["word_count"] = result["word_count"]
+    if result.get("sentiment"):
+        compact["sentiment"] = [result["sentiment"]["polarity"], result["sentiment"]["subjectivity"]]
+    industry = result.get("industry_analysis")
+    if industry:
+        compact["industry_score"] = industry.get("overall_score")
+    for field in META_FIELDS:
+        if field in result:
+            compact[field] = result[field]
+    return compact
@@ -0,0 +1,214 @@
+import json
+import os
+import threading
+import time
+
+from entity_extractor import DEGREE_LEVELS
+from keyword_matcher import KeywordMatcher
+from local_db import ProcessLocalConnection, data_path
+
+# SQLite's default limit on host parameters per statement is 999
+_BATCH = 500
+
+
+def _add_entity_columns(db):
+    # Stores created before entities were kept
+    columns = {row[1] for row in db.execute("PRAGMA table_info(resumes)")}
+    for column, kind in (("entities", "TEXT"), ("experience_months", "INTEGER"), ("degree_level", "INTEGER")):
+        if column not in columns:
+            db.execute(f"ALTER TABLE resumes ADD COLUMN {column} {kind}")
+
+
+class ResumeStore:
+    """Persistent index of analyzed resumes in SQLite
+
+    For each resume it keeps the extracted text, the section spans, the
+    ranking term counts, the structured entities (with the total experience
+    and highest degree as columns to filter on), and the hit counts of every
+    vocabulary term the store has been asked to track. When a profile adds new terms, only
+    those terms are searched for in the stored text (no extraction or
+    parsing), so re-scoring the whole index is a couple of bulk queries.
+    """
+
+    def __init__(self, db_path=":memory:"):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = ProcessLocalConnection(
+            db_path,
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, resume_id TEXT UNIQUE, filename TEXT, "
+            "text TEXT, sections TEXT, features TEXT, added_at REAL);"
+            "CREATE TABLE IF NOT EXISTS term_hits ("
+            "term TEXT, resume_id TEXT, count INTEGER, PRIMARY KEY (term, resume_id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS term_hits_resume ON term_hits (resume_id);"
+            "CREATE TABLE IF NOT EXISTS tracked_terms (term TEXT PRIMARY KEY) WITHOUT ROWID;",
+            migrate=_add_entity_columns
+        )
+        self._matcher = None
+        self._tracked = None
+        # Open now so a bad path fails at startup
+        self._db
+
+    @property
+    def _db(self):
+        return self._connection.get()
+
+    def _load_tracked(self):
+        tracked = frozenset(row[0] for row in self._db.execute("SELECT term FROM tracked_terms"))
+        if tracked != self._tracked:
+            self._tracked = tracked
+            self._matcher = KeywordMatcher({"terms": sorted(tracked)}) if tracked else None
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def __contains__(self, resume_id):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM resumes WHERE resume_id = ?", (resume_id,)).fetchone() is not None
+
+    def add(self, resume_id, filename, text, sections, features, entities=None):
+        """Store a resume, or replace it, and count the tracked terms in its text"""
+        experience_months = degree_level = None
+        if entities is not None:
+            experience_months = entities["experience_months"]
+            if entities["highest_degree"]:
+                degree_level = DEGREE_LEVELS.index(entities["highest_degree"])
+        with self._lock:
+            self._load_tracked()
+            hits = self._matcher.scan(text.lower()).counts("terms") if self._matcher else {}
+            with self._db:
+                # Replacing moves the resume to the end, so incremental readers see it again
+                self._db.execute("DELETE FROM resumes WHERE resume_id = ?", (resume_id,))
+                self._db.execute("DELETE FROM term_hits WHERE resume_id = ?", (resume_id,))
+                self._db.execute(
+                    "INSERT INTO resumes (resume_id, filename, text, sections, features, added_at, "
+                    "entities, experience_months, degree_level) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (resume_id, filename, text, json.dumps(sections), json.dumps(features), time.time(),
+                     json.dumps(entities) if entities is not None else None, experience_months, degree_level)
+                )
+                self._db.executemany(
+                    "INSERT INTO term_hits (term, resume_id, count) VALUES (?, ?, ?)",
+                    [(term, resume_id, count) for term, count in hits.items()]
+                )
+
+    def remove(self, resume_id):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM term_hits WHERE resume_id = ?", (resume_id,))
+            return self._db.execute("DELETE FROM resumes WHERE resume_id = ?", (resume_id,)).rowcount > 0
+
+    def get(self, resume_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT resume_id, filename, text, sections, features, added_at, entities FROM resumes WHERE resume_id = ?",
+                (resume_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "resume_id": row[0], "filename": row[1], "text": row[2],
+            "sections": json.loads(row[3]), "features": json.loads(row[4]), "added_at": row[5],
+            "entities": json.loads(row[6]) if row[6] is not None else None
+        }
+
+    def track_terms(self, terms):
+        """Make sure hit counts exist for every term, scanning stored text for new ones
+
+        Returns the number of newly tracked terms.
+        """
+        terms = {term.lower() for term in terms}
+        with self._lock:
+            self._load_tracked()
+            new_terms = sorted(terms - self._tracked)
+            if not new_terms:
+                return 0
+
+            matcher = KeywordMatcher({"terms": new_terms})
+            with self._db:
+                cursor = self._db.execute("SELECT resume_id, text FROM resumes")
+                while True:
+                    rows = cursor.fetchmany(_BATCH)
+                    if not rows:
+                        break
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO term_hits (term, resume_id, count) VALUES (?, ?, ?)",
+                        [(term, resume_id, count)
+                         for resume_id, text in rows
+                         for term, count in matcher.scan(text.lower()).counts("terms").items()]
+                    )
+                self._db.executemany("INSERT OR IGNORE INTO tracked_terms (term) VALUES (?)",
+                                     [(term,) for term in new_terms])
+            self._load_tracked()
+            return len(new_terms)
+
+    def term_hits(self, terms):
+        """{resume_id: set of terms} for every stored resume, including ones with no hits"""
+        terms = sorted({term.lower() for term in terms})
+        with self._lock:
+            hits = {row[0]: set() for row in self._db.execute("SELECT resume_id FROM resumes ORDER BY seq")}
+            for i in range(0, len(terms), _BATCH):
+                chunk = terms[i:i + _BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                for term, resume_id in self._db.execute(
+                        f"SELECT term, resume_id FROM term_hits WHERE term IN ({placeholders})", chunk):
+                    if resume_id in hits:
+                        hits[resume_id].add(term)
+        return hits
+
+    def texts(self, resume_ids):
+        """{resume_id: (filename, text)} for the given ids that are stored"""
+        resume_ids = list(resume_ids)
+        found = {}
+        with self._lock:
+            for i in range(0, len(resume_ids), _BATCH):
+                chunk = resume_ids[i:i + _BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                for resume_id, filename, text in self._db.execute(
+                        f"SELECT resume_id, filename, text FROM resumes WHERE resume_id IN ({placeholders})", chunk):
+                    found[resume_id] = (filename, text)
+        return found
+
+    def matching(self, min_experience_months=None, min_degree=None):
+        """Ids of stored resumes with at least that many months of experience and that degree
+
+        Resumes stored without entities never match a filter.
+        """
+        conditions = []
+        params = []
+        if min_experience_months is not None:
+            conditions.append("experience_months >= ?")
+            params.append(min_experience_months)
+        if min_degree is not None:
+            conditions.append("degree_level >= ?")
+            params.append(DEGREE_LEVELS.index(min_degree))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            return {row[0] for row in self._db.execute(f"SELECT resume_id FROM resumes{where}", params)}
+
+    def filenames(self):
+        with self._lock:
+            return dict(self._db.execute("SELECT resume_id, filename FROM resumes"))
+
+    def features_since(self, seq=0):
+        """(last seq, [(resume_id, filename, features)]) for resumes added after seq"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, resume_id, filename, features FROM resumes WHERE seq > ? ORDER BY seq", (seq,)
+            ).fetchall()
+        last = rows[-1][0] if rows else seq
+        return last, [(resume_id, filename, json.loads(features)) for _, resume_id, filename, features in rows]
+
+    def info(self):
+        with self._lock:
+            self._load_tracked()
+            return {
+                "resumes": self._db.execute("SELECT COUNT(*) FROM resumes").fetchone()[0],
+                "tracked_terms": len(self._tracked),
+                "term_hits": self._db.execute("SELECT COUNT(*) FROM term_hits").fetchone()[0],
+                "persistent": self.db_path != ":memory:"
+            }
+
+
+def create_store_from_env():
+    # RESUME_INDEX_DB=:memory: keeps the store in this process only, for tests and benchmarks
+    return ResumeStore(os.environ.get("RESUME_INDEX_DB") or data_path("resume_index.db"))
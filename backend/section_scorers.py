@@ -0,0 +1,247 @@
+import re
+
+from keyword_matcher import KeywordMatcher
+
+DEGREE_KEYWORDS = [
+    "bachelor", "master", "phd", "doctorate", "diploma", "certificate", "degree",
+    "btech", "b.tech", "b.e", "be", "beng", "b.eng",
+    "mtech", "m.tech", "m.e", "me", "meng", "m.eng",
+    "bca", "mca",
+    "bsc", "b.sc", "msc", "m.sc",
+    "bcom", "b.com", "mcom", "m.com",
+    "bba", "mba", "pgdm", "pgdbm",
+    "ba", "b.a", "ma", "m.a",
+    "llb", "ll.m", "llm",
+    "mbbs", "bds", "b.pharm", "m.pharm", "bpt", "bams", "bhms",
+    "b.ed", "bed", "m.ed", "med",
+    "associate", "undergraduate", "postgraduate",
+    "high school", "hsc", "ssc", "10th", "12th"
+]
+
+INSTITUTION_KEYWORDS = ["university", "college", "institute", "school"]
+
+JOB_TITLE_KEYWORDS = ("manager", "developer", "engineer", "analyst", "assistant", "director", "coordinator", "specialist")
+
+TECH_SKILLS = ["python", "java", "javascript", "html", "css", "react", "angular",
+               "node", "sql", "database", "aws", "azure", "cloud", "docker",
+               "kubernetes", "git", "agile", "scrum", "machine learning", "ai","c++","c"]
+
+SOFT_SKILLS = ["communication", "leadership", "teamwork", "problem solving",
+               "critical thinking", "time management", "project management",
+               "collaboration", "adaptability", "creativity"]
+
+ACTION_VERBS = [
+    "achieved", "improved", "trained", "maintained", "managed", "created",
+    "resolved", "volunteered", "influenced", "increased", "decreased",
+    "researched", "authored", "developed", "launched", "designed",
+    "implemented", "established", "coordinated", "generated", "delivered",
+    "produced", "performed", "directed", "organized", "supervised"
+]
+SUGGESTED_VERBS = tuple(ACTION_VERBS[:10])
+
+EDUCATION_MATCHER = KeywordMatcher({"degrees": DEGREE_KEYWORDS, "institutions": INSTITUTION_KEYWORDS})
+SKILLS_MATCHER = KeywordMatcher({"tech": TECH_SKILLS, "soft": SOFT_SKILLS})
+ACTION_VERB_MATCHER = KeywordMatcher({"verbs": ACTION_VERBS})
+
+# Compiled once; the (lower) notes say which text each pattern runs on
+YEAR = re.compile(r'(19|20)\d{2}')
+GPA = re.compile(r'(gpa|grade point average|cum laude|honors|distinction)')  # lower
+COMPANY = re.compile(r'(inc|llc|ltd|corporation|corp|company)')  # lower
+JOB_TITLE = re.compile('|'.join(JOB_TITLE_KEYWORDS))  # lower
+EMPLOYMENT_DATE = re.compile(r'(19|20)\d{2}|present|current|now')  # lower
+BULLET = re.compile(r'•|\*|\-')
+METRIC = re.compile(r'(\d+%|\d+ percent|increased|decreased|improved|reduced|led|managed|created)')  # lower
+SKILL_SEPARATOR = re.compile(r'[,•|\\]')  # lower
+PROJECT_TITLE = re.compile(r'(?:^|\n)([A-Z][^\n]+)(?:\n|$)')
+PROJECT_TECH = re.compile(r'(tech stack|tools used|using|with|built on|developed in|utilizing) ([^.]*)')  # lower
+IMPACT = re.compile(r'(resulted in|improved|increased|decreased|reduced|enhanced)')  # lower
+
+
+def count_at_least(pattern, text, n):
+    """Whether pattern matches text at least n times, without finding every match"""
+    for count, _ in enumerate(pattern.finditer(text), 1):
+        if count >= n:
+            return True
+    return False
+
+
+def analyze_education(text, text_lower=None):
+    text_lower = text_lower if text_lower is not None else text.lower()
+    score = 100  # Base score
+    feedback = []
+
+    # Check for degree mentions
+    scan = EDUCATION_MATCHER.scan(text_lower)
+    if not scan.found("degrees"):
+        score -= 20
+        feedback.append("No clear mention of degree type")
+
+    # Check for dates
+    if not YEAR.search(text):
+        score -= 15
+        feedback.append("No graduation dates mentioned")
+
+    # Check for institutions
+    if not scan.found("institutions"):
+        score -= 15
+        feedback.append("No clear mention of educational institutions")
+
+    # Check for GPA or honors
+    if not GPA.search(text_lower):
+        feedback.append("Consider adding GPA or academic honors if they're strong")
+
+    # Return the results (cap score between 0-100)
+    score = max(0, min(100, score))
+
+    if score >= 80:
+        feedback.append("Education section is well-structured")
+
+    return score, feedback
+
+
+def analyze_experience(text, text_lower=None):
+    text_lower = text_lower if text_lower is not None else text.lower()
+    score = 100 # Base score
+    feedback = []
+
+    # Check for company names
+    if not COMPANY.search(text_lower):
+        score -= 10
+        feedback.append("Company names may not be clearly mentioned")
+
+    # Check for job titles
+    if not JOB_TITLE.search(text_lower):
+        score -= 15
+        feedback.append("Job titles are not clearly stated")
+
+    # Check for dates
+    if not count_at_least(EMPLOYMENT_DATE, text_lower, 2):
+        score -= 15
+        feedback.append("Employment dates may be missing or incomplete")
+
+    # Check for bullet points
+    if not count_at_least(BULLET, text, 3):
+        score -= 10
+        feedback.append("Consider using bullet points to highlight achievements")
+
+    # Check for metrics and achievements
+    if not count_at_least(METRIC, text_lower, 3):
+        score -= 15
+        feedback.append("Add more quantifiable achievements with metrics")
+    else:
+        score += 10
+        feedback.append("Good use of quantifiable metrics")
+
+    # Return the results (cap score between 0-100)
+    score = max(0, min(100, score))
+
+    if score >= 80:
+        feedback.append("Experience section effectively highlights your work history")
+
+    return score, feedback
+
+
+def analyze_skills(text, text_lower=None):
+    text_lower = text_lower if text_lower is not None else text.lower()
+    score = 100 # Base score
+    feedback = []
+
+    # Count number of skills
+    scan = SKILLS_MATCHER.scan(text_lower)
+    tech_count = len(scan.found("tech"))
+    soft_count = len(scan.found("soft"))
+
+    if tech_count < 5:
+        score -= 15
+        feedback.append("Add more technical skills relevant to your field")
+
+    if soft_count < 3:
+        score -= 10
+        feedback.append("Include some soft skills to show your workplace effectiveness")
+
+    # Check organization of skills section
+    if not SKILL_SEPARATOR.search(text_lower):
+        score -= 10
+        feedback.append("Organize your skills better (e.g., using categories or separators)")
+
+    # Return the results (cap score between 0-100)
+    score = max(0, min(100, score))
+
+    if tech_count >= 8 and soft_count >= 5:
+        score += 10
+        feedback.append("Excellent variety of skills listed")
+
+    return score, feedback
+
+
+def analyze_projects(text, text_lower=None):
+    text_lower = text_lower if text_lower is not None else text.lower()
+    score = 100  # Base score
+    feedback = []
+
+    # Check for project titles
+    if not count_at_least(PROJECT_TITLE, text, 2):
+        score -= 15
+        feedback.append("Include more projects to showcase your abilities")
+
+    # Check for technologies used
+    if not PROJECT_TECH.search(text_lower):
+        score -= 15
+        feedback.append("Mention technologies used in each project")
+
+    # Check for project descriptions (fewer than 5 lines)
+    if text.count('\n') < 4:
+        score -= 10
+        feedback.append("Add more detailed descriptions of your projects")
+
+    # Check for results or impact
+    if not IMPACT.search(text_lower):
+        score -= 10
+        feedback.append("Describe the impact or results of your projects")
+
+    # Return the results (cap score between 0-100)
+    score = max(0, min(100, score))
+
+    if score >= 80:
+        feedback.append("Project section effectively demonstrates your practical skills")
+
+    return score, feedback
+
+
+def check_action_verbs(text, text_lower=None):
+    text_lower = text_lower if text_lower is not None else text.lower()
+    # Count occurrences of action verbs
+    verb_count = len(ACTION_VERB_MATCHER.scan(text_lower).found("verbs"))
+
+    # Calculate score based on number of unique action verbs found
+    score = min(100, verb_count * 5)
+
+    return {
+        "score": score,
+        "count": verb_count,
+        "suggested_verbs": list(SUGGESTED_VERBS)  # Return some suggested verbs
+    }
+
+
+class SectionScorer:
+    """A scored resume section, its weight in the overall score and what to say when it is missing"""
+
+    def __init__(self, name, weight, score, missing_feedback, missing_suggestion):
+        self.name = name
+        self.weight = weight
+        self.score = score
+        self.missing_feedback = missing_feedback
+        self.missing_suggestion = missing_suggestion
+
+
+# Scored in this order; weights add up to 100
+SECTION_SCORERS = [
+    SectionScorer("education", 20, analyze_education, "Education section is missing",
+                  "Add an Education section with your degrees, institutions, and graduation dates"),
+    SectionScorer("experience", 35, analyze_experience, "Experience section is missing",
+                  "Add a Work Experience section with your job titles, employers, and achievements"),
+    SectionScorer("skills", 25, analyze_skills, "Skills section is missing",
+                  "Add a Skills section highlighting your technical and soft skills"),
+    SectionScorer("projects", 20, analyze_projects, "Projects section is missing or not clearly defined",
+                  "Consider adding a Projects section to showcase your practical skills"),
+]
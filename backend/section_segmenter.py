@@ -0,0 +1,141 @@
+import re
+
+# Canonical section name -> heading phrases that introduce it
+DEFAULT_HEADINGS = {
+    "summary": ["summary", "professional summary", "profile", "professional profile",
+                "objective", "career objective", "about me"],
+    "education": ["education", "academic background", "academics", "educational qualifications",
+                  "education and training", "academic qualifications"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "internships", "internship experience"],
+    "skills": ["skills", "technical skills", "expertise", "technical expertise", "core competencies",
+               "key skills", "skills and tools"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications",
+                       "courses and certifications"],
+    "licenses": ["licenses"],
+    "achievements": ["achievements", "awards", "honors", "honors and awards", "accomplishments"],
+    "publications": ["publications"],
+    "research": ["research", "research experience"],
+    "open_source": ["open source", "open source contributions", "github"],
+    "portfolio": ["portfolio"],
+    "campaigns": ["campaigns"],
+    "financial_expertise": ["financial expertise"],
+    "volunteering": ["volunteering", "volunteer experience"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies"],
+}
+
+# Bullets, numbering and decoration around a heading ("1. SKILLS:", "== Projects ==")
+_DECORATION = re.compile(r'^[\W\d_]+|[\W_]+$')
+_SMALL_WORDS = {"and", "&", "of", "in", "for", "the"}
+
+
+def _phrase_key(phrase):
+    return ' '.join(phrase.lower().replace('&', 'and').split())
+
+
+def _phrase_regex(phrase):
+    words = [r'(?:and|&)' if word == 'and' else re.escape(word) for word in _phrase_key(phrase).split()]
+    return r'[^\S\n]+'.join(words)
+
+
+class Section:
+    """A span of resume text that starts at a heading line"""
+
+    def __init__(self, name, heading, start, end, text):
+        self.name = name
+        self.heading = heading
+        self.start = start
+        self.end = end
+        self.text = text
+
+    def to_dict(self):
+        return {"name": self.name, "heading": self.heading, "start": self.start, "end": self.end}
+
+
+class SectionSegmenter:
+    """Split a resume into sections in a single pass over its lines
+
+    A line is a heading when, after any bullet or numbering, it is a known
+    heading phrase on its own, a heading phrase followed by a colon and
+    content ("Skills: Python, SQL"), or a short all-caps/title-case line
+    that starts with a heading phrase ("EDUCATION & TRAINING").
+    """
+
+    def __init__(self, headings=None, max_heading_words=5):
+        self.headings = headings or DEFAULT_HEADINGS
+        self.max_heading_words = max_heading_words
+        self._phrases = {}
+        for name, phrases in self.headings.items():
+            for phrase in phrases:
+                self._phrases[_phrase_key(phrase)] = name
+
+        # One multiline regex finds candidate heading lines: optional bullets
+        # or numbering, a heading phrase (longest first), then the rest of the
+        # line. Only those candidates are checked in Python. The leading
+        # bullets and spaces are taken whole and never given back (a lookahead
+        # plus backreference, i.e. an atomic group), so long runs of padding
+        # cost one pass instead of a retry of every phrase at every position.
+        alternation = '|'.join(_phrase_regex(phrase) for phrase in sorted(self._phrases, key=len, reverse=True))
+        self._pattern = re.compile(
+            r'^(?=(?P<prefix>[^\w\n]*))(?P=prefix)(?:\d+[.)][^\S\n]*)?(?P<phrase>' + alternation + r')(?![^\W_])'
+            r'(?P<rest>[^\n]*)$',
+            re.IGNORECASE | re.MULTILINE
+        )
+
+    def _heading(self, match):
+        """Canonical name for a candidate heading line, or None if it is just text"""
+        name = self._phrases[_phrase_key(match.group('phrase'))]
+        rest = match.group('rest').strip()
+
+        # "SKILLS", "Skills:" and "Skills: Python, SQL"
+        if not rest or rest.startswith(':') or not _DECORATION.sub('', rest):
+            return name
+
+        # "EDUCATION & TRAINING": a short all-caps or title-case line
+        line = match.group(0).strip()
+        if len(line.split()) <= self.max_heading_words and self._looks_like_heading(line):
+            return name
+        return None
+
+    def heading_name(self, line):
+        """The canonical section a line introduces, or None"""
+        match = self._pattern.match(line.strip())
+        return self._heading(match) if match else None
+
+    @staticmethod
+    def _looks_like_heading(line):
+        letters = [char for char in line if char.isalpha()]
+        if letters and all(char.isupper() for char in letters):
+            return True
+        return all(word[0].isupper() or word.lower() in _SMALL_WORDS
+                   for word in line.split() if word[0].isalpha())
+
+    def segment(self, text):
+        """Return every Section in document order, including repeated headings"""
+        sections = []
+        for match in self._pattern.finditer(text):
+            name = self._heading(match)
+            if name:
+                if sections:
+                    sections[-1].end = match.start()
+                sections.append(Section(name, match.group(0).strip(), match.start(), len(text), None))
+
+        for section in sections:
+            section.text = text[section.start:section.end]
+        return sections
+
+    def extract(self, text, sections=None):
+        """{section name: text} for every configured section, "" when absent
+
+        Sections that appear more than once are joined in document order.
+        `sections` from an earlier segment() call of the same text are reused.
+        """
+        result = {name: "" for name in self.headings}
+        for section in self.segment(text) if sections is None else sections:
+            result[section.name] = result[section.name] + section.text if result[section.name] else section.text
+        return result
+
+
+default_segmenter = SectionSegmenter()
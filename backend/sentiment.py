@@ -0,0 +1,146 @@
+import os
+import xml.etree.ElementTree as ET
+
+# Same defaults as TextBlob's pattern analyzer
+NEGATIONS = frozenset(("no", "not", "n't", "never"))
+MODIFIER_TAGS = ("RB",)
+
+
+def _avg(values):
+    return sum(values) / len(values)
+
+
+def default_lexicon_path():
+    """The pattern sentiment lexicon that ships with TextBlob"""
+    import textblob
+    return os.path.join(os.path.dirname(textblob.__file__), 'en', 'en-sentiment.xml')
+
+
+def load_lexicon(path=None):
+    """{word: (polarity, subjectivity, intensity, is_modifier)} built the way TextBlob builds it
+
+    Scores are averaged over the senses of each part of speech, then over
+    the parts of speech. Like textblob.en, every adjective also scores its
+    adverb ("terrible" gives "terribly"). A word is a modifier when it has
+    an adverb sense.
+    """
+    senses = {}
+    for node in ET.parse(path or default_lexicon_path()).getroot().iter('word'):
+        word = node.get('form')
+        if word:
+            scores = (float(node.get('polarity', 0.0)), float(node.get('subjectivity', 0.0)),
+                      float(node.get('intensity', 1.0)))
+            senses.setdefault(word, {}).setdefault(node.get('pos'), []).append(scores)
+
+    words = {}
+    for word, by_pos in senses.items():
+        words[word] = {pos: tuple(_avg(values) for values in zip(*scores)) for pos, scores in by_pos.items()}
+        words[word][None] = tuple(_avg(values) for values in zip(*words[word].values()))
+
+    for word, by_pos in list(words.items()):
+        if "JJ" in by_pos:
+            if word.endswith("y"):
+                word = word[:-1] + "i"
+            if word.endswith("le"):
+                word = word[:-2]
+            adverb = words.setdefault(word + "ly", {})
+            adverb["RB"] = adverb[None] = by_pos["JJ"]
+
+    return {word: by_pos[None] + (any(tag in by_pos for tag in MODIFIER_TAGS),) for word, by_pos in words.items()}
+
+
+def load_emoticons():
+    """{emoticon: polarity} for the emoticons TextBlob can match, first mood wins"""
+    from textblob._text import EMOTICONS, PUNCTUATION
+    emoticons = {}
+    for (_, polarity), faces in EMOTICONS.items():
+        for face in faces:
+            face = face.lower()
+            # TextBlob only looks up short tokens that are not all letters or punctuation
+            if not face.isalpha() and len(face) <= 5 and face not in PUNCTUATION:
+                emoticons.setdefault(face, polarity)
+    return emoticons
+
+
+class LexiconSentiment:
+    """TextBlob's pattern sentiment over already tokenized, lowercased words
+
+    Runs the same assessment rules as textblob.en.sentiment on a list of
+    words (modifiers like "very" scale the next known word, negations flip
+    it, "!" boosts it), so scores match TextBlob's to within float rounding,
+    but with the lexicon flattened into one dict lookup per word. Words
+    outside the lexicon, negations and emoticons take a short path that can
+    only clear a pending modifier or negation.
+    """
+
+    def __init__(self, lexicon=None, emoticons=None):
+        self.lexicon = load_lexicon() if lexicon is None else lexicon
+        self.emoticons = load_emoticons() if emoticons is None else emoticons
+        # Words outside these only matter by being long enough to end a modifier or negation
+        self.special = frozenset(self.lexicon) | NEGATIONS | frozenset(self.emoticons) | {"!", "(!)"}
+
+    def assessments(self, words):
+        """[polarity, subjectivity, intensity, negated] for every scored word"""
+        lexicon = self.lexicon
+        special = self.special
+        a = []
+        modifier = None
+        negation = None
+        for w in words:
+            if w not in special:
+                # Unknown, not a negation, emoticon or "!": retain across small words only
+                if negation is not None and len(w.strip("'")) > 1:
+                    negation = None
+                if negation is not None and modifier is not None and modifier.endswith("ly"):
+                    a[-1][3] = True
+                    negation = None
+                elif modifier is not None and len(w) > 2:
+                    modifier = None
+                continue
+
+            entry = lexicon.get(w)
+            if entry is not None:
+                polarity, subjectivity, intensity, is_modifier = entry
+                if modifier is None:
+                    a.append([polarity, subjectivity, intensity, False])
+                else:
+                    last = a[-1]
+                    last[0] = max(-1.0, min(polarity * last[2], 1.0))
+                    last[1] = max(-1.0, min(subjectivity * last[2], 1.0))
+                    last[2] = intensity
+                if negation is not None:
+                    a[-1][2] = 1.0 / a[-1][2]
+                    a[-1][3] = True
+                modifier = w if is_modifier else None
+                negation = w if w in NEGATIONS else None
+                continue
+
+            if w in NEGATIONS:
+                negation = w
+            elif negation is not None and len(w.strip("'")) > 1:
+                negation = None
+            if negation is not None and modifier is not None and modifier.endswith("ly"):
+                a[-1][3] = True
+                negation = None
+            elif modifier is not None and len(w) > 2:
+                modifier = None
+            if w == "!" and a:
+                a[-1][0] = max(-1.0, min(a[-1][0] * 1.25, 1.0))
+            if w == "(!)":
+                a.append([0.0, 1.0, 1.0, False])
+            if w in self.emoticons:
+                a.append([self.emoticons[w], 1.0, 1.0, False])
+        return a
+
+    def __call__(self, words):
+        """(polarity, subjectivity) of a list of lowercased tokens"""
+        a = self.assessments(words)
+        if not a:
+            return 0.0, 0.0
+        polarity = 0.0
+        subjectivity = 0.0
+        for p, s, _, negated in a:
+            # "not good" is slightly bad, "not bad" slightly good
+            polarity += p * -0.5 if negated else p
+            subjectivity += s
+        return polarity / len(a), subjectivity / len(a)
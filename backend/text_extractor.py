@@ -0,0 +1,236 @@
+import hashlib
+import io
+import os
+import re
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+
+import PyPDF2
+
+
+def open_source(source):
+    """Return something PyPDF2 and zipfile can read from
+
+    source can be a path, raw bytes (bytes, bytearray or memoryview) or an
+    open binary stream such as a FileStorage stream or a spooled temp file.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, 'read'):
+        source.seek(0)
+    return source
+
+
+def hash_stream(stream, chunk_size=64 * 1024):
+    """SHA-256 of a stream's contents, read in chunks and rewound afterwards"""
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+class ExtractionStats:
+    """What an extraction read and how long each page took"""
+
+    def __init__(self):
+        self.pages_total = 0
+        self.pages_read = 0
+        self.chars = 0
+        self.truncated = False
+        self.page_timings = []
+        self.seconds = 0.0
+
+    def slowest_pages(self, count=3):
+        return sorted(self.page_timings, key=lambda timing: timing[1], reverse=True)[:count]
+
+    def to_dict(self):
+        return {
+            "pages_total": self.pages_total,
+            "pages_read": self.pages_read,
+            "chars": self.chars,
+            "truncated": self.truncated,
+            "seconds": round(self.seconds, 4),
+            "page_timings": [(page, round(seconds, 4)) for page, seconds in self.page_timings]
+        }
+
+
+def iter_pdf_pages(source, max_pages=None, stats=None):
+    """Yield (page_number, text, seconds) one page at a time
+
+    Pages are only parsed when the consumer asks for them, so stopping the
+    iteration early skips the remaining pages entirely.
+    """
+    source = open_source(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield from iter_pdf_pages(file, max_pages, stats)
+        return
+
+    reader = PyPDF2.PdfReader(source)
+    page_count = len(reader.pages)
+    if stats is not None:
+        stats.pages_total = page_count
+        if max_pages is not None and page_count > max_pages:
+            stats.truncated = True
+
+    for index in range(page_count if max_pages is None else min(page_count, max_pages)):
+        start = time.perf_counter()
+        text = reader.pages[index].extract_text() or ""
+        yield index + 1, text, time.perf_counter() - start
+
+
+def extract_text_from_pdf(source, max_pages=None, max_chars=None, stats=None):
+    """Extract PDF text, stopping at max_pages pages or once max_chars characters are collected"""
+    if stats is None:
+        stats = ExtractionStats()
+    start = time.perf_counter()
+
+    parts = []
+    total = 0
+    pages = iter_pdf_pages(source, max_pages, stats)
+    try:
+        for page_number, text, seconds in pages:
+            stats.pages_read += 1
+            stats.page_timings.append((page_number, seconds))
+            if max_chars is not None and total + len(text) >= max_chars:
+                parts.append(text[:max_chars - total])
+                total = max_chars
+                stats.truncated = True
+                break
+            parts.append(text)
+            total += len(text)
+    finally:
+        pages.close()
+
+    stats.chars = total
+    stats.seconds = time.perf_counter() - start
+    return '\n'.join(parts)
+
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_P = _W + 'p'
+_T = _W + 't'
+_TAB = _W + 'tab'
+_BREAKS = (_W + 'br', _W + 'cr')
+_HYPHEN = _W + 'noBreakHyphen'
+_TBL = _W + 'tbl'
+# Text boxes are stored twice, as DrawingML and as a VML fallback; only the first is read
+_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_HEADER_FOOTER = re.compile(r'word/(header|footer)(\d*)\.xml$')
+
+
+def _part_key(name):
+    kind, number = _HEADER_FOOTER.match(name).groups()
+    return kind, int(number or 0)
+
+
+def iter_docx_part(stream):
+    """Yield the text of each paragraph of a WordprocessingML part in document order
+
+    The part is parsed incrementally and finished paragraphs and tables are
+    dropped from the tree, so memory stays bounded by the nesting depth
+    rather than the document size. Table cells and text boxes are ordinary
+    paragraphs here; a text box inside a paragraph comes out before it.
+    """
+    parents = []
+    paragraphs = []
+    fallback_depth = 0
+    for event, element in ET.iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag == _FALLBACK:
+                fallback_depth += 1
+            elif tag == _P and not fallback_depth:
+                paragraphs.append([])
+            parents.append(element)
+            continue
+
+        parents.pop()
+        if tag == _FALLBACK:
+            fallback_depth -= 1
+        elif fallback_depth:
+            pass
+        elif tag == _T:
+            if element.text and paragraphs:
+                paragraphs[-1].append(element.text)
+        elif tag == _TAB:
+            if paragraphs:
+                paragraphs[-1].append('\t')
+        elif tag in _BREAKS:
+            if paragraphs:
+                paragraphs[-1].append('\n')
+        elif tag == _HYPHEN:
+            if paragraphs:
+                paragraphs[-1].append('-')
+        elif tag == _P:
+            yield ''.join(paragraphs.pop())
+        if parents and (tag == _P or tag == _TBL):
+            parents[-1].remove(element)
+
+
+def iter_docx_paragraphs(source):
+    """Yield paragraph text from a DOCX: headers, then the body, then footers
+
+    Reads the XML parts straight from the zip without building an object
+    model. Header and footer paragraphs repeated across sections are only
+    yielded once.
+    """
+    source = open_source(source)
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile:
+        raise ValueError("Not a valid DOCX file")
+
+    with archive:
+        names = archive.namelist()
+        if 'word/document.xml' not in names:
+            raise ValueError("Not a valid DOCX file")
+        parts = sorted((name for name in names if _HEADER_FOOTER.match(name)), key=_part_key)
+        headers = [name for name in parts if _part_key(name)[0] == 'header']
+        footers = [name for name in parts if _part_key(name)[0] == 'footer']
+
+        seen = set()
+        for name in headers + ['word/document.xml'] + footers:
+            body = name == 'word/document.xml'
+            with archive.open(name) as stream:
+                try:
+                    for text in iter_docx_part(stream):
+                        if not body:
+                            if not text.strip() or text in seen:
+                                continue
+                            seen.add(text)
+                        yield text
+                except ET.ParseError as e:
+                    raise ValueError(f"Malformed DOCX part {name}: {e}")
+
+
+def extract_text_from_docx(source, max_chars=None):
+    """Extract DOCX text including tables, text boxes, headers and footers
+
+    Stops reading once max_chars characters are collected.
+    """
+    parts = []
+    total = 0
+    paragraphs = iter_docx_paragraphs(source)
+    try:
+        for text in paragraphs:
+            parts.append(text)
+            total += len(text) + 1
+            if max_chars is not None and total > max_chars:
+                break
+    finally:
+        paragraphs.close()
+    text = '\n'.join(parts)
+    return text if max_chars is None else text[:max_chars]
+
+
+def extract_text(filename, source, max_pages=None, max_chars=None, stats=None):
+    # Extract text based on file type
+    if filename.lower().endswith('.pdf'):
+        return extract_text_from_pdf(source, max_pages, max_chars, stats)
+    elif filename.lower().endswith('.docx'):
+        return extract_text_from_docx(source, max_chars)
+    raise ValueError("Unsupported file format")
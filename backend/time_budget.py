@@ -0,0 +1,176 @@
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from metrics import STAGE_TIMEOUTS
+
+
+class StageTimeout(Exception):
+    """Raised when a stage that cannot be skipped runs out of time"""
+
+    def __init__(self, stage):
+        super().__init__(f"{stage} did not finish in time")
+        self.stage = stage
+
+
+class Budget:
+    """Deadline for one analysis, split into per-stage limits
+
+    run() executes a stage on the shared stage pool and waits at most the
+    smaller of the stage's own limit and the time left overall. A stage
+    that overruns is recorded in `skipped` and yields None; Python threads
+    cannot be killed, so its work finishes in the background while the
+    response goes out without it. The pool is bounded, so a pile-up of
+    overrunning stages turns into more skips, not more threads.
+
+    Without an executor stages run inline in the calling thread, e.g. for a
+    request being profiled; they are then only skipped once the budget is
+    already spent, never cut short.
+    """
+
+    def __init__(self, seconds, stage_limits=None, executor=None):
+        self.deadline = time.monotonic() + seconds
+        self.stage_limits = stage_limits or {}
+        self.executor = executor
+        self.skipped = {}
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def limit(self, stage):
+        stage_limit = self.stage_limits.get(stage)
+        return self.remaining() if stage_limit is None else min(stage_limit, self.remaining())
+
+    def skip(self, stage, reason):
+        self.skipped[stage] = reason
+        STAGE_TIMEOUTS.inc(stage, reason)
+
+    def run(self, stage, fn, *args):
+        timeout = self.limit(stage)
+        if timeout <= 0:
+            self.skip(stage, "budget_exhausted")
+            return None
+        if self.executor is None:
+            return fn(*args)
+        future = self.executor.submit(fn, *args)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            self.skip(stage, "timeout")
+            return None
+
+    @property
+    def partial(self):
+        return bool(self.skipped)
+
+
+def create_stage_executor(workers):
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analysis-stage')
+
+
+def _extraction_worker(conn, parent_conn, extract):
+    """Loop in a child process: extract each (filename, data, kwargs) sent down the pipe"""
+    # Handlers inherited from a gunicorn worker only flag it to stop, so the
+    # SIGTERM sent at exit would leave the worker waiting on this child
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    # Drop the copy of the parent's end inherited through fork, otherwise recv()
+    # never sees EOF and the child outlives a worker that died without cleanup
+    parent_conn.close()
+    while True:
+        try:
+            filename, data, kwargs = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            conn.send(("ok", extract(filename, data, **kwargs)))
+        except Exception as e:
+            conn.send(("error", str(e) or e.__class__.__name__))
+
+
+class IsolatedExtractor:
+    """Run text extraction in killable worker processes
+
+    Workers are forked on first use and reused. When a document does not
+    finish in time its worker is killed, so a hung PDF parse cannot hold a
+    request thread or CPU; a fresh worker is forked for the next upload.
+    """
+
+    def __init__(self, extract, workers=2):
+        self.extract_fn = extract
+        self.workers = workers
+        self._idle = queue.Queue()
+        self._started = 0
+        self._lock = threading.Lock()
+        self._context = multiprocessing.get_context('fork')
+
+    def _spawn(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_extraction_worker, args=(child_conn, parent_conn, self.extract_fn),
+                                        name='extraction-worker', daemon=True)
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def _acquire(self, timeout):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._started < self.workers:
+                self._started += 1
+                try:
+                    return self._spawn()
+                except Exception:
+                    self._started -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise StageTimeout("extraction")
+
+    def _discard(self, worker):
+        process, conn = worker
+        process.kill()
+        process.join(1)
+        conn.close()
+        with self._lock:
+            self._started -= 1
+
+    def extract(self, filename, data, timeout, **kwargs):
+        """Extract text within timeout seconds or raise StageTimeout"""
+        deadline = time.monotonic() + timeout
+        worker = self._acquire(timeout)
+        process, conn = worker
+        try:
+            conn.send((filename, data, kwargs))
+            if not conn.poll(max(0.0, deadline - time.monotonic())):
+                self._discard(worker)
+                worker = None
+                raise StageTimeout("extraction")
+            status, payload = conn.recv()
+        except (EOFError, OSError):
+            # The worker died mid-document, e.g. out of memory
+            if worker is not None:
+                self._discard(worker)
+                worker = None
+            raise RuntimeError("Extraction worker exited unexpectedly")
+        finally:
+            if worker is not None:
+                self._idle.put(worker)
+
+        if status == "error":
+            raise ValueError(payload)
+        return payload
+
+    def shutdown(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                return
@@ -1,8 +1,18 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import axios from 'axios';
 import 'bootstrap/dist/css/bootstrap.min.css';
 import './App.css';
 
+const API_URL = 'https://resume-analyzer-lebh.onrender.com';
+
+// Shown until /api/industries answers, or if it fails
+const DEFAULT_INDUSTRIES = [
+  { id: 'software_engineer', label: 'Software Engineer' },
+  { id: 'finance', label: 'Finance' },
+  { id: 'data_scientist', label: 'Data Scientist' },
+  { id: 'marketing', label: 'Marketing' }
+];
+
 function App() {
   const [file, setFile] = useState(null);
   const [fileName, setFileName] = useState('');
@@ -12,6 +22,17 @@ function App() {
   const [error_file, setErrorFile] = useState('');
   const[error_role,setErrorRole] = useState('');
   const [selectedJob, setSelectedJob] = useState('');
+  const [industries, setIndustries] = useState(DEFAULT_INDUSTRIES);
+
+  useEffect(() => {
+    axios.get(`${API_URL}/api/industries`)
+      .then(response => {
+        if (response.data.industries && response.data.industries.length) {
+          setIndustries(response.data.industries);
+        }
+      })
+      .catch(() => {});
+  }, []);
 
   const handleDropdownChange = (event) => {
     setSelectedJob(event.target.value);
@@ -62,7 +83,7 @@ function App() {
     formData.append('job_role', selectedJob); // add job role
 
     try {
-      const response = await axios.post('https://resume-analyzer-lebh.onrender.com/api/analyze', formData, {
+      const response = await axios.post(`${API_URL}/api/analyze`, formData, {
         headers: {
           'Content-Type': 'multipart/form-data'
         }
@@ -206,10 +227,9 @@ return (
                     onChange={handleDropdownChange}
                   >
                     <option value="">-- Select a role --</option>
-                    <option value="software_engineer">Software Engineer</option>
-                    <option value="finance">Finance</option>
-                    <option value="data_scientist">Data Scientist</option>
-                    <option value="marketing">Marketing</option>
+                    {industries.map(industry => (
+                      <option key={industry.id} value={industry.id}>{industry.label}</option>
+                    ))}
                   </select>
 
                   {error_role && <div className="text-danger mt-2">{error_role}</div>}